@@ -0,0 +1,21 @@
+"""
+`python -m launcher ...` (from the repo root) or `python launcher ...`.
+
+The modules in this folder import each other by bare name (`from config
+import Config`), the same way main.py does, so put this folder on sys.path
+first. Under `-m`, Python has already registered this folder as the
+namespace package `launcher`, which would shadow launcher.py — drop that
+entry so `import launcher` finds the module.
+"""
+import os
+import sys
+
+_here = os.path.dirname(os.path.abspath(__file__))
+if _here not in sys.path:
+    sys.path.insert(0, _here)
+if getattr(sys.modules.get("launcher"), "__file__", None) is None:
+    sys.modules.pop("launcher", None)
+
+from cli import main  # noqa: E402
+
+sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+App entries and their compiled command vectors.
+
+An entry in a category is either the legacy bare path string, or a dict:
+
+    {
+        "path": "C:/Program Files/App/app.exe",
+        "args": ["--profile", "%USERNAME%"],
+        "env": {"APP_HOME": "$HOME/app"},
+        "cwd": "C:/work",
+        "name": "My App"
+    }
+
+Only "path" is required. `%VAR%`, `$VAR` and `${VAR}` are expanded in path,
+args, cwd and env values (env overrides are visible to the other fields).
+
+An entry's path is its identity everywhere else (de-duplication, launch
+rules, stats), see entry_path(). compile_entry() turns an entry into a
+CommandVector once — expanded argv, merged environment and cwd — and caches
+it, so launching is a direct Popen with no shell and no string parsing.
+"""
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+
+_VAR = re.compile(r"%([A-Za-z_][A-Za-z0-9_]*)%|\$\{([^}]+)\}|\$([A-Za-z_][A-Za-z0-9_]*)")
+_DIRECT_EXTS = (".exe", ".com")
+
+
+def entry_path(entry) -> str:
+    """The path that identifies an entry, whichever format it's in."""
+    if isinstance(entry, dict):
+        return entry.get("path", "")
+    return entry
+
+
+def entry_name(entry) -> str:
+    if isinstance(entry, dict) and entry.get("name"):
+        return entry["name"]
+    return os.path.basename(entry_path(entry).replace("\\", "/"))
+
+
+def is_valid_entry(entry) -> bool:
+    if isinstance(entry, str):
+        return bool(entry)
+    if not isinstance(entry, dict) or not isinstance(entry.get("path"), str) or not entry["path"]:
+        return False
+    if not isinstance(entry.get("args", []), list):
+        return False
+    if not isinstance(entry.get("env", {}), dict):
+        return False
+    return isinstance(entry.get("cwd", ""), str)
+
+
+def expand(value: str, env) -> str:
+    """Expand %VAR%, $VAR and ${VAR} from `env`; unknown names are left as-is."""
+    def sub(m):
+        name = m.group(1) or m.group(2) or m.group(3)
+        value = env.get(name)
+        if value is None and sys.platform == "win32":
+            value = env.get(name.upper())  # Windows variable names are case-insensitive
+        return m.group(0) if value is None else value
+    return _VAR.sub(sub, value)
+
+
+class CommandVector:
+    """A ready-to-exec launch: argv, full environment (None = inherit) and cwd."""
+    __slots__ = ("path", "argv", "env", "cwd", "direct")
+
+    def __init__(self, path: str, argv, env, cwd):
+        self.path = path
+        self.argv = argv
+        self.env = env
+        self.cwd = cwd
+        exe = argv[0]
+        if sys.platform == "win32":
+            self.direct = exe.lower().endswith(_DIRECT_EXTS)
+        else:
+            self.direct = os.path.isfile(exe) and os.access(exe, os.X_OK)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.argv[0])
+
+    def spawn(self):
+        """Start it. Executables are exec'd directly; anything else (shortcuts,
+        documents, scripts) goes to the OS file association handler. Returns
+        the Popen handle when there is one."""
+        if self.direct:
+            return subprocess.Popen(self.argv, env=self.env, cwd=self.cwd)
+        if hasattr(os, "startfile"):
+            args = subprocess.list2cmdline(self.argv[1:])
+            if (args or self.cwd) and sys.version_info >= (3, 10):
+                os.startfile(self.argv[0], arguments=args, cwd=self.cwd)  # type: ignore[attr-defined]
+            else:
+                os.startfile(self.argv[0])  # type: ignore[attr-defined]
+            return None
+        return subprocess.Popen(self.argv, env=self.env, cwd=self.cwd)
+
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def _cache_key(entry):
+    if isinstance(entry, str):
+        return entry
+    return (
+        entry.get("path", ""),
+        tuple(entry.get("args", ())),
+        entry.get("cwd", ""),
+        tuple(sorted(entry.get("env", {}).items())),
+    )
+
+
+def compile_entry(entry) -> CommandVector:
+    """CommandVector for `entry`, built on first use and cached after that."""
+    key = _cache_key(entry)
+    vector = _compiled.get(key)
+    if vector is not None:
+        return vector
+
+    if isinstance(entry, str):
+        vector = CommandVector(entry, [entry], None, None)
+    else:
+        env = None
+        lookup = os.environ
+        if entry.get("env"):
+            env = dict(os.environ)
+            for name, value in entry["env"].items():
+                env[str(name)] = expand(str(value), env)
+            lookup = env
+        exe = expand(entry["path"], lookup)
+        if not os.path.dirname(exe):
+            exe = shutil.which(exe) or exe  # bare command name: look it up on PATH
+        argv = [exe] + [expand(str(a), lookup) for a in entry.get("args", [])]
+        cwd = expand(entry["cwd"], lookup) if entry.get("cwd") else None
+        vector = CommandVector(entry["path"], argv, env, cwd)
+
+    with _compiled_lock:
+        _compiled[key] = vector
+    return vector
+
+
+def clear_compiled():
+    """Forget compiled vectors (e.g. after the environment has changed)."""
+    with _compiled_lock:
+        _compiled.clear()
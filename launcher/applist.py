@@ -0,0 +1,230 @@
+"""
+The main window's app list: a Treeview kept in step with a category by
+diffing instead of rebuilding.
+
+Each row's item id is the app's path, so refreshing after an add, remove,
+undo or restore only inserts, deletes or moves the rows that changed —
+adding one app to a 5,000-app category touches one row, as it does in a
+5-app one, and the selection and scroll position stay put.
+
+Categories with more than VIRTUAL_THRESHOLD apps are virtualized: only a
+window of WINDOW_SIZE rows around what's on screen exists in the Treeview.
+The scrollbar is driven from the whole list, and the window slides as you
+scroll, so opening a huge category costs one window of rows, not all of
+them.
+"""
+from bisect import bisect_left
+
+from appentry import entry_name, entry_path
+
+VIRTUAL_THRESHOLD = 1000
+WINDOW_SIZE = 300
+# Slide the window once the view is this close (fraction of the window)
+# to one of its ends
+EDGE_MARGIN = 0.2
+
+
+class AppList:
+    def __init__(self, tree, scrollbar):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        # The whole category: entry, item id and (name, path) per app, in order
+        self._entries = []
+        self._iids = []
+        self._values = []
+        self._index = {}
+        # What's actually in the Treeview: model rows _start.. in order
+        self._start = 0
+        self._rows = []
+        self._shown = {}  # item id -> values it was inserted/updated with
+        # Kept while a virtualized row is scrolled out (and so deleted)
+        self.selected = None
+        self._slide_pending = False
+
+        tree.configure(yscrollcommand=self._on_tree_scroll)
+        scrollbar.configure(command=self.yview)
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+    @property
+    def virtual(self) -> bool:
+        return len(self._iids) > VIRTUAL_THRESHOLD
+
+    def show(self, entries):
+        """Replace the list, e.g. when another category is picked."""
+        self.tree.delete(*self._rows)
+        self._rows, self._shown = [], {}
+        self._start = 0
+        self.selected = None
+        self._entries = []
+        self._set_model(entries)
+        self._render()
+        self.tree.yview_moveto(0)
+
+    def sync(self, entries):
+        """Bring the rows in line with `entries` (the same category after an
+        edit), touching only the rows that changed."""
+        self._set_model(entries)
+        if self.selected not in self._index:
+            self.selected = None
+        self._render()
+
+    def selection(self):
+        """(index in the category, (name, path)) of the selected app, or
+        None. Works while a virtualized row is scrolled out of the window."""
+        i = self._index.get(self.selected)
+        if i is None:
+            return None
+        return i, self._values[i]
+
+    def reveal(self, path: str) -> bool:
+        """Select the app with this path and scroll it into view (sliding
+        the window there first if it's virtualized)."""
+        i = self._index.get(path)
+        if i is None:
+            return False
+        self.selected = path
+        if path not in self._shown:
+            self._scroll_to(i)
+        self.tree.selection_set(path)
+        self.tree.see(path)
+        return True
+
+    # Model and rows
+
+    def _set_model(self, entries):
+        # Config replaces entries rather than editing them, so one that's
+        # still the same object still has the same name and path
+        known = {id(e): v for e, v in zip(self._entries, self._values)}
+        entries = list(entries)
+        iids, values, seen = [], [], {}
+        for entry in entries:
+            v = known.get(id(entry))
+            if v is None:
+                v = (entry_name(entry), entry_path(entry))
+            path = v[1]
+            n = seen.get(path, 0)
+            seen[path] = n + 1
+            # A hand-edited config can list a path twice; ids must be unique
+            iids.append(path if n == 0 else f"{path}\t{n}")
+            values.append(v)
+        self._entries, self._iids, self._values = entries, iids, values
+        self._index = {iid: i for i, iid in enumerate(iids)}
+
+    def _render(self):
+        total = len(self._iids)
+        if total > VIRTUAL_THRESHOLD:
+            self._start = max(0, min(self._start, total - WINDOW_SIZE))
+            end = self._start + WINDOW_SIZE
+        else:
+            self._start, end = 0, total
+        self._reconcile(self._start, end)
+
+    def _reconcile(self, start: int, end: int):
+        """Make the Treeview hold exactly model rows start..end-1. Rows that
+        left are deleted; of the ones that stay, the longest run already in
+        the right relative order is left alone, and only the others are
+        detached and put back where they belong, one move each (moving one
+        row k places moves that row, not the k in between). New rows are
+        inserted in the same pass."""
+        wanted = self._iids[start:end]
+        position = {iid: i for i, iid in enumerate(wanted)}
+        gone = [iid for iid in self._rows if iid not in position]
+        if gone:
+            self.tree.delete(*gone)
+            for iid in gone:
+                del self._shown[iid]
+        rows = [iid for iid in self._rows if iid in position]
+        in_place = _longest_increasing([position[iid] for iid in rows])
+        moving = [iid for k, iid in enumerate(rows) if k not in in_place]
+        if moving:
+            self.tree.detach(*moving)
+        moving = set(moving)
+
+        # With those detached, the Treeview holds the in-place rows in the
+        # wanted order, so each row below goes straight to its final index
+        for i, iid in enumerate(wanted):
+            values = self._values[start + i]
+            placed = iid not in self._shown or iid in moving
+            if iid not in self._shown:
+                self.tree.insert("", i, iid=iid, values=values)
+                self._shown[iid] = values
+            elif iid in moving:
+                self.tree.move(iid, "", i)
+            if self._shown[iid] != values:
+                self.tree.item(iid, values=values)  # same path, new name
+                self._shown[iid] = values
+            if placed and iid == self.selected:
+                self.tree.selection_add(iid)  # scrolled back into the window, or moved
+        self._rows = wanted
+
+    def _on_select(self, event=None):
+        sel = self.tree.selection()
+        if sel:
+            self.selected = sel[0]
+        elif self.selected in self._shown:
+            self.selected = None  # deselected, not just slid out of the window
+
+    # Scrolling
+
+    def _on_tree_scroll(self, first, last):
+        """yscrollcommand: the Treeview reports what part of its rows is in
+        view; map that onto the whole category for the scrollbar, and slide
+        the window when the view nears one of its ends."""
+        first, last = float(first), float(last)
+        total, n = len(self._iids), len(self._rows)
+        if total <= VIRTUAL_THRESHOLD or not n:
+            self.scrollbar.set(first, last)
+            return
+        self.scrollbar.set((self._start + first * n) / total, (self._start + last * n) / total)
+        near_top = first < EDGE_MARGIN and self._start > 0
+        near_bottom = last > 1 - EDGE_MARGIN and self._start + n < total
+        if (near_top or near_bottom) and not self._slide_pending:
+            # Not from inside the Treeview's own callback
+            self._slide_pending = True
+            self.tree.after_idle(self._recenter)
+
+    def _recenter(self):
+        self._slide_pending = False
+        if self._rows:
+            self._scroll_to(self._start + round(self.tree.yview()[0] * len(self._rows)))
+
+    def _scroll_to(self, top: int):
+        """Put model row `top` at the top of the view, with the window
+        centred on it."""
+        total = len(self._iids)
+        self._start = max(0, min(top - WINDOW_SIZE // 2, total - WINDOW_SIZE))
+        self._render()
+        self.tree.yview_moveto((top - self._start) / len(self._rows))
+
+    def yview(self, *args):
+        """Scrollbar command. Dragging the thumb of a virtualized list jumps
+        the window to the matching part of the category."""
+        if not self.virtual or args[0] != "moveto":
+            return self.tree.yview(*args)
+        top = int(float(args[1]) * len(self._iids))
+        n = len(self._rows)
+        if self._start <= top <= self._start + n * (1 - EDGE_MARGIN):
+            self.tree.yview_moveto((top - self._start) / n)
+        else:
+            self._scroll_to(top)
+
+
+def _longest_increasing(seq) -> set:
+    """Indices into `seq` of one longest strictly increasing subsequence,
+    in O(n log n)."""
+    tails, tail_at, prev = [], [], [None] * len(seq)
+    for k, value in enumerate(seq):
+        j = bisect_left(tails, value)
+        if j == len(tails):
+            tails.append(value)
+            tail_at.append(k)
+        else:
+            tails[j] = value
+            tail_at[j] = k
+        prev[k] = tail_at[j - 1] if j else None
+    result = set()
+    k = tail_at[-1] if tail_at else None
+    while k is not None:
+        result.add(k)
+        k = prev[k]
+    return result
@@ -0,0 +1,174 @@
+"""
+Start-up time benchmark for the GUI.
+
+    python launcher/bench_startup.py                 # report only
+    python launcher/bench_startup.py --check         # exit 1 if over budget (CI)
+    python launcher/bench_startup.py --write-budget  # measure the budget here
+
+Each measurement runs in a fresh interpreter:
+  - `python -X importtime -c "import ui"`: total import cost of the UI module,
+    plus its slowest direct imports
+  - which modules `import ui` pulls in — the heavy optional dependencies
+    (pystray, Pillow, keyboard) must not be among them
+  - time to first paint: from spawning the process until LauncherUI has been
+    built and drawn once (`update()` returned), on a temp copy of config.json
+
+Timings are the median of --runs runs. Budgets live in startup_budget.json
+next to this file: --write-budget sets them to the medians measured on this
+machine times the file's "headroom" (and records what it measured, and
+where). Timings only compare on the same machine, so the committed file
+holds just the headroom; CI measures the base commit on its own runner with
+--write-budget and then checks the change against that (see
+.github/workflows/startup-budget.yml).
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+BUDGET_PATH = HERE / "startup_budget.json"
+DEFAULT_HEADROOM = 1.3
+
+# Must only be imported once the tray/hotkey is actually used
+LAZY_MODULES = ("pystray", "PIL", "keyboard")
+
+# Runs against a copy of config.json in a temp dir, so the journal, lock
+# and snapshot the UI writes don't land next to this file
+FIRST_PAINT_SNIPPET = """
+import atexit, shutil, sys, tempfile
+from pathlib import Path
+import config
+folder = Path(tempfile.mkdtemp(prefix="bench-startup-"))
+atexit.register(shutil.rmtree, folder, True)  # after Config's own flush
+if config.CONFIG_PATH.exists():
+    shutil.copy(config.CONFIG_PATH, folder / config.CONFIG_NAME)
+config.CONFIG_PATH = folder / config.CONFIG_NAME
+from ui import LauncherUI
+app = LauncherUI()
+app.update()
+sys.stdout.write("painted\\n")
+sys.stdout.flush()
+app.destroy()
+"""
+
+
+def measure_imports(module: str = "ui"):
+    """(total_ms, {direct import: cumulative_ms}, set of every module imported)
+    for `import <module>` in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=HERE, capture_output=True, text=True, check=True,
+    )
+    total, children, pending = 0.0, {}, {}
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        stripped = name.strip()
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        imported.add(stripped.split(".")[0])
+        # -X importtime prints children before their parent, so collect
+        # depth-1 entries until we reach the top-level entry they belong to
+        if depth == 1:
+            pending[stripped] = int(cumulative) / 1000.0
+        elif depth == 0:
+            if stripped == module:
+                total, children = int(cumulative) / 1000.0, pending
+            pending = {}
+    return total, children, imported
+
+
+def measure_first_paint() -> float:
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", FIRST_PAINT_SNIPPET],
+        cwd=HERE, stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline()
+    elapsed = (time.perf_counter() - start) * 1000.0
+    proc.wait()
+    if line.strip() != "painted":
+        raise RuntimeError("UI process exited before painting")
+    return elapsed
+
+
+def read_budget() -> dict:
+    try:
+        return json.loads(BUDGET_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Fail if over budget.")
+    parser.add_argument("--write-budget", action="store_true",
+                        help="Set the budget to the measured medians plus headroom.")
+    parser.add_argument("--headroom", type=float,
+                        help=f"Budget / measured median (default: the budget file's, else {DEFAULT_HEADROOM}).")
+    args = parser.parse_args(argv)
+    budget = read_budget()
+
+    import_totals, paints = [], []
+    children, imported = {}, set()
+    for _ in range(args.runs):
+        total, children, imported = measure_imports()
+        import_totals.append(total)
+        paints.append(measure_first_paint())
+
+    import_ms = statistics.median(import_totals)
+    paint_ms = statistics.median(paints)
+    print(f"import ui:       {import_ms:8.1f} ms (median of {args.runs})")
+    print(f"first paint:     {paint_ms:8.1f} ms (median of {args.runs})")
+    print("slowest imports:")
+    for name, ms in sorted(children.items(), key=lambda kv: kv[1], reverse=True)[:8]:
+        print(f"  {name:<28} {ms:8.1f} ms")
+
+    eager = [m for m in LAZY_MODULES if m in imported]
+    if eager:
+        print(f"eagerly imported (should be lazy): {', '.join(eager)}")
+
+    if args.write_budget:
+        headroom = args.headroom or budget.get("headroom", DEFAULT_HEADROOM)
+        budget = {
+            "headroom": headroom,
+            "import_ms": round(import_ms * headroom),
+            "first_paint_ms": round(paint_ms * headroom),
+            "measured": {
+                "import_ms": round(import_ms, 1),
+                "first_paint_ms": round(paint_ms, 1),
+                "runs": args.runs,
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+            },
+        }
+        BUDGET_PATH.write_text(json.dumps(budget, indent=4) + "\n", encoding="utf-8")
+        print(f"wrote {BUDGET_PATH.name}: import {budget['import_ms']} ms, "
+              f"first paint {budget['first_paint_ms']} ms (x{headroom})")
+
+    if not args.check:
+        return 0
+    if "import_ms" not in budget:
+        print("FAIL: no budget measured on this machine; run --write-budget first")
+        return 1
+    failures = []
+    if import_ms > budget["import_ms"]:
+        failures.append(f"import ui took {import_ms:.0f} ms (budget {budget['import_ms']} ms)")
+    if paint_ms > budget["first_paint_ms"]:
+        failures.append(f"first paint took {paint_ms:.0f} ms (budget {budget['first_paint_ms']} ms)")
+    if eager:
+        failures.append(f"{', '.join(eager)} imported at start-up")
+    for f in failures:
+        print(f"FAIL: {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Staggered boot scheduling for login-time (--startup) launches.
+
+Firing every app at once at login makes them all fight over the disk and CPU
+at the same moment, so the desktop takes longer to become usable than if the
+important apps had started first and the rest had trickled in behind them.
+BootScheduler spawns apps in priority order (lower number = sooner), honours
+a per-app "not before" delay, keeps at most `max_concurrent` apps in their
+start-up window at a time, and can optionally hold back further spawns while
+the machine is under load (LoadGate).
+
+This module has no Tk (or other third-party) imports so it can be used from
+plain scripts at login.
+"""
+import heapq
+import os
+import threading
+import time
+
+from appentry import entry_path
+
+DEFAULT_MAX_CONCURRENT = 2
+DEFAULT_SETTLE = 2.0          # seconds an app holds its slot after spawning
+DEFAULT_MAX_LOAD = 1.0        # 1-minute load average per CPU
+DEFAULT_MAX_IO_PRESSURE = 20.0  # % of time some task stalled on I/O (avg10)
+DEFAULT_MAX_GATE_WAIT = 15.0  # never hold a single app back longer than this
+
+
+class BootItem:
+    def __init__(self, command, priority: int = 0, delay: float = 0.0):
+        """`command` is whatever start_fn expects — usually an app entry."""
+        self.command = command
+        self.priority = priority
+        self.delay = max(0.0, float(delay))
+
+
+class LoadGate:
+    """Reads /proc/loadavg and /proc/pressure/io where they exist. On systems
+    without them (Windows, older kernels) the gate is always open."""
+
+    def __init__(self, max_load: float = DEFAULT_MAX_LOAD,
+                 max_io_pressure: float = DEFAULT_MAX_IO_PRESSURE,
+                 max_wait: float = DEFAULT_MAX_GATE_WAIT,
+                 poll: float = 0.25):
+        self.max_load = max_load
+        self.max_io_pressure = max_io_pressure
+        self.max_wait = max_wait
+        self.poll = poll
+        self._cpus = os.cpu_count() or 1
+
+    @staticmethod
+    def _read(path: str):
+        try:
+            with open(path, "r", encoding="ascii") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def load_per_cpu(self):
+        raw = self._read("/proc/loadavg")
+        if not raw:
+            return None
+        try:
+            return float(raw.split()[0]) / self._cpus
+        except (IndexError, ValueError):
+            return None
+
+    def io_pressure(self):
+        raw = self._read("/proc/pressure/io")
+        if not raw:
+            return None
+        for line in raw.splitlines():
+            if line.startswith("some "):
+                for field in line.split()[1:]:
+                    key, _, value = field.partition("=")
+                    if key == "avg10":
+                        try:
+                            return float(value)
+                        except ValueError:
+                            return None
+        return None
+
+    def is_open(self) -> bool:
+        load = self.load_per_cpu()
+        if load is not None and load > self.max_load:
+            return False
+        pressure = self.io_pressure()
+        if pressure is not None and pressure > self.max_io_pressure:
+            return False
+        return True
+
+    def wait(self) -> float:
+        """Block until the system is below both thresholds, or `max_wait`
+        seconds have passed. Returns how long it actually waited."""
+        start = time.monotonic()
+        while not self.is_open():
+            waited = time.monotonic() - start
+            if waited >= self.max_wait:
+                break
+            time.sleep(min(self.poll, self.max_wait - waited))
+        return time.monotonic() - start
+
+
+class BootScheduler:
+    def __init__(self, start_fn, max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 settle: float = DEFAULT_SETTLE, gate: LoadGate = None):
+        """`start_fn(command)` spawns one app and may return a Popen-like
+        object; if it does, the app's slot is released as soon as the process
+        exits, otherwise after `settle` seconds."""
+        self.start_fn = start_fn
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.settle = max(0.0, float(settle))
+        self.gate = gate
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+
+    def _hold_slot(self, proc):
+        deadline = time.monotonic() + self.settle
+        poll = getattr(proc, "poll", None)
+        while time.monotonic() < deadline:
+            if poll is not None and poll() is not None:
+                break
+            time.sleep(0.05)
+        self._slots.release()
+
+    def run(self, items) -> list:
+        """Spawn every item and return [(command, started_at_offset, error)]
+        in spawn order. Returns once the last app has been spawned — it does
+        not wait for the final settle windows."""
+        # Heap of items not yet due, keyed by when they become eligible;
+        # a second heap of eligible items keyed by priority.
+        pending = [(item.delay, item.priority, i, item) for i, item in enumerate(items)]
+        heapq.heapify(pending)
+        ready = []
+        started = []
+        t0 = time.monotonic()
+
+        def promote_due():
+            now = time.monotonic() - t0
+            while pending and pending[0][0] <= now:
+                _, priority, i, item = heapq.heappop(pending)
+                heapq.heappush(ready, (priority, i, item))
+            return now
+
+        while pending or ready:
+            now = promote_due()
+            if not ready:
+                time.sleep(pending[0][0] - now)
+                continue
+
+            self._slots.acquire()
+            if self.gate is not None:
+                self.gate.wait()
+            # Waiting for a slot/the gate may have made higher-priority items due
+            promote_due()
+            _, _, item = heapq.heappop(ready)
+
+            offset = time.monotonic() - t0
+            try:
+                proc = self.start_fn(item.command)
+                error = ""
+            except Exception as e:
+                proc, error = None, str(e)
+                self._slots.release()
+            else:
+                threading.Thread(target=self._hold_slot, args=(proc,), daemon=True).start()
+            started.append((item.command, offset, error))
+        return started
+
+
+def build_items(commands, boot_settings: dict) -> list:
+    """Turn a flat list of app entries into BootItems, applying per-app
+    `priority`/`delay` from settings["boot"]["apps"][path]."""
+    overrides = boot_settings.get("apps", {}) if boot_settings else {}
+    items = []
+    for cmd in commands:
+        opts = overrides.get(entry_path(cmd), {})
+        items.append(BootItem(cmd, priority=int(opts.get("priority", 0)), delay=float(opts.get("delay", 0.0))))
+    return items
+
+
+def scheduler_from_settings(start_fn, boot_settings: dict, gate_enabled=None) -> BootScheduler:
+    """Build a BootScheduler from a settings["boot"] dict (all keys optional)."""
+    s = boot_settings or {}
+    if gate_enabled is None:
+        gate_enabled = bool(s.get("gate", True))
+    gate = None
+    if gate_enabled:
+        gate = LoadGate(
+            max_load=float(s.get("max_load", DEFAULT_MAX_LOAD)),
+            max_io_pressure=float(s.get("max_io_pressure", DEFAULT_MAX_IO_PRESSURE)),
+            max_wait=float(s.get("max_gate_wait", DEFAULT_MAX_GATE_WAIT)),
+        )
+    return BootScheduler(
+        start_fn,
+        max_concurrent=int(s.get("max_concurrent", DEFAULT_MAX_CONCURRENT)),
+        settle=float(s.get("settle", DEFAULT_SETTLE)),
+        gate=gate,
+    )
@@ -0,0 +1,189 @@
+"""
+Headless command-line entry point.
+
+    python -m launcher run --profile work
+    python -m launcher run --category gaming --skip-running
+    python -m launcher list
+    python -m launcher show
+    python -m launcher migrate
+    python -m launcher memory
+
+Only imports the config and the launch core — no Tk, ttkbootstrap, Pillow,
+pystray or keyboard — so login scripts and scheduled tasks can launch a
+profile without ever building a window.
+
+If the launcher window is already running, `run` and `show` are forwarded to
+it over the single-instance channel (see instance.py) and return as soon as
+it has accepted them; `run` then reports progress and failures in that
+window. Pass `--local` to launch from this process regardless. `memory`
+asks the running launcher for its memory use (see memory.py) without
+showing its window.
+
+Exit status: 0 every app started (or was already running), 1 at least one
+app failed to launch, 2 bad arguments or unknown profile/category, 3 the
+profile/category has no apps in it. A forwarded `run` exits 0 once the
+running window has queued the launch; `memory` exits 1 if it couldn't get
+an answer.
+"""
+import argparse
+import sys
+
+from instance import send_command
+
+EXIT_OK = 0
+EXIT_LAUNCH_FAILED = 1
+EXIT_USAGE = 2
+EXIT_EMPTY = 3
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="launcher", description="Launch app categories and profiles.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Launch a profile or a category.")
+    target = run.add_mutually_exclusive_group(required=True)
+    target.add_argument("--profile", help="Profile to launch.")
+    target.add_argument("--category", help="Category to launch.")
+    run.add_argument("--skip-running", action="store_true", default=None,
+                     help="Don't start apps that are already running (default: the saved setting).")
+    run.add_argument("--workers", type=int, help="How many apps may be spawning at once (local runs only).")
+    run.add_argument("--local", action="store_true",
+                     help="Launch from this process even if the launcher window is running.")
+    run.add_argument("-q", "--quiet", action="store_true", help="Only print failures.")
+
+    sub.add_parser("list", help="List categories and profiles.")
+    sub.add_parser("show", help="Show the launcher window, starting it if it isn't running.")
+    sub.add_parser("migrate", help="Move config.json into a SQLite database (config.db) for large libraries.")
+    sub.add_parser("memory", help="Show the running launcher's memory use (RSS, tracemalloc).")
+    return parser
+
+
+def cmd_list(config) -> int:
+    print("Categories:")
+    for name in config.categories:
+        print(f"  {name} ({config.category_size(name)} app(s))")
+    print("Profiles:")
+    for name, cats in config.profiles.items():
+        print(f"  {name}: {', '.join(cats) if cats else '(no categories)'}")
+    return EXIT_OK
+
+
+def forward_run(args):
+    """Hand `run` to the resident instance. Returns an exit status, or None
+    if there is no instance to forward to."""
+    message = {"cmd": "run", "skip_running": args.skip_running}
+    if args.profile is not None:
+        message["profile"] = args.profile
+    else:
+        message["category"] = args.category
+    reply = send_command(message)
+    if reply is None:
+        return None
+    if not reply.get("ok"):
+        print(reply.get("error", "The running launcher refused the request"), file=sys.stderr)
+        return {"unknown": EXIT_USAGE, "empty": EXIT_EMPTY}.get(reply.get("reason"), EXIT_LAUNCH_FAILED)
+    if not args.quiet:
+        print(f"Launching {reply.get('count', 0)} app(s) from {reply.get('label', '')} in the running launcher.")
+    return EXIT_OK
+
+
+def cmd_run(config, args) -> int:
+    # The launch core is only needed when nothing could be forwarded
+    from launcher import AppLauncher
+    from lnk import CACHE_NAME, ShortcutCache
+    from stats import STATS_NAME, LaunchStats
+
+    if args.profile is not None:
+        if args.profile not in config.profiles:
+            print(f"Unknown profile: {args.profile}", file=sys.stderr)
+            return EXIT_USAGE
+        entries = config.get_profile_apps(args.profile)
+        label, profile = f"profile '{args.profile}'", args.profile
+    else:
+        if args.category not in config.categories:
+            print(f"Unknown category: {args.category}", file=sys.stderr)
+            return EXIT_USAGE
+        entries = config.categories[args.category]
+        label, profile = f"'{args.category}'", None
+
+    if not entries:
+        print(f"Nothing to launch in {label}.", file=sys.stderr)
+        return EXIT_EMPTY
+
+    skip_running = config.get_skip_running() if args.skip_running is None else args.skip_running
+    launcher = AppLauncher(
+        max_workers=args.workers or config.get_launch_workers(),
+        stats=LaunchStats(config.path.with_name(STATS_NAME)),
+        shortcuts=ShortcutCache(config.path.with_name(CACHE_NAME)),
+        confirm_alive=False,
+    )
+    try:
+        results = launcher.launch_list(
+            entries, rules=config.launch_rules, profile=profile, label=label, skip_running=skip_running
+        )
+    except ValueError as e:
+        # Dependency cycle / bad readiness check in launch_rules
+        print(str(e), file=sys.stderr)
+        return EXIT_USAGE
+
+    failed = 0
+    for r in results:
+        if not r.success:
+            failed += 1
+            print(f"FAILED   {r.path}: {r.error}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"{'RUNNING' if r.skipped else 'STARTED'}  {r.path} ({r.elapsed:.2f}s)")
+    return EXIT_LAUNCH_FAILED if failed else EXIT_OK
+
+
+def cmd_migrate(config) -> int:
+    if config.uses_sqlite:
+        print("Already using config.db.")
+        return EXIT_OK
+    db_path = config.migrate_to_sqlite()
+    print(f"Migrated to {db_path} ({len(config.all_app_paths())} app(s), {len(config.categories)} categories).")
+    print(f"The old file was kept as {config.path.name}.migrated; delete {db_path.name} to go back to it.")
+    return EXIT_OK
+
+
+def cmd_memory() -> int:
+    from memory import format_report
+
+    reply = send_command({"cmd": "memory"})
+    if reply is None:
+        print("The launcher isn't running.", file=sys.stderr)
+        return EXIT_LAUNCH_FAILED
+    if not reply.get("ok"):
+        print(reply.get("error", "The running launcher refused the request"), file=sys.stderr)
+        return EXIT_LAUNCH_FAILED
+    print(format_report(reply["report"]))
+    return EXIT_OK
+
+
+def cmd_show() -> int:
+    from main import run_gui
+    return run_gui()
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "show":
+        return cmd_show()
+    if args.command == "memory":
+        return cmd_memory()
+    if args.command == "run" and not args.local:
+        status = forward_run(args)
+        if status is not None:
+            return status
+
+    from config import Config
+    config = Config()
+    if args.command == "list":
+        return cmd_list(config)
+    if args.command == "migrate":
+        return cmd_migrate(config)
+    return cmd_run(config, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,61 @@
+import atexit
+import copy
+import functools
 import json
+import os
 import shutil
 import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from appentry import entry_name, entry_path, is_valid_entry
+from journal import Journal
+from proclock import ProcessLock
+from trash import Trash
+
 CONFIG_NAME = "config.json"
+# When this exists next to config.json it is used instead (see sqlstore.py)
+DB_NAME = "config.db"
+# Mutations since config.json was last written (see journal.py)
+JOURNAL_NAME = "config.journal.jsonl"
+# Held by whichever process is reading or writing the files above
+LOCK_NAME = "config.lock"
+
+
+class ConfigError(ValueError):
+    """A mutation inside Config.batch() was refused, or the batch left the
+    config inconsistent. The batch has been rolled back."""
+
+
+def _mutation(method):
+    """Outside a batch a refused mutation just returns False/None as always;
+    inside one it raises ConfigError so the whole batch rolls back."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self._batch_depth and (result is False or result is None):
+            raise ConfigError(f"{method.__name__}{args!r} was refused")
+        return result
+    return wrapper
+
+
+@dataclass
+class ConfigDiff:
+    """What Config.reload() changed, so the UI can patch just those parts."""
+    categories_added: list = field(default_factory=list)
+    categories_removed: list = field(default_factory=list)
+    categories_changed: list = field(default_factory=list)  # same name, different apps
+    category_order_changed: bool = False
+    profiles_changed: list = field(default_factory=list)     # added, removed or edited
+    settings_changed: list = field(default_factory=list)     # keys
+
+    def __bool__(self):
+        return bool(self.categories_added or self.categories_removed or self.categories_changed
+                    or self.category_order_changed or self.profiles_changed or self.settings_changed)
 
 
 def _is_default_category(name: str) -> bool:
@@ -23,7 +75,80 @@ def _resolve_config_path() -> Path:
 
 CONFIG_PATH = _resolve_config_path()
 
+
+def _atomic_write(path: Path, text: str):
+    """Write via a temp file + os.replace, so a crash mid-write leaves the
+    old file intact instead of a truncated one."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    for attempt in range(5):
+        try:
+            os.replace(tmp, path)
+            return
+        except PermissionError:
+            # Windows: the target is briefly open elsewhere (editor, AV scan)
+            if attempt == 4:
+                raise
+            time.sleep(0.05)
+
+
+def _snapshot_ops(base: dict, theirs: dict) -> list:
+    """The edits that turn config document `base` into `theirs`, as
+    operation records (see Config._record) that Config._rebase can re-apply
+    to another version. Apps are compared by path; an app whose entry
+    changed is removed and re-inserted. Renames show up as a removal plus
+    an addition, and a hand-deleted setting is left alone."""
+    ops = []
+    base_cats, their_cats = base.get("categories", {}), theirs.get("categories", {})
+    for name in base_cats:
+        if name not in their_cats:
+            ops.append(["remove_category", name])
+    for name, apps in their_cats.items():
+        if name not in base_cats:
+            ops.append(["add_category", name])
+        old = base_cats.get(name, [])
+        kept = {entry_path(e): e for e in apps}
+        for index in reversed(range(len(old))):
+            if kept.get(entry_path(old[index])) != old[index]:
+                ops.append(["remove_app", name, index, old[index]])
+        had = {entry_path(e): e for e in old}
+        for index, entry in enumerate(apps):
+            if had.get(entry_path(entry)) != entry:
+                ops.append(["insert_app", name, index, entry])
+    base_profiles, their_profiles = base.get("profiles", {}), theirs.get("profiles", {})
+    ops += [["remove_profile", name] for name in base_profiles if name not in their_profiles]
+    ops += [["set_profile", name, cats] for name, cats in their_profiles.items()
+            if base_profiles.get(name) != cats]
+    base_settings = base.get("settings", {})
+    ops += [["set_setting", key, value] for key, value in theirs.get("settings", {}).items()
+            if key not in base_settings or base_settings[key] != value]
+    base_rules, their_rules = base.get("launch_rules", {}), theirs.get("launch_rules", {})
+    ops += [["remove_launch_rule", path] for path in base_rules if path not in their_rules]
+    ops += [["set_launch_rule", path, rule] for path, rule in their_rules.items()
+            if base_rules.get(path) != rule]
+    return ops
+
+
 DEFAULT_HOTKEY = "ctrl+alt+l"
+# What a launch hotkey (settings["hotkeys"]) can be bound to
+HOTKEY_TARGETS = ("profile", "category", "app")
+# Presses of the same launch hotkey closer together than this are one launch
+DEFAULT_HOTKEY_DEBOUNCE_MS = 500
+# Minutes hidden in the tray before the window drops its widgets (0: never)
+DEFAULT_IDLE_TEARDOWN_MINUTES = 10
+DEFAULT_LAUNCH_WORKERS = 4
+
+# Seconds save() waits before writing, so a burst of edits becomes one write
+SAVE_DELAY = 0.5
+# Journal size (bytes) at which it's folded into a fresh snapshot
+JOURNAL_COMPACT_BYTES = 256 * 1024
+# Removed apps remembered for Trash / Undo
+TRASH_LIMIT = 200
+# config.json versions kept in memory as merge bases (see Config._load)
+SNAPSHOT_HISTORY = 3
 
 
 class Config:
@@ -33,37 +158,735 @@ class Config:
             "categories": {},
             "profiles": {}
         }
+        # Write-behind state: save() bumps _generation and arms _timer;
+        # whichever write runs next persists everything up to that generation.
+        self._save_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._timer = None
+        self._generation = 0
+        self._written = 0
+        self.save_error = None
+        # Bumped by every change (and load), so a snapshot taken elsewhere
+        # can tell it's out of date without comparing contents
+        self.revision = 0
+        self._batch_depth = 0
+        self._batch_dirty = False
+        # Called after every change, see add_listener
+        self._listeners = []
+        # Lookup indexes, kept in step with self.data by the mutators below
+        # (so change categories/profiles through Config, not by editing the
+        # lists directly):
+        #   _category_paths     category -> Counter of app paths in it
+        #   _app_categories     app path -> categories containing it
+        #   _category_profiles  category -> profiles that include it
+        #   _app_profiles       app path -> profiles that launch it
+        #   _profile_apps       profile -> resolved launch list, built on
+        #                       first use and dropped when it could change
+        #   _search             fuzzy name/path index (search.py), built on
+        #                       the first search()
+        self._category_paths = {}
+        self._app_categories = {}
+        self._category_profiles = {}
+        self._app_profiles = {}
+        self._profile_apps = {}
+        self._search = None
+        # Every mutator emits an operation record (see _record). The
+        # write-behind thread appends them to the journal and, with the
+        # SQLite backend, applies them to config.db — nothing rewrites a
+        # whole file per edit.
+        self._store = None
+        self._ops = []
+        self._journal = Journal(self.path.with_name(JOURNAL_NAME))
+        self._replaying = False
+        # Other processes (CLI, scripts) may share these files. Loads and
+        # writes hold _file_lock; _stale means another process wrote since
+        # we last read, so our queued records wait for flush() to merge
+        # them onto its version (see _write). merge_conflicts lists the
+        # records the last merge had to drop.
+        self._file_lock = ProcessLock(self.path.with_name(LOCK_NAME))
+        self._stale = False
+        self._merging = False
+        self.merge_conflicts = []
+        # Journal seq included in the config.json we last read or wrote, and
+        # that file's (mtime, size, inode), to tell other writers from us
+        self._snapshot_seq = 0
+        self._file_signature = None
+        # The journal has edits config.json doesn't (flush() folds them in)
+        self._snapshot_behind = False
+        # journal seq -> text of the config.json we read or wrote for it,
+        # the last SNAPSHOT_HISTORY of them: what a file written from an
+        # older snapshot is merged against once its records are compacted
+        # away
+        self._snapshots = {}
+        # Removed apps, oldest first, as (category, index, entry); see
+        # trash.py. Rebuilt from the journal on load, so Trash and Undo
+        # survive restarts.
+        self.trash = Trash(TRASH_LIMIT)
+        db_path = self.path.with_name(DB_NAME)
+        if db_path.exists():
+            from sqlstore import SqliteStore
+            self._store = SqliteStore(db_path)
+        atexit.register(self.flush)
         self.load()
 
+    @property
+    def uses_sqlite(self) -> bool:
+        return self._store is not None
+
     def load(self):
+        with self._write_lock, self._file_lock:
+            self._load()
+        self._changed()
+
+    def add_listener(self, callback):
+        """Call `callback()` after every change, on the thread that made it:
+        each mutation (a batch once, when it commits or rolls back) and each
+        load, reload or merge. For things derived from the config that
+        other threads read (see LauncherUI._refresh_launch_targets)."""
+        self._listeners.append(callback)
+
+    def _changed(self):
+        for callback in list(self._listeners):
+            callback()
+
+    def _load(self):
+        self.revision += 1
+        self.trash = Trash(TRASH_LIMIT)
+        records = self._journal.read()
+        if self._store is not None:
+            # Names, profiles and settings only; app entries are read per
+            # category on first use. config.db is always current, so the
+            # journal only supplies the Trash history.
+            self.data = self._store.load()
+            self._stale = False
+            self._rebuild_indexes()
+            self._replay(records, None)
+            return
+
         if not self.path.exists():
             # Initialize with a default category
             self.data = {
                 "categories": {"default": []},
                 "profiles": {}
             }
-            self.save()
+            self._stale = False
+            self._rebuild_indexes()
+            self._compact()
             return
 
         with self.path.open("r", encoding="utf-8") as f:
-            raw = json.load(f)
+            text = f.read()
+        raw = json.loads(text)
+        self._remember_file()
 
         # Backward compatibility: old format was { "default": [...], "gaming": [...], "profiles": {...} }
-        if "categories" not in raw:
+        converted = "categories" not in raw
+        versioned = False
+        if converted:
             profiles = raw.get("profiles") if isinstance(raw.get("profiles"), dict) else {}
             self.data["categories"] = {
                 k: v for k, v in raw.items()
                 if k != "profiles" and isinstance(v, list)
             }
             self.data["profiles"] = profiles
-            self.save()
+            snapshot_seq = 0
         else:
             self.data = raw
             self.data.setdefault("profiles", {})
+            versioned = "journal_seq" in raw
+            # A writer that didn't keep "journal_seq" still started from the
+            # last snapshot we know of
+            snapshot_seq = self.data.pop("journal_seq", self._snapshot_seq)
+        # The snapshot the journal continues from; records up to it are gone
+        folded = max((r["snapshot"] for r in records if "snapshot" in r), default=0)
+        theirs = None
+        if snapshot_seq < folded and snapshot_seq in self._snapshots and folded in self._snapshots:
+            # Written from an older snapshot than the journal's: our edits
+            # since are no longer records to replay. Rebuild ours (the newer
+            # snapshot plus the journal), then re-apply the edits that turned
+            # that older snapshot into this file.
+            base = json.loads(self._snapshots[snapshot_seq])
+            theirs, self.data = self.data, json.loads(self._snapshots[folded])
+            self.data.pop("journal_seq", None)
+        if versioned:
+            # What we now take this version to be: a later save from the
+            # same editor is merged against it
+            self._keep_snapshot(snapshot_seq, text)
+        if theirs is not None:
+            snapshot_seq = folded
+        self._snapshot_seq = snapshot_seq
+        # If compacting stopped between the snapshot and the journal rewrite,
+        # new records must still be numbered after the snapshot
+        self._journal.seq = max(self._journal.seq, snapshot_seq)
+        self._stale = False
+        self._rebuild_indexes()
+        self._replay(records, snapshot_seq)
+        self._snapshot_behind = any(r.get("op") and r["seq"] > snapshot_seq for r in records)
+        if theirs is not None:
+            self._replaying = True
+            try:
+                for op in _snapshot_ops(base, theirs):
+                    self._rebase(op[0], op[1:])
+            finally:
+                self._replaying = False
+            self._snapshot_behind = True  # config.json lacks our side of it
+        if converted or theirs is not None or self._journal.size > JOURNAL_COMPACT_BYTES:
+            self._compact()
+
+    # Changes made by other programs
+
+    def _keep_snapshot(self, seq: int, text: str):
+        self._snapshots.pop(seq, None)
+        self._snapshots[seq] = text
+        while len(self._snapshots) > SNAPSHOT_HISTORY:
+            del self._snapshots[next(iter(self._snapshots))]
+
+    def _remember_file(self):
+        try:
+            st = os.stat(self.path)
+            self._file_signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            self._file_signature = None
+
+    def watched_files(self) -> list:
+        """The files other programs change the config through."""
+        if self._store is not None:
+            return [self._journal.path]
+        return [self.path, self._journal.path]
+
+    def changed_on_disk(self) -> bool:
+        """True if config.json or the journal was written by someone else
+        since we last read or wrote it (with the SQLite backend: the
+        journal, which every process appends to)."""
+        return self._stale or self._journal.changed() or self._file_changed()
+
+    def _file_changed(self) -> bool:
+        """True if config.json isn't the file we last read or wrote."""
+        if self._store is not None:
+            return False
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        return (st.st_mtime_ns, st.st_size, st.st_ino) != self._file_signature
+
+    def _structure(self):
+        if self._store is not None:
+            # Which apps each category holds, from the indexes, rather than
+            # reading every category from config.db (misses pure reorders)
+            categories = {name: Counter(paths) for name, paths in self._category_paths.items()}
+        else:
+            categories = {name: list(apps) for name, apps in self.categories.items()}
+        return {
+            "categories": categories,
+            "profiles": {name: list(cats) for name, cats in self.profiles.items()},
+            "settings": copy.deepcopy(self.settings),
+        }
+
+    def reload(self) -> ConfigDiff:
+        """Re-read the config after another program changed it. Our own
+        unwritten edits are merged onto its version first (see _merge), and
+        edits that are still only in the journal are replayed on top, as on
+        start-up. Returns what changed."""
+        before = self._structure()
+        self.merge_conflicts = []
+        if not self.flush():
+            return ConfigDiff()  # couldn't write ours yet; try again next time
+        trash = self.trash.copy()
+        try:
+            self.load()
+        except (OSError, ValueError):
+            # Half-written or broken file: keep what we have (data is only
+            # replaced once the new document has parsed)
+            self.trash = trash
+            raise
+        after = self._structure()
+
+        diff = ConfigDiff()
+        old_cats, new_cats = before["categories"], after["categories"]
+        diff.categories_added = [c for c in new_cats if c not in old_cats]
+        diff.categories_removed = [c for c in old_cats if c not in new_cats]
+        diff.categories_changed = [c for c in new_cats if c in old_cats and new_cats[c] != old_cats[c]]
+        kept = [c for c in old_cats if c in new_cats]
+        diff.category_order_changed = kept != [c for c in new_cats if c in old_cats]
+        old_profs, new_profs = before["profiles"], after["profiles"]
+        diff.profiles_changed = [p for p in {**old_profs, **new_profs} if old_profs.get(p) != new_profs.get(p)]
+        old_set, new_set = before["settings"], after["settings"]
+        diff.settings_changed = [k for k in {**old_set, **new_set} if old_set.get(k) != new_set.get(k)]
+        return diff
+
+    # Operation records and history
+
+    def _record(self, op: str, *args):
+        """Every mutator calls this alongside its in-memory change. The record
+        is queued for the next write (journal, and config.db if in use) and
+        fed to the Trash history."""
+        if self._replaying:
+            return
+        self.revision += 1
+        with self._save_lock:
+            self._ops.append((op,) + args)
+        self._note_history(op, args)
+
+    def _replay(self, records, after_seq):
+        """Rebuild the Trash from every journal record, and re-apply the
+        operations newer than the snapshot (seq > after_seq). With
+        after_seq=None only the history is rebuilt.
+
+        The snapshot may not be ours — someone edited config.json — so
+        records are re-applied the way a merge rebases them (_rebase),
+        matching apps by path rather than trusting recorded positions."""
+        self._replaying = True
+        try:
+            for record in records:
+                op = record.get("op")
+                if op:
+                    if after_seq is not None and record["seq"] > after_seq:
+                        self._rebase(op[0], op[1:])
+                    self._note_history(op[0], op[1:])
+                elif record.get("trash"):
+                    self.trash.push(*record["trash"])
+        finally:
+            self._replaying = False
+
+    def _note_history(self, op: str, args):
+        if op == "remove_app":
+            category, index, entry = args
+            self.trash.push(category, index, entry)
+        elif op in ("insert_app", "discard_trash"):
+            # Restored, re-added or thrown away: no longer in the Trash
+            self.trash.discard(args[0], entry_path(args[-1]))
+        elif op == "rename_category":
+            self.trash.rename_category(*args)
+
+    def discard_from_trash(self, category: str, entry):
+        """Forget a removed app without restoring it."""
+        self._record("discard_trash", category, entry)
+        self.save()
 
     def save(self):
-        with self.path.open("w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=4)
+        """Schedule a write of config.json (or of the queued operation records
+        to config.db). Every save() within SAVE_DELAY
+        seconds of the first is coalesced into one write on a background
+        thread, so callers never wait on serialization or disk I/O. Use
+        flush() when the file must be up to date (e.g. before exiting).
+        Inside batch() this only notes that a write is due on commit."""
+        if self._replaying or self._merging:
+            return
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
+        self._changed()
+        if self._journal.size > JOURNAL_COMPACT_BYTES and self._compact():
+            return
+        with self._save_lock:
+            self._generation += 1
+            if self._timer is None:
+                self._timer = threading.Timer(SAVE_DELAY, self._write_behind)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> bool:
+        """Write any pending changes now, merging them onto another
+        process's newer version if there is one. Then, if the journal holds
+        edits config.json doesn't, fold them into a fresh config.json, so
+        whatever reads or edits that file directly (an editor, a script, an
+        older version) sees the current config; between flushes the journal
+        keeps each edit O(1). Returns False if the write failed (the error
+        is kept in save_error)."""
+        with self._save_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            generation = self._generation
+        if not self._write(generation, merge=True):
+            return False
+        if self._snapshot_behind:
+            self._compact()  # if this can't run now, the journal is still complete
+        return True
+
+    def _write_behind(self):
+        with self._save_lock:
+            self._timer = None
+            generation = self._generation
+        if self._batch_depth:
+            return  # don't persist a half-applied batch; its commit saves again
+        self._write(generation)
+
+    @contextmanager
+    def batch(self):
+        """Apply many mutations as one transaction:
+
+            with config.batch():
+                config.add_category("tools")
+                for path in paths:
+                    config.add_app_to_category("tools", path)
+
+        Mutations inside apply in memory only. On a clean exit the result is
+        validated once and written with a single save(); if a mutation is
+        refused, validation fails or anything raises, the config is restored
+        to its state before the batch and the exception propagates. Nested
+        batches join the outermost one."""
+        if self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+
+        # Write out what's pending first, so rolling back is just dropping
+        # this batch's records (and, on config.db, re-reading the database)
+        self.flush()
+        snapshot = None if self._store is not None else copy.deepcopy(self.data)
+        trash = self.trash.copy()
+        self._batch_depth = 1
+        self._batch_dirty = False
+        try:
+            yield self
+            self.validate()
+        except BaseException:
+            with self._save_lock:
+                self._ops = []
+            self.data = self._store.load() if snapshot is None else snapshot
+            self.trash = trash
+            self._rebuild_indexes()
+            self._changed()
+            raise
+        finally:
+            self._batch_depth = 0
+        if self._batch_dirty:
+            self.save()
+
+    def validate(self):
+        """Raise ConfigError if categories, profiles or launch rules are
+        inconsistent with each other."""
+        for name, apps in dict.items(self.categories):
+            if apps is None:
+                continue  # not read from config.db yet, so not changed either
+            if not isinstance(apps, list):
+                raise ConfigError(f"Category '{name}' is not a list of apps")
+            seen = set()
+            for entry in apps:
+                if not is_valid_entry(entry):
+                    raise ConfigError(f"Invalid app entry in '{name}': {entry!r}")
+                path = entry_path(entry)
+                if path in seen:
+                    raise ConfigError(f"'{path}' is in category '{name}' twice")
+                seen.add(path)
+        for name, cats in self.profiles.items():
+            missing = [c for c in cats if c not in self.categories]
+            if missing:
+                raise ConfigError(f"Profile '{name}' refers to missing categories: {', '.join(missing)}")
+        rules = self.data.get("launch_rules")
+        if rules:
+            from dag import LaunchGraph
+
+            try:
+                LaunchGraph(list(rules) + self.all_app_paths(), rules)
+            except ValueError as e:
+                raise ConfigError(str(e)) from e
+
+    def _write(self, generation: int, merge: bool = False) -> bool:
+        """Append the queued records to the journal (applying them to
+        config.db first when that's in use): O(1) per edit.
+
+        The append is a compare-and-swap on the journal: under the config
+        lock, if it isn't the file we last read or wrote, another process
+        has written since and our records' positions may no longer match.
+        With merge=True (flush(), on the thread making the changes) we catch
+        up and rebase onto its version first; the write-behind thread can't
+        touch self.data, so it leaves the records queued for that."""
+        with self._write_lock:
+            if generation <= self._written:
+                return True
+            try:
+                with self._file_lock:
+                    if self._stale or self._journal.changed():
+                        if not merge:
+                            self._stale = True
+                            return False
+                        self._merge()
+                    return self._append(generation)
+            except (OSError, ValueError) as e:
+                # Lock timeout, or their version couldn't be read (_merge
+                # has put our records back)
+                self.save_error = e
+                return False
+
+    def _append(self, generation: int) -> bool:
+        with self._save_lock:
+            ops, self._ops = self._ops, []
+        try:
+            if self._store is not None:
+                self._store.apply(ops)
+        except Exception as e:  # sqlite3.Error, OSError
+            self._requeue(ops, e)
+            return False
+        try:
+            self._journal.append(ops)
+        except OSError as e:
+            if self._store is None:
+                self._requeue(ops, e)
+                return False
+            # config.db already has them; the journal is only history there
+        if ops and self._store is None:
+            self._snapshot_behind = True
+        self._written = generation
+        self.save_error = None
+        return True
+
+    def _merge(self):
+        """Three-way merge with another process's newer version: the base
+        is what we last read, theirs is on disk, ours is base + our queued
+        records. Reload theirs, then re-apply each of our records to it
+        (_rebase), which queues them afresh with positions that fit."""
+        with self._save_lock:
+            ops, self._ops = self._ops, []
+        trash = self.trash.copy()
+        self._merging = True
+        try:
+            try:
+                self._load()
+            except (OSError, ValueError):
+                self.trash = trash
+                self._stale = True
+                with self._save_lock:
+                    self._ops[:0] = ops
+                raise
+            self.merge_conflicts = [op for op in ops if not self._rebase(op[0], op[1:])]
+        finally:
+            self._merging = False
+        self._changed()
+
+    def _rebase(self, op: str, args) -> bool:
+        """Re-apply one of our records on top of another process's version
+        (or, replaying the journal, on top of config.json). Apps are
+        matched by path rather than position, so edits to different
+        apps, categories, profiles and settings all survive; where both
+        sides changed the same thing, ours lands last and wins. Returns
+        False if it had to be dropped (its category or profile is gone)."""
+        if op == "insert_app":
+            category, index, entry = args
+            if category not in self.categories:
+                return False
+            self.insert_app_into_category(category, entry, index)  # no-op if they added it too
+        elif op == "remove_app":
+            category, index, entry = args
+            apps = self.categories.get(category, [])
+            path = entry_path(entry)
+            if not (index < len(apps) and entry_path(apps[index]) == path):
+                index = next((i for i, e in enumerate(apps) if entry_path(e) == path), None)
+            if index is not None:  # else they removed it too
+                self.remove_app_from_category(category, index)
+        elif op in ("rename_category", "rename_profile"):
+            old, new = args
+            names = self.categories if op == "rename_category" else self.profiles
+            if old not in names:
+                return new in names  # they renamed it the same way, or deleted it
+            return bool(getattr(self, op)(old, new))
+        elif op == "set_profile":
+            name, categories = args
+            if name in self.profiles:
+                self.set_profile_categories(name, categories)
+            else:
+                self.add_profile(name, categories)
+        elif op == "set_setting":
+            self.settings[args[0]] = args[1]
+            self._record(op, *args)
+        elif op == "set_launch_rule":
+            from dag import LaunchGraph
+
+            path, rule = args
+            rules = dict(self.launch_rules, **{path: rule})
+            try:
+                LaunchGraph(list(rules) + self.all_app_paths(), rules)
+            except ValueError:
+                return False  # together with their rules it would be a cycle
+            self.launch_rules[path] = rule
+            self._record(op, *args)
+        elif op == "discard_trash":
+            self._record(op, *args)
+        else:
+            # add/remove category or profile, remove launch rule: refused
+            # only when they already did the same
+            getattr(self, op)(*args)
+        return True
+
+    def _requeue(self, ops, error):
+        with self._save_lock:
+            self._ops[:0] = ops  # retried by the next save()/flush()
+        self.save_error = error
+
+    def _compact(self) -> bool:
+        """Fold everything into a fresh snapshot (config.json; config.db is
+        always current) and shrink the journal to the Trash records. Runs on
+        the thread that makes the changes, so the snapshot can't catch one
+        half-made."""
+        try:
+            with self._write_lock, self._file_lock:
+                if self._stale or self._journal.changed() or self._file_changed():
+                    # Another process (or an editor) wrote since we read: a
+                    # snapshot of our view would drop its edits.
+                    # flush()/reload() merge first.
+                    self._stale = True
+                    return False
+                with self._save_lock:
+                    if self._timer is not None:
+                        self._timer.cancel()
+                        self._timer = None
+                    generation = self._generation
+                    ops, self._ops = self._ops, []
+                try:
+                    seq = self._journal.seq + len(ops)
+                    if self._store is not None:
+                        self._store.apply(ops)
+                    else:
+                        text = json.dumps(dict(self.data, journal_seq=seq), indent=4)
+                        _atomic_write(self.path, text)
+                        self._remember_file()
+                        self._keep_snapshot(seq, text)
+                        self._snapshot_seq = seq
+                        self._snapshot_behind = False
+                    self._journal.seq = seq
+                except Exception as e:
+                    self._requeue(ops, e)
+                    return False
+                try:
+                    self._journal.rewrite(seq, self.trash)
+                except OSError:
+                    pass  # the old journal is still valid next to the new snapshot
+                self._written = generation
+                self.save_error = None
+                return True
+        except TimeoutError as e:
+            self.save_error = e
+            return False
+
+    def migrate_to_sqlite(self) -> Path:
+        """One-shot move from config.json to config.db. The JSON file is kept
+        as config.json.migrated; delete config.db to go back to it."""
+        if self._store is not None:
+            return self._store.path
+        from sqlstore import SqliteStore
+
+        self._compact()
+        db_path = self.path.with_name(DB_NAME)
+        store = SqliteStore(db_path)
+        try:
+            store.import_data(self.data)
+        except Exception:
+            store.close()
+            db_path.unlink()
+            raise
+        if self.path.exists():
+            os.replace(self.path, self.path.with_name(CONFIG_NAME + ".migrated"))
+        self._store = store
+        self.load()
+        return db_path
+
+    # Indexes
+
+    def _memberships(self):
+        """(category, app path) for every app in every category."""
+        if self._store is not None:
+            return self._store.memberships()  # without reading every entry
+        return [(cat, entry_path(e)) for cat, apps in self.categories.items() for e in apps]
+
+    def _rebuild_indexes(self):
+        self._category_paths = {cat: Counter() for cat in self.categories}
+        self._app_categories = {}
+        for cat, path in self._memberships():
+            self._category_paths[cat][path] += 1
+            self._app_categories.setdefault(path, set()).add(cat)
+        self._category_profiles = {cat: set() for cat in self.categories}
+        for prof, cats in self.profiles.items():
+            for cat in cats:
+                self._category_profiles.setdefault(cat, set()).add(prof)
+        self._app_profiles = {}
+        for path in self._app_categories:
+            self._reindex_app(path)
+        self._profile_apps = {}
+        self._search = None
+
+    def _reindex_app(self, path: str):
+        profiles = set()
+        for cat in self._app_categories.get(path, ()):
+            profiles |= self._category_profiles.get(cat, set())
+        if profiles:
+            self._app_profiles[path] = profiles
+        else:
+            self._app_profiles.pop(path, None)
+
+    def _reindex_categories(self, categories):
+        """Recompute app -> profiles for every app in `categories`."""
+        for cat in categories:
+            for path in self._category_paths.get(cat, ()):
+                self._reindex_app(path)
+
+    def _index_app(self, category: str, entry, delta: int):
+        path = entry_path(entry)
+        counts = self._category_paths[category]
+        counts[path] += delta
+        if counts[path] > 0:
+            self._app_categories.setdefault(path, set()).add(category)
+            if self._search is not None:
+                self._search.add(category, entry, entry_name(entry), path)
+        else:
+            del counts[path]
+            cats = self._app_categories.get(path, set())
+            cats.discard(category)
+            if not cats:
+                self._app_categories.pop(path, None)
+            if self._search is not None:
+                self._search.remove(category, path)
+        self._reindex_app(path)
+        # Every profile that includes this category now resolves differently
+        for prof in self._category_profiles.get(category, ()):
+            self._profile_apps.pop(prof, None)
+
+    def category_size(self, category: str) -> int:
+        return sum(self._category_paths.get(category, Counter()).values())
+
+    def category_has_app(self, category: str, path: str) -> bool:
+        return path in self._category_paths.get(category, ())
+
+    def categories_with_app(self, path: str) -> set:
+        return set(self._app_categories.get(path, ()))
+
+    def profiles_with_app(self, path: str) -> set:
+        return set(self._app_profiles.get(path, ()))
+
+    def prepare_search(self):
+        """Build the search index now (it's kept up to date from then on),
+        so the first search() doesn't pay for it."""
+        if self._search is None:
+            from search import SearchIndex
+
+            self._search = SearchIndex()
+            for cat, apps in self.categories.items():
+                for entry in apps:
+                    self._search.add(cat, entry, entry_name(entry), entry_path(entry))
+        return self._search
+
+    def drop_caches(self):
+        """Free the search index and the resolved profile lists; each is
+        built again on first use."""
+        self._search = None
+        self._profile_apps.clear()
+
+    def search(self, query: str, limit: int = None, scored: bool = False) -> list:
+        """Apps across all categories whose name or path fuzzily matches
+        `query`, best first, as (category, entry) pairs (or (score,
+        category, entry) with `scored`)."""
+        index = self.prepare_search()
+        if limit is None:
+            return index.search(query, scored=scored)
+        return index.search(query, limit, scored=scored)
+
+    def all_app_paths(self) -> list:
+        """Every distinct app path across all categories."""
+        return list(self._app_categories)
 
     @property
     def categories(self):
@@ -77,19 +900,93 @@ class Config:
     def settings(self):
         return self.data.setdefault("settings", {})
 
+    @property
+    def launch_rules(self):
+        """Per-app launch ordering, keyed by app path. See dag.py."""
+        return self.data.setdefault("launch_rules", {})
+
     def get_hotkey(self) -> str:
         return self.settings.get("hotkey", DEFAULT_HOTKEY)
 
+    @_mutation
     def set_hotkey(self, combo: str) -> bool:
         combo = combo.strip().lower()
-        if not combo:
+        if not combo or combo in self.get_launch_hotkeys():
             return False
         self.settings["hotkey"] = combo
+        self._record("set_setting", "hotkey", combo)
+        self.save()
+        return True
+
+    def get_launch_hotkeys(self) -> dict:
+        """Hotkeys that launch something directly, as combo -> {kind: name}
+        with kind one of HOTKEY_TARGETS, e.g. {"ctrl+alt+1": {"profile": "Work"}}."""
+        hotkeys = self.settings.get("hotkeys")
+        if not isinstance(hotkeys, dict):
+            return {}
+        return {
+            combo: dict(target) for combo, target in hotkeys.items()
+            if isinstance(target, dict) and len(target) == 1 and next(iter(target)) in HOTKEY_TARGETS
+        }
+
+    @_mutation
+    def set_launch_hotkey(self, combo: str, kind: str, name: str) -> bool:
+        """Bind `combo` to launch a profile, category or app (by path),
+        replacing whatever it launched before. Refuses the quick-launch
+        hotkey's combo."""
+        combo = combo.strip().lower()
+        if not combo or not name or kind not in HOTKEY_TARGETS or combo == self.get_hotkey():
+            return False
+        hotkeys = self.get_launch_hotkeys()
+        hotkeys[combo] = {kind: name}
+        self.settings["hotkeys"] = hotkeys
+        self._record("set_setting", "hotkeys", hotkeys)
+        self.save()
+        return True
+
+    @_mutation
+    def remove_launch_hotkey(self, combo: str) -> bool:
+        hotkeys = self.get_launch_hotkeys()
+        if hotkeys.pop(combo, None) is None:
+            return False
+        self.settings["hotkeys"] = hotkeys
+        self._record("set_setting", "hotkeys", hotkeys)
         self.save()
         return True
 
+    def get_hotkey_debounce(self) -> float:
+        """Seconds within which repeats of a launch hotkey count as one press."""
+        try:
+            return max(0, int(self.settings.get("hotkey_debounce_ms", DEFAULT_HOTKEY_DEBOUNCE_MS))) / 1000
+        except (TypeError, ValueError):
+            return DEFAULT_HOTKEY_DEBOUNCE_MS / 1000
+
+    def get_idle_teardown(self) -> float:
+        """Seconds the window stays hidden before it tears down its widgets
+        (see LauncherUI._enter_idle); 0 turns that off."""
+        try:
+            return max(0.0, float(self.settings.get("idle_teardown_minutes", DEFAULT_IDLE_TEARDOWN_MINUTES))) * 60
+        except (TypeError, ValueError):
+            return DEFAULT_IDLE_TEARDOWN_MINUTES * 60
+
+    def get_launch_workers(self) -> int:
+        """How many apps may be spawning at the same time."""
+        try:
+            return max(1, int(self.settings.get("launch_workers", DEFAULT_LAUNCH_WORKERS)))
+        except (TypeError, ValueError):
+            return DEFAULT_LAUNCH_WORKERS
+
+    def get_skip_running(self) -> bool:
+        return bool(self.settings.get("skip_running", False))
+
+    def set_skip_running(self, enabled: bool):
+        self.settings["skip_running"] = bool(enabled)
+        self._record("set_setting", "skip_running", bool(enabled))
+        self.save()
+
     # Category management
 
+    @_mutation
     def add_category(self, name: str):
         name = name.strip()
         if not name:
@@ -97,55 +994,118 @@ class Config:
         if name in self.categories:
             return False
         self.categories[name] = []
+        self._category_paths[name] = Counter()
+        self._category_profiles.setdefault(name, set())  # profiles may already name it
+        self._record("add_category", name)
         self.save()
         return True
 
+    @_mutation
     def remove_category(self, name: str):
         if _is_default_category(name):
             return False
         if name not in self.categories:
             return False
         del self.categories[name]
-        # Keep profiles consistent: drop the removed category from any profile
-        for prof, cats in self.profiles.items():
-            self.profiles[prof] = [c for c in cats if c != name]
+        if self._search is not None:
+            self._search.remove_category(name)
+        # Keep profiles consistent: drop the removed category from the
+        # profiles that include it
+        for prof in self._category_profiles.pop(name, ()):
+            self.profiles[prof] = [c for c in self.profiles[prof] if c != name]
+            self._profile_apps.pop(prof, None)
+        for path in self._category_paths.pop(name, ()):
+            cats = self._app_categories[path]
+            cats.discard(name)
+            if not cats:
+                del self._app_categories[path]
+            self._reindex_app(path)
+        self._record("remove_category", name)
         self.save()
         return True
 
+    @_mutation
     def rename_category(self, old: str, new: str):
         new = new.strip()
         if not new or old not in self.categories:
             return False
         if new in self.categories and new != old:
             return False
+        if new == old:
+            return True
         self.categories[new] = self.categories.pop(old)
-        # Update profiles that reference this category
-        for prof, cats in self.profiles.items():
-            self.profiles[prof] = [new if c == old else c for c in cats]
+        if self._search is not None:
+            self._search.rename_category(old, new)
+        # Update profiles that reference this category. Their resolved app
+        # lists don't change, so the memoized ones stay valid.
+        profs = self._category_profiles.pop(old, set())
+        for prof in profs:
+            self.profiles[prof] = [new if c == old else c for c in self.profiles[prof]]
+        # Profiles that already named `new` before it existed now pick up its apps
+        stale = self._category_profiles.get(new, set())
+        self._category_profiles[new] = profs | stale
+        paths = self._category_paths[new] = self._category_paths.pop(old)
+        for path in paths:
+            cats = self._app_categories[path]
+            cats.discard(old)
+            cats.add(new)
+        if stale:
+            for prof in stale:
+                self._profile_apps.pop(prof, None)
+            self._reindex_categories([new])
+        self._record("rename_category", old, new)
         self.save()
         return True
 
-    def add_app_to_category(self, category: str, path: str):
-        if category not in self.categories:
+    @_mutation
+    def add_app_to_category(self, category: str, entry):
+        """`entry` is a path string or a structured entry dict (see
+        appentry.py). An app whose path is already in the category is refused."""
+        if category not in self.categories or not is_valid_entry(entry):
             return False
-        if path in self.categories[category]:
+        if self.category_has_app(category, entry_path(entry)):
             return False
-        self.categories[category].append(path)
+        apps = self.categories[category]
+        apps.append(entry)
+        self._index_app(category, entry, 1)
+        self._record("insert_app", category, len(apps) - 1, entry)
         self.save()
         return True
 
+    @_mutation
+    def insert_app_into_category(self, category: str, entry, index: int = None):
+        """Put `entry` back at `index` (default: the end), e.g. to undo a
+        removal. Refused like add_app_to_category if its path is already there."""
+        if category not in self.categories or not is_valid_entry(entry):
+            return False
+        if self.category_has_app(category, entry_path(entry)):
+            return False
+        apps = self.categories[category]
+        index = len(apps) if index is None else max(0, min(index, len(apps)))
+        apps.insert(index, entry)
+        self._index_app(category, entry, 1)
+        self._record("insert_app", category, index, entry)
+        self.save()
+        return True
+
+    @_mutation
     def remove_app_from_category(self, category: str, index: int):
         if category not in self.categories:
             return None
-        try:
-            removed = self.categories[category].pop(index)
-        except IndexError:
+        apps = self.categories[category]
+        if index < 0:
+            index += len(apps)
+        if not 0 <= index < len(apps):
             return None
+        removed = apps.pop(index)
+        self._index_app(category, removed, -1)
+        self._record("remove_app", category, index, removed)
         self.save()
         return removed
 
     # Profile management
 
+    @_mutation
     def add_profile(self, name: str, categories=None):
         name = name.strip()
         if not name:
@@ -154,42 +1114,122 @@ class Config:
             return False
         valid = [c for c in (categories or []) if c in self.categories]
         self.profiles[name] = valid
+        for cat in valid:
+            self._category_profiles[cat].add(name)
+        self._reindex_categories(valid)
+        self._record("set_profile", name, valid)
         self.save()
         return True
 
+    @_mutation
     def remove_profile(self, name: str):
         if name not in self.profiles:
             return False
-        del self.profiles[name]
+        cats = self.profiles.pop(name)
+        for cat in cats:
+            self._category_profiles.get(cat, set()).discard(name)
+        self._reindex_categories(cats)
+        self._profile_apps.pop(name, None)
+        self._record("remove_profile", name)
         self.save()
         return True
 
+    @_mutation
     def rename_profile(self, old: str, new: str):
         new = new.strip()
         if not new or old not in self.profiles:
             return False
         if new in self.profiles and new != old:
             return False
-        self.profiles[new] = self.profiles.pop(old)
+        if new == old:
+            return True
+        cats = self.profiles[new] = self.profiles.pop(old)
+        for cat in cats:
+            profs = self._category_profiles[cat]
+            profs.discard(old)
+            profs.add(new)
+        self._reindex_categories(cats)
+        if old in self._profile_apps:
+            self._profile_apps[new] = self._profile_apps.pop(old)
+        self._record("rename_profile", old, new)
         self.save()
         return True
 
+    @_mutation
     def set_profile_categories(self, name: str, categories):
         if name not in self.profiles:
             return False
         valid = [c for c in categories if c in self.categories]
+        old = self.profiles[name]
         self.profiles[name] = valid
+        changed = set(old) ^ set(valid)
+        for cat in changed:
+            if cat in valid:
+                self._category_profiles[cat].add(name)
+            else:
+                self._category_profiles.get(cat, set()).discard(name)
+        self._reindex_categories(changed)
+        self._profile_apps.pop(name, None)
+        self._record("set_profile", name, valid)
+        self.save()
+        return True
+
+    # Launch rules (dependencies between apps)
+
+    @_mutation
+    def set_launch_rule(self, path: str, after=None, ready=None, ready_timeout=None):
+        """Make `path` wait for every app in `after` to be ready, and/or set
+        what "ready" means for `path` itself. Returns False if the rule would
+        create a dependency cycle."""
+        from dag import LaunchGraph, parse_ready
+
+        rule = dict(self.launch_rules.get(path, {}))
+        if after is not None:
+            rule["after"] = [a for a in dict.fromkeys(after) if a != path]
+        if ready is not None:
+            try:
+                parse_ready(ready)
+            except ValueError:
+                return False
+            rule["ready"] = ready
+        if ready_timeout is not None:
+            rule["ready_timeout"] = float(ready_timeout)
+
+        rules = dict(self.launch_rules)
+        rules[path] = rule
+        try:
+            LaunchGraph(list(rules) + self.all_app_paths(), rules)
+        except ValueError:
+            return False
+        self.launch_rules[path] = rule
+        self._record("set_launch_rule", path, rule)
+        self.save()
+        return True
+
+    @_mutation
+    def remove_launch_rule(self, path: str):
+        if path not in self.launch_rules:
+            return False
+        del self.launch_rules[path]
+        self._record("remove_launch_rule", path)
         self.save()
         return True
 
     def get_profile_apps(self, name: str):
-        """Flattened, de-duplicated list of app paths across all categories in a profile."""
-        cats = self.profiles.get(name, [])
-        seen = set()
-        apps = []
-        for c in cats:
-            for path in self.categories.get(c, []):
-                if path not in seen:
-                    seen.add(path)
-                    apps.append(path)
-        return apps
\ No newline at end of file
+        """Flattened list of app entries across all categories in a profile,
+        de-duplicated by path (first occurrence wins). Resolved once and
+        memoized until one of the profile's categories (or the profile
+        itself) changes."""
+        apps = self._profile_apps.get(name)
+        if apps is None:
+            seen = set()
+            apps = []
+            for c in self.profiles.get(name, []):
+                for entry in self.categories.get(c, []):
+                    path = entry_path(entry)
+                    if path not in seen:
+                        seen.add(path)
+                        apps.append(entry)
+            if name in self.profiles:
+                self._profile_apps[name] = apps
+        return list(apps)
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""
+Dependency-aware launching.
+
+A launch rule (Config.launch_rules, keyed by app path) says an app has to
+wait for other apps to be *ready* before it is spawned, e.g. "start the DB
+tool after the VPN client":
+
+    "launch_rules": {
+        "C:/Tools/dbtool.exe": {"after": ["C:/VPN/vpn.exe"]},
+        "C:/VPN/vpn.exe": {"ready": "port:127.0.0.1:1194", "ready_timeout": 30}
+    }
+
+`ready` describes when *this* app counts as ready for the apps that wait on
+it:
+    "started"         — as soon as it has been spawned (the default)
+    "alive"           — its process is still running after a short grace period
+    "port:[host:]N"   — something accepts TCP connections on host:N (default
+                        host 127.0.0.1)
+    "file:PATH"       — PATH exists
+
+Dependencies on apps that aren't part of the current batch are ignored, so
+running a category without the VPN client in it doesn't block the DB tool.
+Everything without an unmet dependency is spawned in parallel; each app is
+released the moment its last dependency becomes ready. If a dependency fails
+to launch or doesn't become ready within its timeout, the apps waiting on it
+are reported as failed rather than launched.
+"""
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from appentry import entry_path
+from launcher import FAILED, QUEUED, WAITING, LaunchResult, image_running
+
+READY_STARTED = "started"
+READY_ALIVE = "alive"
+DEFAULT_READY_TIMEOUT = 30.0
+ALIVE_GRACE = 1.0
+POLL_INTERVAL = 0.1
+
+
+def parse_ready(spec: str):
+    """'port:host:1234' -> ('port', ('host', 1234)); 'file:C:/x' -> ('file', 'C:/x')."""
+    spec = (spec or READY_STARTED).strip()
+    kind, _, arg = spec.partition(":")
+    kind = kind.lower()
+    if kind == "port":
+        host, _, port = arg.rpartition(":")
+        return kind, (host or "127.0.0.1", int(port))
+    if kind == "file":
+        return kind, arg
+    if kind in (READY_STARTED, READY_ALIVE):
+        return kind, None
+    raise ValueError(f"Unknown readiness check: {spec!r}")
+
+
+def _port_open(host: str, port: int) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+
+def is_ready(kind: str, arg, result: LaunchResult, started_at: float) -> bool:
+    if kind == READY_STARTED:
+        return True
+    if kind == READY_ALIVE:
+        if time.monotonic() - started_at < ALIVE_GRACE:
+            return False
+        if result.proc is not None:
+            return result.proc.poll() is None
+        return image_running(result.path)
+    if kind == "port":
+        return _port_open(*arg)
+    if kind == "file":
+        return os.path.exists(arg)
+    return False
+
+
+class LaunchGraph:
+    def __init__(self, entries, rules: dict):
+        # Entries are identified by path; a later duplicate of a path is dropped
+        self.entries = {}
+        for e in entries:
+            self.entries.setdefault(entry_path(e), e)
+        self.paths = list(self.entries)
+        members = set(self.paths)
+        self.rules = rules or {}
+        self.deps = {}
+        for p in self.paths:
+            after = self.rules.get(p, {}).get("after", [])
+            self.deps[p] = [d for d in dict.fromkeys(after) if d in members and d != p]
+        self.dependents = {p: [] for p in self.paths}
+        for p, deps in self.deps.items():
+            for d in deps:
+                self.dependents[d].append(p)
+        self.check_acyclic()
+        # Parse every readiness spec up front so a typo fails before anything launches
+        self.readiness = {p: self._readiness(p) for p in self.paths if self.dependents[p]}
+
+    def has_edges(self) -> bool:
+        return any(self.deps.values())
+
+    def check_acyclic(self):
+        """Raise ValueError naming an app on a cycle (Kahn's algorithm)."""
+        indegree = {p: len(d) for p, d in self.deps.items()}
+        queue = [p for p, n in indegree.items() if n == 0]
+        seen = 0
+        while queue:
+            p = queue.pop()
+            seen += 1
+            for child in self.dependents[p]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    queue.append(child)
+        if seen != len(self.paths):
+            stuck = next(p for p, n in indegree.items() if n > 0)
+            raise ValueError(f"Launch rules contain a dependency cycle involving:\n{stuck}")
+
+    def _readiness(self, path: str):
+        rule = self.rules.get(path, {})
+        kind, arg = parse_ready(rule.get("ready", READY_STARTED))
+        timeout = float(rule.get("ready_timeout", DEFAULT_READY_TIMEOUT))
+        return kind, arg, timeout
+
+    def run(self, launcher, on_progress=None, profile=None, running=None) -> list:
+        """Launch the graph using `launcher` (an AppLauncher) and return one
+        LaunchResult per path, in the original order."""
+        results = {}
+        remaining = {p: set(d) for p, d in self.deps.items()}
+        watching = {}  # path -> (kind, arg, deadline, started_at)
+
+        if on_progress:
+            for p in self.paths:
+                on_progress(p, QUEUED if not remaining[p] else WAITING, None)
+
+        def fail_dependents(path: str, reason: str):
+            for child in self.dependents[path]:
+                if child in results:
+                    continue
+                results[child] = LaunchResult(child, False, f"{reason}: {Path(path).name}")
+                if on_progress:
+                    on_progress(child, FAILED, results[child])
+                fail_dependents(child, "Dependency not launched")
+
+        with ThreadPoolExecutor(max_workers=launcher.max_workers, thread_name_prefix="launch") as pool:
+            futures = {}
+
+            def submit(path: str):
+                futures[pool.submit(launcher.launch_path, self.entries[path], on_progress, profile, running)] = path
+
+            def release(path: str):
+                for child in self.dependents[path]:
+                    remaining[child].discard(path)
+                    if not remaining[child] and child not in results:
+                        submit(child)
+
+            for p in self.paths:
+                if not remaining[p]:
+                    submit(p)
+
+            while futures or watching:
+                if futures:
+                    done, _ = wait(list(futures), timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                else:
+                    done = ()
+                    time.sleep(POLL_INTERVAL)
+                for fut in done:
+                    path = futures.pop(fut)
+                    result = fut.result()
+                    results[path] = result
+                    if not self.dependents[path]:
+                        continue
+                    if not result.success:
+                        fail_dependents(path, "Dependency failed")
+                        continue
+                    kind, arg, timeout = self.readiness[path]
+                    now = time.monotonic()
+                    watching[path] = (kind, arg, now + timeout, now)
+
+                for path, (kind, arg, deadline, started_at) in list(watching.items()):
+                    if is_ready(kind, arg, results[path], started_at):
+                        del watching[path]
+                        release(path)
+                    elif time.monotonic() > deadline:
+                        del watching[path]
+                        fail_dependents(path, "Dependency not ready")
+
+        return [results[p] for p in self.paths]
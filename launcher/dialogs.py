@@ -0,0 +1,151 @@
+"""
+The Trash and profile-editor windows.
+
+Each is built the first time it's opened, hidden rather than destroyed when
+closed, and brought up to date when it's shown again by touching only what
+changed: Trash rows are keyed by the Trash's item ids, profile checkboxes by
+category name. Reopening either costs the rows and checkboxes that changed
+since, not one per removed app or per category.
+"""
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+from tkinter import messagebox
+
+from appentry import entry_name, entry_path
+
+
+class TrashWindow(tb.Toplevel):
+    """`on_restore(category, entry)` puts an app back, returning False if it
+    couldn't."""
+
+    def __init__(self, master, config_manager, on_restore):
+        super().__init__(master)
+        self.withdraw()
+        self.title("Trash")
+        self.geometry("600x300")
+        self.config_manager = config_manager
+        self.on_restore = on_restore
+        self._shown = {}  # row id (Trash item id) -> category shown
+
+        tree = tb.Treeview(self, columns=("category", "name", "path"), show="headings")
+        tree.bind("<Double-1>", self._restore_selected)
+        tree.heading("category", text="Original Category")
+        tree.heading("name", text="Name")
+        tree.heading("path", text="Path")
+        tree.column("category", width=150, anchor=W)
+        tree.column("name", width=200, anchor=W)
+        tree.column("path", width=400, anchor=W)
+        tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+        self.tree = tree
+
+        tb.Button(self, text="Close", command=self.withdraw, bootstyle=SECONDARY).pack(pady=10)
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+    def show(self):
+        self.refresh()
+        self.deiconify()
+        self.lift()
+
+    def refresh(self):
+        """Newest first. Deletes rows whose item left the Trash, relabels
+        ones whose category was renamed, and inserts the new ones at the top
+        (anything new is newer than every row already shown)."""
+        items = [(str(item_id), item) for item_id, item in self.config_manager.trash.items()]
+        current = {row_id for row_id, _ in items}
+        gone = [row_id for row_id in self._shown if row_id not in current]
+        if gone:
+            self.tree.delete(*gone)
+            for row_id in gone:
+                del self._shown[row_id]
+        for row_id, (category, _, entry) in items:
+            shown = self._shown.get(row_id)
+            if shown is None:
+                self.tree.insert("", 0, iid=row_id, values=(category, entry_name(entry), entry_path(entry)))
+            elif shown != category:
+                self.tree.set(row_id, "category", category)
+            self._shown[row_id] = category
+
+    def _restore_selected(self, event=None):
+        sel = self.tree.selection()
+        if not sel:
+            return
+        item = self.config_manager.trash.get(int(sel[0]))
+        if item is None:
+            self.refresh()  # already restored or discarded elsewhere
+            return
+        category, _, entry = item
+        confirm = messagebox.askyesno(
+            "Restore Application",
+            f"Restore this application?\n\n"
+            f"Name: {entry_name(entry)}\n"
+            f"Category: {category}\n"
+            f"Path: {entry_path(entry)}",
+            parent=self
+        )
+        if confirm and self.on_restore(category, entry):
+            self.refresh()
+
+
+class ProfileEditor(tb.Toplevel):
+    """`on_save(profile, categories)` stores the ticked categories."""
+
+    def __init__(self, master, config_manager, on_save):
+        super().__init__(master)
+        self.withdraw()
+        self.geometry("300x400")
+        self.config_manager = config_manager
+        self.on_save = on_save
+        self.profile = None
+        self._checks = {}  # category -> (BooleanVar, Checkbutton)
+        self._order = []   # categories in the order they're packed
+
+        self.heading_var = tb.StringVar()
+        tb.Label(self, textvariable=self.heading_var).pack(pady=(10, 5))
+        self.check_frame = tb.Frame(self)
+        self.check_frame.pack(fill=BOTH, expand=True, padx=15)
+
+        btn_frame = tb.Frame(self)
+        btn_frame.pack(pady=10)
+        tb.Button(btn_frame, text="Save", command=self._save, bootstyle=SUCCESS).grid(row=0, column=0, padx=5)
+        tb.Button(btn_frame, text="Cancel", command=self.withdraw, bootstyle=SECONDARY).grid(row=0, column=1, padx=5)
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+    def show(self, profile: str):
+        self.profile = profile
+        self.title(f"Edit Profile: {profile}")
+        self.heading_var.set(f"Select categories for '{profile}':")
+        self._sync_categories()
+        current = set(self.config_manager.profiles.get(profile, []))
+        for category, (var, _) in self._checks.items():
+            if var.get() != (category in current):
+                var.set(category in current)
+        self.deiconify()
+        self.lift()
+
+    def _sync_categories(self):
+        """One checkbox per category: create the new ones, destroy the
+        removed ones, and only repack when the order changed."""
+        categories = list(self.config_manager.categories.keys())
+        wanted = set(categories)
+        for category in [c for c in self._checks if c not in wanted]:
+            self._checks.pop(category)[1].destroy()
+        kept = [c for c in self._order if c in wanted]
+        for category in categories:
+            if category not in self._checks:
+                var = tb.BooleanVar()
+                check = tb.Checkbutton(self.check_frame, text=category, variable=var, bootstyle="round-toggle")
+                self._checks[category] = (var, check)
+        if categories[:len(kept)] == kept:
+            new = categories[len(kept):]  # added at the end: pack just those
+        else:
+            for category in kept:
+                self._checks[category][1].pack_forget()
+            new = categories
+        for category in new:
+            self._checks[category][1].pack(anchor=W, pady=2)
+        self._order = categories
+
+    def _save(self):
+        selected = [c for c in self._order if self._checks[c][0].get()]
+        self.on_save(self.profile, selected)
+        self.withdraw()
@@ -0,0 +1,94 @@
+"""
+Frecency: how often *and* how recently each app and profile is launched.
+
+Every launch adds 1 to the item's score, and scores halve every HALF_LIFE
+seconds, so something used daily outranks something used a lot last
+month. Only (score, time of last update) is stored per item, and decay is
+applied when a score is read or bumped — nothing is recomputed from a
+history. Kept in `frecency.json` next to config.json:
+
+    {"app": {"C:/Games/steam.exe": [3.41, 1718000000.0]},
+     "profile": {"Work": [1.0, 1718100000.0]}}
+
+Items whose score has decayed below PRUNE_BELOW are dropped when saving.
+"""
+import json
+import os
+import threading
+import time
+
+FRECENCY_NAME = "frecency.json"
+HALF_LIFE = 7 * 24 * 3600
+PRUNE_BELOW = 0.05
+
+
+class Frecency:
+    def __init__(self, path, half_life: float = HALF_LIFE):
+        self.path = path
+        self.half_life = half_life
+        self._lock = threading.Lock()
+        self._items = None  # kind -> name -> [score, ts], read on first use
+
+    def _load(self):
+        """Caller holds the lock."""
+        self._items = {"app": {}, "profile": {}}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for kind, items in self._items.items():
+            for name, value in (data.get(kind) or {}).items():
+                try:
+                    items[name] = [float(value[0]), float(value[1])]
+                except (TypeError, ValueError, IndexError):
+                    continue
+
+    def _decayed(self, value, now: float) -> float:
+        score, ts = value
+        return score * 0.5 ** (max(0.0, now - ts) / self.half_life)
+
+    def score(self, kind: str, name: str, now: float = None) -> float:
+        with self._lock:
+            if self._items is None:
+                self._load()
+            value = self._items[kind].get(name)
+        return self._decayed(value, now or time.time()) if value else 0.0
+
+    def top(self, n: int, now: float = None) -> list:
+        """The n highest-scoring items as (kind, name, score)."""
+        now = now or time.time()
+        with self._lock:
+            if self._items is None:
+                self._load()
+            ranked = [
+                (kind, name, self._decayed(value, now))
+                for kind, items in self._items.items() for name, value in items.items()
+            ]
+        ranked.sort(key=lambda r: r[2], reverse=True)
+        return ranked[:n]
+
+    def record(self, kind: str, name: str):
+        """Count one launch of `name` ("app" path or "profile" name) and
+        save. Best-effort, like the launch stats: a failed write is ignored."""
+        now = time.time()
+        with self._lock:
+            if self._items is None:
+                self._load()
+            value = self._items[kind].get(name)
+            self._items[kind][name] = [(self._decayed(value, now) if value else 0.0) + 1.0, now]
+            data = {}
+            for kind, items in self._items.items():
+                for name, v in list(items.items()):
+                    score = self._decayed(v, now)
+                    if score < PRUNE_BELOW:
+                        del items[name]
+                    else:
+                        data.setdefault(kind, {})[name] = [round(score, 4), now]
+            tmp = self.path.with_name(f".{self.path.name}.tmp")
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.path)
+            except OSError:
+                pass
@@ -5,41 +5,110 @@ Uses the `keyboard` library (pip install keyboard) which listens system-wide
 on Windows, so the hotkey works even when the app is minimized to the tray
 or another window has focus.
 
+Any number of combos can be registered at once: the quick-launch hotkey
+(register/unregister) plus the launch hotkeys bound to profiles,
+categories and apps (add/remove/clear).
+
 Important: the callback fires on a background thread owned by `keyboard`,
 not the Tkinter main thread. Tkinter is not thread-safe, so callers must
 marshal back onto the main thread themselves (e.g. via `root.after(0, ...)`)
-rather than touching widgets directly inside the callback.
+rather than touching widgets directly inside the callback. The callback
+also holds up the listener while it runs, so it should only hand work off.
+
+Holding a combo down repeats it, and a double-press is easy to make; with
+`debounce` set, presses less than that many seconds after the previous one
+are dropped, so each of those is a single call.
+
+`keyboard` itself is imported on first use rather than at module load, so
+importing this module costs nothing until a hotkey is actually registered.
 """
-import keyboard
+import threading
+import time
+
+
+def _debounced(callback, window: float):
+    if window <= 0:
+        return callback
+    lock = threading.Lock()
+    last = [float("-inf")]
+
+    def fire():
+        now = time.monotonic()
+        with lock:
+            # Measured from the last press, not the last call, so a held key
+            # never fires again until it's released for a whole window
+            quiet = now - last[0] >= window
+            last[0] = now
+        if quiet:
+            callback()
+    return fire
 
 
 class HotkeyManager:
     def __init__(self):
         self._current_combo = None
+        self._combos = set()  # launch hotkeys from add()
 
-    def register(self, combo: str, callback) -> bool:
+    def register(self, combo: str, callback, debounce: float = 0.0) -> bool:
         """Register `combo` (e.g. 'ctrl+alt+l') to call `callback` when pressed.
         Replaces any previously registered hotkey. Returns False if the combo
         is invalid or could not be registered (e.g. reserved by the OS)."""
         self.unregister()
         combo = combo.strip().lower()
-        if not combo:
+        if not combo or combo in self._combos:
             return False
-        try:
-            keyboard.add_hotkey(combo, callback)
+        if self._add(combo, callback, debounce):
             self._current_combo = combo
             return True
-        except Exception:
-            return False
+        return False
 
     def unregister(self):
         if self._current_combo:
-            try:
-                keyboard.remove_hotkey(self._current_combo)
-            except Exception:
-                pass
+            self._remove(self._current_combo)
             self._current_combo = None
 
+    def add(self, combo: str, callback, debounce: float = 0.0) -> bool:
+        """Register another combo alongside the others. Returns False if it's
+        invalid, already taken or could not be registered."""
+        combo = combo.strip().lower()
+        if not combo or combo == self._current_combo or combo in self._combos:
+            return False
+        if self._add(combo, callback, debounce):
+            self._combos.add(combo)
+            return True
+        return False
+
+    def remove(self, combo: str):
+        if combo in self._combos:
+            self._combos.discard(combo)
+            self._remove(combo)
+
+    def clear(self):
+        """Remove every combo added with add()."""
+        for combo in list(self._combos):
+            self.remove(combo)
+
+    def _add(self, combo: str, callback, debounce: float) -> bool:
+        try:
+            import keyboard
+
+            keyboard.add_hotkey(combo, _debounced(callback, debounce))
+            return True
+        except Exception:
+            return False
+
+    def _remove(self, combo: str):
+        try:
+            import keyboard
+
+            keyboard.remove_hotkey(combo)
+        except Exception:
+            pass
+
     @property
     def current_combo(self):
-        return self._current_combo
\ No newline at end of file
+        return self._current_combo
+
+    @property
+    def combos(self):
+        return set(self._combos)
@@ -0,0 +1,220 @@
+"""
+Single-instance support: the first GUI process owns a local IPC endpoint,
+later invocations hand their command to it and exit.
+
+    - Windows: the named pipe \\\\.\\pipe\\bootup-launcher-<user>
+    - elsewhere: the Unix socket launcher.sock in a directory only we can
+      open, bootup-launcher-<uid> in $XDG_RUNTIME_DIR (or the temp folder)
+
+Both ends also prove they know this user's key — random bytes in an
+`authkey` file in that directory (%LOCALAPPDATA%\\bootup-launcher on
+Windows), readable only by us — through multiprocessing's HMAC challenge,
+before any request is read. Another local user can't reach the socket,
+and can't talk to the pipe without the key.
+
+One request and one reply per connection, each a single JSON object sent
+with multiprocessing.connection's send_bytes/recv_bytes (never pickle, so a
+peer can't make us unpickle anything):
+
+    {"cmd": "show"}
+    {"cmd": "run", "profile": "work"}
+    {"cmd": "run", "category": "gaming", "skip_running": true}
+    {"cmd": "ping"}
+
+Replies are {"ok": true, ...} or {"ok": false, "error": "...", "reason": "..."}.
+
+Nothing here imports Tk; the server calls `handler(message)` on its own
+thread and it's up to the handler to get onto the Tk thread.
+"""
+import getpass
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+# Seconds a client waits for the resident instance to answer. Generous,
+# because a request can arrive while that instance is still drawing its
+# window for the first time.
+REPLY_TIMEOUT = 10.0
+# Seconds the server waits for a connected client to send its request
+REQUEST_TIMEOUT = 2.0
+MAX_MESSAGE = 64 * 1024
+KEY_NAME = "authkey"
+KEY_BYTES = 32
+
+
+def private_dir() -> str:
+    """This user's directory for the socket and key, created 0700. Raises
+    OSError if it exists but belongs to someone else."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        folder = os.path.join(base, "bootup-launcher")
+        os.makedirs(folder, exist_ok=True)
+        return folder
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    folder = os.path.join(base, f"bootup-launcher-{os.getuid()}")
+    try:
+        os.mkdir(folder, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(folder)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+        raise OSError(f"{folder} is not this user's directory")
+    if st.st_mode & 0o077:
+        os.chmod(folder, 0o700)
+    return folder
+
+
+def authkey(folder: str = None) -> bytes:
+    """This user's key, made on first use."""
+    path = os.path.join(folder or private_dir(), KEY_NAME)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, "wb") as f:
+            f.write(os.urandom(KEY_BYTES))
+    for _ in range(50):
+        with open(path, "rb") as f:
+            key = f.read()
+        if len(key) >= KEY_BYTES:
+            return key
+        time.sleep(0.01)  # another process is still writing it
+    raise OSError(f"{path} is not a valid key")
+
+
+def endpoint():
+    """(address, family, authkey) of this user's launcher endpoint."""
+    folder = private_dir()
+    if sys.platform == "win32":
+        user = "".join(c for c in getpass.getuser() if c.isalnum()) or "user"
+        return rf"\\.\pipe\bootup-launcher-{user}", "AF_PIPE", authkey(folder)
+    return os.path.join(folder, "launcher.sock"), "AF_UNIX", authkey(folder)
+
+
+def _encode(message) -> bytes:
+    return json.dumps(message).encode("utf-8")
+
+
+def _decode(data: bytes):
+    message = json.loads(data.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("Expected a JSON object")
+    return message
+
+
+def send_command(message, timeout: float = REPLY_TIMEOUT):
+    """Send `message` to the resident instance and return its reply, or None
+    if no instance is listening."""
+    try:
+        address, family, key = endpoint()
+        conn = Client(address, family, authkey=key)
+    except (OSError, EOFError, AuthenticationError):
+        # No endpoint, a stale socket left behind by a crash, or not ours
+        return None
+    try:
+        conn.send_bytes(_encode(message))
+        if not conn.poll(timeout):
+            return {"ok": False, "error": "The running launcher did not reply", "reason": "timeout"}
+        return _decode(conn.recv_bytes(MAX_MESSAGE))
+    except (OSError, EOFError, ValueError) as e:
+        return {"ok": False, "error": f"Lost connection to the running launcher: {e}", "reason": "timeout"}
+    finally:
+        conn.close()
+
+
+class InstanceServer:
+    def __init__(self):
+        self.address = self.family = self._key = None
+        self._listener = None
+        self._thread = None
+        self._handler = None
+        self._stopping = False
+
+    def bind(self) -> bool:
+        """Claim the endpoint. False if another instance already owns it.
+        Connections made before serve() wait in the backlog."""
+        try:
+            self.address, self.family, self._key = endpoint()
+        except OSError:
+            return False
+        try:
+            self._listener = Listener(self.address, self.family, backlog=8, authkey=self._key)
+        except OSError:
+            if self.family != "AF_UNIX" or not os.path.exists(self.address):
+                return False  # Windows: the pipe's first instance belongs to someone else
+            if send_command({"cmd": "ping"}, timeout=REQUEST_TIMEOUT) is not None:
+                return False
+            # Left behind by an instance that didn't shut down cleanly
+            try:
+                os.unlink(self.address)
+                self._listener = Listener(self.address, self.family, backlog=8, authkey=self._key)
+            except OSError:
+                return False
+        return True
+
+    def serve(self, handler):
+        """Start answering requests on a background thread. `handler(message)`
+        is called on that thread and returns the reply dict."""
+        if self._listener is None or self._thread is not None:
+            return
+        self._handler = handler
+        self._thread = threading.Thread(target=self._accept_loop, name="instance-server", daemon=True)
+        self._thread.start()
+
+    def _accept_loop(self):
+        while not self._stopping:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                # Includes a peer that didn't know the key
+                if self._stopping:
+                    break
+                continue
+            try:
+                if self._stopping:
+                    break
+                self._handle(conn)
+            finally:
+                conn.close()
+
+    def _handle(self, conn):
+        try:
+            if not conn.poll(REQUEST_TIMEOUT):
+                return
+            message = _decode(conn.recv_bytes(MAX_MESSAGE))
+        except (OSError, EOFError, ValueError):
+            return  # not one of ours, or it hung up
+        if message.get("cmd") == "ping":
+            reply = {"ok": True}
+        else:
+            try:
+                reply = self._handler(message)
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+        try:
+            conn.send_bytes(_encode(reply))
+        except OSError:
+            pass
+
+    def stop(self):
+        """Stop serving and release the endpoint (removes the socket file)."""
+        if self._listener is None:
+            return
+        self._stopping = True
+        if self._thread is not None:
+            # accept() can't be interrupted portably; wake it with a connection.
+            # No key: the handshake would block if the loop has already exited.
+            try:
+                Client(self.address, self.family).close()
+            except (OSError, EOFError, AuthenticationError):
+                pass
+            self._thread.join(timeout=1.0)
+        self._listener.close()
+        self._listener = None
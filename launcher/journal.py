@@ -0,0 +1,135 @@
+"""
+Append-only journal of config mutations: `config.journal.jsonl` next to
+config.json.
+
+Every Config mutation is an operation record (see Config._record), e.g.
+["insert_app", "gaming", 3, "C:/Games/steam.exe"]. Instead of rewriting
+config.json after each edit, records are appended here one JSON line each:
+
+    {"seq": 41, "op": ["remove_app", "gaming", 3, "C:/Games/steam.exe"]}
+
+config.json becomes a snapshot that says which record it already includes
+("journal_seq"); loading reads the snapshot and replays the records after
+it. Once the journal grows past a size threshold, Config writes a fresh
+snapshot and compacts the journal down to the records that are still
+needed for history:
+
+    {"seq": 42, "snapshot": 41}
+    {"seq": 43, "trash": ["gaming", 3, "C:/Games/steam.exe"]}
+
+— a header naming the snapshot it continues, then one record per app in
+the Trash, so Trash/Undo survive restarts and compaction. A torn last line
+(crash mid-append) is dropped on the next read.
+
+The seq of the last record is the config's version: every append and every
+compaction moves it forward. Several processes may share the journal (the
+GUI, the CLI, scripts); they only touch it while holding the config lock
+(see proclock.py), and before writing each compares the version on disk
+with the one it last read or wrote — see changed().
+"""
+import json
+import os
+
+
+class Journal:
+    def __init__(self, path):
+        self.path = path
+        self.seq = 0    # seq of the last record in the file
+        self.size = 0   # bytes, to decide when to compact
+
+    def read(self) -> list:
+        """All intact records in order. Also sets seq and size, and cuts off
+        a partially written last line so later appends start clean."""
+        records = []
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.seq = self.size = 0
+            return records
+
+        good = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if not isinstance(record, dict) or not isinstance(record.get("seq"), int):
+                break
+            records.append(record)
+            good += len(line)
+
+        if good < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(good)
+        self.size = good
+        self.seq = records[-1]["seq"] if records else 0
+        return records
+
+    def last_seq(self) -> int:
+        """The version on disk: seq of the last complete record, found by
+        reading back from the end of the file rather than the whole of it."""
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return 0
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            chunk = 4096
+            while True:
+                start = max(0, end - chunk)
+                f.seek(start)
+                lines = f.read(end - start).split(b"\n")
+                # The last piece is a torn (or empty) tail, and unless we
+                # read from the start the first one may be cut off
+                complete = lines[1:-1] if start else lines[:-1]
+                if complete:
+                    try:
+                        return json.loads(complete[-1])["seq"]
+                    except (ValueError, KeyError, TypeError):
+                        return -1  # not ours to make sense of: treat as changed
+                if start == 0:
+                    return 0
+                chunk *= 4
+
+    def changed(self) -> bool:
+        """True if another process appended to or compacted the journal
+        since we last read or wrote it."""
+        return self.last_seq() != self.seq
+
+    def append(self, ops):
+        """Append operation records durably (flush + fsync)."""
+        if not ops:
+            return
+        lines = []
+        for i, op in enumerate(ops, start=1):
+            lines.append(json.dumps({"seq": self.seq + i, "op": list(op)}) + "\n")
+        text = "".join(lines).encode("utf-8")
+        with open(self.path, "ab") as f:
+            if f.tell() > self.size:
+                f.truncate(self.size)  # a torn line left by a crashed writer
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        self.seq += len(ops)
+        self.size += len(text)
+
+    def rewrite(self, snapshot_seq: int, trash):
+        """Replace the journal with a header for the snapshot that now holds
+        everything up to `snapshot_seq`, then one "trash" record per
+        (category, index, entry) in `trash`, numbered after everything
+        written so far."""
+        lines = [json.dumps({"seq": self.seq + 1, "snapshot": snapshot_seq}) + "\n"]
+        for i, item in enumerate(trash, start=2):
+            lines.append(json.dumps({"seq": self.seq + i, "trash": list(item)}) + "\n")
+        text = "".join(lines).encode("utf-8")
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.seq += len(lines)
+        self.size = len(text)
@@ -1,31 +1,314 @@
 import os
+import shlex
 import subprocess
-from pathlib import Path
-from tkinter import messagebox
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from appentry import compile_entry, entry_path
+from procindex import ProcessIndex
 
+DEFAULT_MAX_WORKERS = 4
+ALIVE_TIMEOUT = 5.0    # how long to wait for a freshly spawned app to come up
+ALIVE_POLL = 0.05      # first poll interval while waiting; doubles each poll...
+ALIVE_POLL_MAX = 0.8   # ...up to this
+WAIT_TIMEOUT = 0x102   # WaitForInputIdle: still busy starting up
 
-class AppLauncher:
-    def __init__(self):
-        pass
+# Per-app progress states reported through the `on_progress` callback.
+QUEUED = "queued"
+WAITING = "waiting"    # held back until the apps it depends on are ready
+SPAWNING = "spawning"
+STARTED = "started"
+SKIPPED = "already running"
+FAILED = "failed"
+
+
+@dataclass
+class LaunchResult:
+    """Outcome of launching a single app. `elapsed` is in seconds."""
+    path: str
+    success: bool
+    error: str = ""
+    elapsed: float = 0.0
+    skipped: bool = False  # already running, so not launched again
+    # Popen handle when the platform gives us one (os.startfile doesn't)
+    proc: object = field(default=None, repr=False, compare=False)
+
+
+def image_running(path: str) -> bool:
+    """Best-effort "is a process for this executable running" check, for when
+    the platform didn't give us a process handle."""
+    return ProcessIndex.snapshot().name_running(path)
+
+
+def _proc_ready(proc):
+    """Readiness of a process we hold a handle for: True once it is idle
+    waiting for input, False while it is still starting, None if it exited.
+
+    On Windows that's WaitForInputIdle, the signal the shell itself waits on
+    (processes without a message queue, i.e. console apps, count as ready as
+    soon as they run). On Linux it's the first time the process is asleep
+    waiting on an event (state S in /proc/<pid>/stat) rather than running
+    or in disk I/O. Elsewhere, running at all counts."""
+    if proc.poll() is not None:
+        return None
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        wait_for_input_idle = ctypes.windll.user32.WaitForInputIdle
+        wait_for_input_idle.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        wait_for_input_idle.restype = wintypes.DWORD
+        return wait_for_input_idle(int(proc._handle), 0) != WAIT_TIMEOUT
+    try:
+        with open(f"/proc/{proc.pid}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return True
+    # The state follows the command name, which is in parentheses and may
+    # itself contain spaces or parentheses
+    return stat[stat.rindex(b")") + 2:].split(b" ", 1)[0] == b"S"
 
-    def launch_path(self, path: str):
-        p = Path(path)
-        if not p.exists():
-            messagebox.showerror("Launch Error", f"File not found:\n{path}")
+
+class AliveWatcher:
+    """Times how long freshly spawned apps take to come up, for the stats.
+
+    One daemon thread serves every app still being waited on and exits when
+    there are none. Apps with a Popen handle are checked through it (see
+    _proc_ready); the rest (os.startfile gives no handle) are looked up by
+    image name in a process snapshot, and each poll takes at most one
+    snapshot however many apps are waiting. The interval starts at
+    ALIVE_POLL and doubles up to ALIVE_POLL_MAX, so an app that never shows
+    up costs about ten snapshots over ALIVE_TIMEOUT rather than a hundred."""
+
+    def __init__(self, process_provider=None, timeout: float = ALIVE_TIMEOUT):
+        self.process_provider = process_provider
+        self.timeout = timeout
+        self._pending = []  # (image, proc, on_done, started, deadline)
+        self._lock = threading.Lock()
+        self._interval = ALIVE_POLL
+        self._thread = None
+
+    def watch(self, image, proc, on_done):
+        """Call `on_done(seconds)` once the app is up, or `on_done(None)` if
+        it exited or didn't come up within the timeout — from the watcher
+        thread, except when there's nothing to watch. `image` is the
+        executable to look for when there's no `proc`; None means it isn't
+        known (e.g. a shortcut that couldn't be resolved). A process that
+        has already exited (say a stub that handed off to another one) is
+        reported as None straight away."""
+        if (proc is None and not image) or (proc is not None and proc.poll() is not None):
+            on_done(None)
             return
+        now = time.perf_counter()
+        with self._lock:
+            self._pending.append((image, proc, on_done, now, now + self.timeout))
+            self._interval = ALIVE_POLL
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="alive-watch", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                interval = self._interval
+                self._interval = min(interval * 2, ALIVE_POLL_MAX)
+            time.sleep(interval)
+            with self._lock:
+                pending = list(self._pending)
+            finished = self.poll(pending)
+            done = {id(item) for item, _ in finished}
+            with self._lock:
+                self._pending = [item for item in self._pending if id(item) not in done]
+                idle = not self._pending
+                if idle:
+                    self._thread = None  # the next watch() starts a new one
+            for (_, _, on_done, _, _), alive in finished:
+                on_done(alive)
+            if idle:
+                return
+
+    def poll(self, pending) -> list:
+        """One pass over `pending`: [(item, seconds-or-None)] for the items
+        that are up, exited or out of time."""
+        now = time.perf_counter()
+        snapshot = None
+        finished = []
+        for item in pending:
+            image, proc, _, started, deadline = item
+            if proc is not None:
+                ready = _proc_ready(proc)
+            else:
+                if snapshot is None:
+                    snapshot = ProcessIndex.snapshot(self.process_provider)
+                ready = snapshot.name_running(image)
+            if ready:
+                finished.append((item, now - started))
+            elif ready is None or now >= deadline:
+                finished.append((item, None))
+        return finished
+
+
+def _direct_target(link):
+    """The shortcut's target if we can safely exec it ourselves; None means
+    leave it to the shell (documents, folders, .bat files, advertised
+    shortcuts, targets that moved)."""
+    if link is None or not link.target or not os.path.isfile(link.target):
+        return None
+    if sys.platform == "win32":
+        return link.target if link.target.lower().endswith((".exe", ".com")) else None
+    return link.target if os.access(link.target, os.X_OK) else None
+
+
+def _spawn_link(target: str, link):
+    if sys.platform == "win32":
+        cmd = subprocess.list2cmdline([target])
+        if link.arguments:
+            cmd += " " + link.arguments
+    else:
+        cmd = [target] + shlex.split(link.arguments)
+    cwd = link.working_dir if link.working_dir and os.path.isdir(link.working_dir) else None
+    return subprocess.Popen(cmd, cwd=cwd)
+
+
+class AppLauncher:
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, stats=None, process_provider=None,
+                 shortcuts=None, confirm_alive: bool = True):
+        """`stats` is an optional stats.LaunchStats that every launch is
+        recorded into; `confirm_alive=False` records launches straight away
+        without waiting to see the process come up (for short-lived callers
+        like the CLI, whose background threads wouldn't get to finish).
+        `process_provider` overrides where the running-process list comes
+        from for skip_running (see procindex.py). `shortcuts` is an optional
+        lnk.ShortcutCache; with it, .lnk files pointing at an executable are
+        launched by running the target directly instead of asking the shell
+        to resolve the shortcut every time."""
+        self.max_workers = max(1, int(max_workers))
+        self.stats = stats
+        self.process_provider = process_provider
+        self.shortcuts = shortcuts
+        self.confirm_alive = confirm_alive
+        self._alive = AliveWatcher(process_provider)
+
+    def launch_path(self, entry, on_progress=None, profile=None, running=None) -> LaunchResult:
+        """Launch one app entry (a path string or a structured entry, see
+        appentry.py). Never raises and never shows a dialog — failures are
+        reported through the returned LaunchResult so callers decide how to
+        surface them.
+
+        `on_progress(path, state, result)` is called as the launch moves through
+        SPAWNING and then STARTED/FAILED (`result` is None until the end). It
+        runs on whichever thread is doing the launch.
+
+        `profile` only tags the timing record in `stats`. If `running` (a
+        ProcessIndex) says the app is already up, it is not launched again and
+        the result is marked `skipped`."""
+        path = entry_path(entry)
+        if running is not None and running.is_running(path):
+            result = LaunchResult(path, True, skipped=True)
+            if on_progress:
+                on_progress(path, SKIPPED, result)
+            return result
+        if on_progress:
+            on_progress(path, SPAWNING, None)
+        result = self._launch(entry, path, profile)
+        if on_progress:
+            on_progress(path, STARTED if result.success else FAILED, result)
+        return result
+
+    def _launch(self, entry, path: str, profile=None) -> LaunchResult:
+        start = time.perf_counter()
+        try:
+            vector = compile_entry(entry)
+        except Exception as e:
+            # A malformed entry (say, hand-edited into config.json) fails on
+            # its own rather than taking the rest of the batch with it
+            failed = time.perf_counter()
+            self._record(path, profile, False, failed - start)
+            return LaunchResult(path, False, f"Invalid entry: {e!r}", failed - start)
+        exists = vector.exists()
+        link = target = None
+        if (exists and self.shortcuts is not None and isinstance(entry, str)
+                and path.lower().endswith(".lnk")):
+            link = self.shortcuts.resolve(path)
+            target = _direct_target(link)
+        validated = time.perf_counter()
+        if not exists:
+            self._record(path, profile, False, validated - start)
+            return LaunchResult(path, False, "File not found", validated - start)
 
         try:
-            # os.startfile works well for .exe and .lnk on Windows
-            os.startfile(str(p))  # type: ignore[attr-defined]
-        except AttributeError:
-            # Fallback for non-Windows (if ever run elsewhere)
-            try:
-                subprocess.Popen([str(p)])
-            except Exception as e:
-                messagebox.showerror("Launch Error", f"Could not launch:\n{path}\n\n{e}")
+            proc = _spawn_link(target, link) if target else vector.spawn()
         except Exception as e:
-            messagebox.showerror("Launch Error", f"Could not launch:\n{path}\n\n{e}")
+            spawned = time.perf_counter()
+            self._record(path, profile, False, validated - start, spawned - validated)
+            return LaunchResult(path, False, str(e), spawned - start)
+        spawned = time.perf_counter()
+
+        if self.stats is not None and not self.confirm_alive:
+            self._record(path, profile, True, validated - start, spawned - validated)
+        elif self.stats is not None:
+            # Confirming the app is up can take a while, so it's left to the
+            # watcher thread rather than holding up the launch worker.
+            self._alive.watch(
+                self._image(path, link), proc,
+                lambda alive: self._record(path, profile, True, validated - start, spawned - validated, alive),
+            )
+        return LaunchResult(path, True, elapsed=spawned - start, proc=proc)
+
+    def _image(self, path: str, link) -> str:
+        """The executable to look for once `path` is launched: a shortcut's
+        target, or None if that isn't known."""
+        if not path.lower().endswith(".lnk"):
+            return path
+        if link is None and self.shortcuts is not None:
+            link = self.shortcuts.resolve(path)
+        return link.target if link is not None and link.target else None
+
+    def _record(self, path, profile, ok, validate, spawn=None, alive=None):
+        if self.stats is not None:
+            self.stats.record_app(path, ok, validate, spawn, alive, profile=profile)
+
+    def launch_list(self, entries, on_progress=None, rules=None, profile=None, label=None,
+                    skip_running=False) -> list:
+        """Launch every entry on a bounded worker pool, so one slow or missing
+        app doesn't hold up the rest. Results come back in the same order as
+        `entries`. See launch_path for `on_progress`; every app is reported as
+        QUEUED up front.
+
+        `rules` is Config.launch_rules; if any app in `paths` has to wait for
+        another one, the batch is run through the dependency scheduler in
+        dag.py instead. Rules, progress and results are keyed by entry path.
+
+        `profile`/`label` tag the batch's timing record in `stats`. With
+        `skip_running`, the process table is scanned once for the whole batch
+        and apps that are already running are skipped."""
+        entries = list(entries)
+        start = time.perf_counter()
+        running = ProcessIndex.snapshot(self.process_provider, self.shortcuts) if skip_running else None
+        if self.shortcuts is not None:
+            self.shortcuts.preload(e for e in entries if isinstance(e, str))
+        results = self._run_batch(entries, on_progress, rules, profile, running)
+        if self.stats is not None:
+            failed = sum(1 for r in results if not r.success)
+            self.stats.record_batch(label or profile or "", time.perf_counter() - start,
+                                    len(results), failed, profile=profile)
+        return results
+
+    def _run_batch(self, entries, on_progress, rules, profile, running) -> list:
+        if rules:
+            from dag import LaunchGraph
+            graph = LaunchGraph(entries, rules)
+            if graph.has_edges():
+                return graph.run(self, on_progress, profile, running)
+
+        if on_progress:
+            for e in entries:
+                on_progress(entry_path(e), QUEUED, None)
+        if len(entries) <= 1:
+            return [self.launch_path(e, on_progress, profile, running) for e in entries]
 
-    def launch_list(self, paths):
-        for path in paths:
-            self.launch_path(path)
\ No newline at end of file
+        workers = min(self.max_workers, len(entries))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="launch") as pool:
+            return list(pool.map(lambda e: self.launch_path(e, on_progress, profile, running), entries))
@@ -0,0 +1,252 @@
+"""
+Pure-Python reader for Windows shortcut (.lnk) files.
+
+Implements enough of the Shell Link binary format ([MS-SHLLINK]) to pull
+out what a shortcut actually launches — target path, command-line arguments
+and working directory — without going through the Windows shell. Because it
+is plain byte parsing it works (and can be exercised) on any platform.
+
+ShortcutCache keeps resolved shortcuts in `shortcut_cache.json` next to
+config.json, keyed by the .lnk's mtime and size, so each shortcut is only
+parsed again after it changes on disk.
+"""
+import json
+import os
+import struct
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from appentry import expand
+
+CACHE_NAME = "shortcut_cache.json"
+
+HEADER_SIZE = 0x4C
+LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+
+# LinkFlags
+HAS_LINK_TARGET_ID_LIST = 0x00000001
+HAS_LINK_INFO = 0x00000002
+HAS_NAME = 0x00000004
+HAS_RELATIVE_PATH = 0x00000008
+HAS_WORKING_DIR = 0x00000010
+HAS_ARGUMENTS = 0x00000020
+HAS_ICON_LOCATION = 0x00000040
+IS_UNICODE = 0x00000080
+
+# LinkInfoFlags
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x1
+COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX = 0x2
+
+ENVIRONMENT_VARIABLE_BLOCK = 0xA0000001
+
+ANSI_CODEC = "cp1252"
+
+
+class LnkError(ValueError):
+    """Raised for files that aren't (valid) shell links."""
+
+
+@dataclass
+class ShellLink:
+    target: str = ""          # absolute target path, "" if it couldn't be determined
+    arguments: str = ""
+    working_dir: str = ""
+    relative_path: str = ""
+    description: str = ""
+    icon_location: str = ""
+
+
+def _c_string(data: bytes, offset: int, unicode: bool) -> str:
+    if offset <= 0 or offset >= len(data):
+        return ""
+    if unicode:
+        end = offset
+        while end + 1 < len(data) and data[end:end + 2] != b"\0\0":
+            end += 2
+        return data[offset:end].decode("utf-16-le", errors="replace")
+    end = data.find(b"\0", offset)
+    if end < 0:
+        end = len(data)
+    return data[offset:end].decode(ANSI_CODEC, errors="replace")
+
+
+def _parse_link_info(info: bytes) -> str:
+    if len(info) < 0x1C:
+        return ""
+    (_, header_size, flags, _, local_base_off, net_off, suffix_off) = struct.unpack_from("<7I", info, 0)
+    local_base_u = suffix_u = 0
+    if header_size >= 0x24 and len(info) >= 0x24:
+        local_base_u, suffix_u = struct.unpack_from("<2I", info, 0x1C)
+
+    suffix = _c_string(info, suffix_u, True) if suffix_u else _c_string(info, suffix_off, False)
+
+    if flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+        base = _c_string(info, local_base_u, True) if local_base_u else _c_string(info, local_base_off, False)
+        if base:
+            return base + suffix
+
+    if flags & COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX and net_off + 0x14 <= len(info):
+        net_name_off, = struct.unpack_from("<I", info, net_off + 8)
+        net_name = ""
+        if net_name_off > 0x14 and net_off + 0x1C <= len(info):
+            net_name_u, = struct.unpack_from("<I", info, net_off + 0x14)
+            net_name = _c_string(info, net_off + net_name_u, True)
+        if not net_name:
+            net_name = _c_string(info, net_off + net_name_off, False)
+        if net_name:
+            return net_name.rstrip("\\") + ("\\" + suffix if suffix else "")
+    return ""
+
+
+def _env_block_target(extra: bytes) -> str:
+    pos = 0
+    while pos + 8 <= len(extra):
+        size, signature = struct.unpack_from("<2I", extra, pos)
+        if size < 8 or pos + size > len(extra):
+            break  # terminal block, or cut off
+        if signature == ENVIRONMENT_VARIABLE_BLOCK and size >= 8 + 260 + 520:
+            unicode_target = _c_string(extra, pos + 8 + 260, True)
+            return unicode_target or _c_string(extra, pos + 8, False)
+        pos += size
+    return ""
+
+
+def parse_lnk(data: bytes, lnk_path: str = "") -> ShellLink:
+    """Parse the bytes of a .lnk file. `lnk_path` is only used to resolve a
+    relative-path-only target against the shortcut's own folder."""
+    if len(data) < HEADER_SIZE:
+        raise LnkError("File too short to be a shortcut")
+    header_size, = struct.unpack_from("<I", data, 0)
+    if header_size != HEADER_SIZE or data[4:20] != LINK_CLSID:
+        raise LnkError("Not a shell link (bad header)")
+    flags, = struct.unpack_from("<I", data, 0x14)
+    unicode = bool(flags & IS_UNICODE)
+    pos = HEADER_SIZE
+
+    if flags & HAS_LINK_TARGET_ID_LIST:
+        if pos + 2 > len(data):
+            raise LnkError("Truncated ID list")
+        id_list_size, = struct.unpack_from("<H", data, pos)
+        pos += 2 + id_list_size
+
+    link = ShellLink()
+    if flags & HAS_LINK_INFO:
+        if pos + 4 > len(data):
+            raise LnkError("Truncated link info")
+        info_size, = struct.unpack_from("<I", data, pos)
+        if pos + info_size > len(data):
+            raise LnkError("Truncated link info")
+        link.target = _parse_link_info(data[pos:pos + info_size])
+        pos += info_size
+
+    def read_string():
+        nonlocal pos
+        if pos + 2 > len(data):
+            raise LnkError("Truncated string data")
+        count, = struct.unpack_from("<H", data, pos)
+        pos += 2
+        nbytes = count * 2 if unicode else count
+        raw = data[pos:pos + nbytes]
+        if len(raw) < nbytes:
+            raise LnkError("Truncated string data")
+        pos += nbytes
+        return raw.decode("utf-16-le" if unicode else ANSI_CODEC, errors="replace")
+
+    if flags & HAS_NAME:
+        link.description = read_string()
+    if flags & HAS_RELATIVE_PATH:
+        link.relative_path = read_string()
+    if flags & HAS_WORKING_DIR:
+        link.working_dir = read_string()
+    if flags & HAS_ARGUMENTS:
+        link.arguments = read_string()
+    if flags & HAS_ICON_LOCATION:
+        link.icon_location = read_string()
+
+    if not link.target:
+        link.target = _env_block_target(data[pos:])
+    if not link.target and link.relative_path and lnk_path:
+        relative = link.relative_path.replace("\\", "/")  # stored Windows-style
+        link.target = os.path.normpath(os.path.join(os.path.dirname(lnk_path), relative))
+    # %VAR% on every platform (os.path.expandvars only knows $VAR off Windows)
+    link.target = expand(link.target, os.environ)
+    link.working_dir = expand(link.working_dir, os.environ)
+    return link
+
+
+def read_lnk(path) -> ShellLink:
+    with open(path, "rb") as f:
+        return parse_lnk(f.read(), str(path))
+
+
+class ShortcutCache:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def resolve(self, lnk_path: str):
+        """ShellLink for `lnk_path`, or None if it's missing or unreadable."""
+        try:
+            st = os.stat(lnk_path)
+        except OSError:
+            return None
+        key = [st.st_mtime_ns, st.st_size]
+        with self._lock:
+            cached = self._entries.get(lnk_path)
+            if cached and cached.get("key") == key:
+                return ShellLink(**cached["link"])
+        try:
+            link = read_lnk(lnk_path)
+        except (OSError, LnkError, struct.error):
+            return None
+        with self._lock:
+            self._entries[lnk_path] = {"key": key, "link": asdict(link)}
+            self._dirty = True
+        return link
+
+    def preload(self, paths):
+        """Resolve every .lnk in `paths` in one pass and persist the cache once."""
+        for p in paths:
+            if str(p).lower().endswith(".lnk"):
+                self.resolve(p)
+        self.flush()
+
+    def validate(self, paths) -> list:
+        """Check every .lnk in `paths` in one pass (warming the cache as it
+        goes). Returns [(lnk_path, problem)] for shortcuts that are missing,
+        unreadable or point at a target that no longer exists."""
+        problems = []
+        for p in paths:
+            if not str(p).lower().endswith(".lnk"):
+                continue
+            if not os.path.exists(p):
+                problems.append((p, "Shortcut not found"))
+                continue
+            link = self.resolve(p)
+            if link is None:
+                problems.append((p, "Not a readable shortcut"))
+            elif link.target and not os.path.exists(link.target):
+                problems.append((p, f"Target not found: {link.target}"))
+        self.flush()
+        return problems
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            # Forget shortcuts that no longer exist so the cache doesn't grow forever
+            self._entries = {k: v for k, v in self._entries.items() if os.path.exists(k)}
+            entries = dict(self._entries)
+            self._dirty = False
+        try:
+            with self.path.open("w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=1)
+        except OSError:
+            pass  # the cache is only an optimization
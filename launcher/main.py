@@ -1,8 +1,31 @@
-from ui import LauncherUI
+import sys
 
-def main():
-    app = LauncherUI()
+from instance import InstanceServer, send_command
+
+
+def run_gui() -> int:
+    """Bring up the launcher window. If another instance is already running,
+    ask it to show its window instead of starting a second copy (which would
+    mean a cold start plus a duplicate tray icon and global hotkey)."""
+    server = InstanceServer()
+    if not server.bind():
+        if send_command({"cmd": "show"}) is not None:
+            return 0
+        server = None  # endpoint taken but nobody answers: run standalone
+
+    from ui import LauncherUI
+    app = LauncherUI(instance_server=server)
     app.mainloop()
+    return 0
+
+
+def main():
+    if len(sys.argv) > 1:
+        # Headless: `main.py run --profile work` never imports the GUI stack
+        from cli import main as cli_main
+        sys.exit(cli_main())
+
+    sys.exit(run_gui())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,100 @@
+"""
+Memory footprint: resident set size, tracemalloc numbers, and handing freed
+memory back to the OS.
+
+Used by the window's idle mode (see LauncherUI._enter_idle) and reported by
+`python -m launcher memory`, which asks the running launcher without
+bringing its window back.
+
+RSS comes from psutil if it's installed, else GetProcessMemoryInfo on
+Windows or /proc/self/statm on Linux. tracemalloc only has numbers when
+tracing was switched on at start-up, since tracing costs memory of its own:
+
+    set PYTHONTRACEMALLOC=5      (or python -X tracemalloc=5 main.py)
+"""
+import ctypes
+import gc
+import os
+import sys
+import tracemalloc
+
+# Allocation sites listed in a report
+TOP_SITES = 10
+
+
+def rss_bytes():
+    """This process's resident set (working set on Windows), or None."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if sys.platform == "win32":
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def release_memory():
+    """Collect garbage, then return freed heap pages to the OS: trim the
+    working set on Windows, malloc_trim on glibc. Elsewhere only the
+    collection happens."""
+    gc.collect()
+    try:
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetProcessWorkingSetSize(kernel32.GetCurrentProcess(), ctypes.c_size_t(-1), ctypes.c_size_t(-1))
+        elif sys.platform.startswith("linux"):
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass  # not glibc (e.g. musl), or no such call
+
+
+def memory_report(top: int = TOP_SITES) -> dict:
+    """RSS, plus traced Python allocations and the biggest allocation sites
+    (by file and line) when tracemalloc is on."""
+    report = {"rss": rss_bytes(), "tracing": tracemalloc.is_tracing()}
+    if report["tracing"]:
+        report["traced"], report["traced_peak"] = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:top]
+        report["top"] = [(str(s.traceback[0]), s.size, s.count) for s in stats]
+    return report
+
+
+def _mb(n) -> str:
+    return "unknown" if n is None else f"{n / (1024 * 1024):.1f} MB"
+
+
+def format_report(report: dict) -> str:
+    lines = [f"Resident set: {_mb(report.get('rss'))}"]
+    if report.get("idle"):
+        lines.append("Idle: window widgets torn down")
+    if "idle_rss_before" in report:
+        lines.append(f"Last teardown: {_mb(report['idle_rss_before'])} -> {_mb(report['idle_rss_after'])}")
+    if report.get("tracing"):
+        lines.append(f"Python allocations (tracemalloc): {_mb(report['traced'])}, "
+                     f"peak {_mb(report['traced_peak'])}")
+        lines += [f"  {size / 1024:9.1f} KiB {count:7d}  {where}" for where, size, count in report["top"]]
+    else:
+        lines.append("tracemalloc is off (start with PYTHONTRACEMALLOC=5 for allocation sites)")
+    return "\n".join(lines)
@@ -0,0 +1,172 @@
+"""
+Quick-launch palette: the small, keyboard-only window the global hotkey
+opens.
+
+It's built once, hidden, shortly after start-up, and the hotkey only shows
+it and clears the query — nothing is created on the way to a launch. With
+an empty query it lists what you launch most (see frecency.py), so the
+usual case is hotkey, Enter. Typing fuzzy-filters every app (through
+Config.search) and profile; matches are ranked by how well they match plus
+a bonus that grows with the log of their frecency, so a strong match still
+beats a weak one you use a lot, but among similar matches the ones you
+actually launch come first.
+
+Up/Down pick a row, Enter launches it, Escape (or clicking elsewhere)
+hides the palette.
+"""
+import math
+import time
+
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+
+from appentry import entry_name, entry_path
+from search import match_score
+
+WIDTH, HEIGHT = 560, 290
+ROWS = 9
+# Apps taken from the fuzzy search before frecency re-ranks them
+CANDIDATES = 50
+# Ranking bonus per doubling of (1 + frecency)
+FRECENCY_WEIGHT = 25
+WINDOW_LABEL = "Show launcher window"
+
+
+class QuickPalette(tb.Toplevel):
+    """`on_pick(kind, value)` gets ("app", entry), ("profile", name) or
+    ("window", None) for the row the user launched."""
+
+    def __init__(self, master, config_manager, frecency, on_pick):
+        super().__init__(master)
+        self.withdraw()
+        self.overrideredirect(True)
+        self.config_manager = config_manager
+        self.frecency = frecency
+        self.on_pick = on_pick
+        self._items = []
+
+        frame = tb.Frame(self, padding=8, bootstyle=DARK)
+        frame.pack(fill=BOTH, expand=True)
+        self.query_var = tb.StringVar()
+        self.entry = tb.Entry(frame, textvariable=self.query_var)
+        self.entry.pack(fill=X)
+        self.results = tb.Treeview(frame, columns=("name", "where"), show="", height=ROWS, selectmode="browse")
+        self.results.column("name", width=300)
+        self.results.column("where", width=220)
+        self.results.pack(fill=BOTH, expand=True, pady=(6, 0))
+
+        self.query_var.trace_add("write", lambda *_: self.refresh())
+        self.entry.bind("<Return>", self._launch)
+        self.entry.bind("<Down>", lambda e: self._move(1))
+        self.entry.bind("<Up>", lambda e: self._move(-1))
+        self.results.bind("<Double-1>", self._launch)
+        self.bind("<Escape>", lambda e: self.hide())
+        self.bind("<FocusOut>", lambda e: self.after(50, self._hide_if_unfocused))
+
+        x = (self.winfo_screenwidth() - WIDTH) // 2
+        y = self.winfo_screenheight() // 4
+        self.geometry(f"{WIDTH}x{HEIGHT}+{x}+{y}")
+
+    def show(self):
+        if self.query_var.get():
+            self.query_var.set("")  # refreshes
+        else:
+            self.refresh()
+        self.deiconify()
+        self.lift()
+        self.attributes("-topmost", True)
+        self.focus_force()
+        self.entry.focus_set()
+
+    def hide(self):
+        self.withdraw()
+
+    def toggle(self):
+        if self.winfo_viewable():
+            self.hide()
+        else:
+            self.show()
+
+    def refresh(self):
+        """Re-rank for the current query (e.g. after the config changed)."""
+        self._items = self._rank(self.query_var.get().strip().lower())
+        results = self.results
+        results.delete(*results.get_children())
+        for i, (_, label, where, _) in enumerate(self._items):
+            results.insert("", "end", iid=str(i), values=(label, where))
+        if self._items:
+            results.selection_set("0")
+
+    # Ranking
+
+    def _bonus(self, kind: str, name: str, now: float) -> float:
+        return FRECENCY_WEIGHT * math.log2(1 + self.frecency.score(kind, name, now))
+
+    def _rank(self, query: str) -> list:
+        """Rows as (kind, label, where, value), best first."""
+        now = time.time()
+        if not query:
+            items = []
+            for kind, name, _ in self.frecency.top(2 * ROWS, now):
+                item = self._resolve(kind, name)
+                if item is not None:
+                    items.append(item)
+            return items[:ROWS - 1] + [("window", WINDOW_LABEL, "App Launcher", None)]
+
+        scored, seen = [], set()
+        for score, category, entry in self.config_manager.search(query, CANDIDATES, scored=True):
+            path = entry_path(entry)
+            if path in seen:
+                continue  # in several categories: list it once
+            seen.add(path)
+            scored.append((score + self._bonus("app", path, now), ("app", entry_name(entry), category, entry)))
+        for name in self.config_manager.profiles:
+            score = match_score(query, name.lower())
+            if score is not None:
+                scored.append((score + self._bonus("profile", name, now), ("profile", name, "Profile", name)))
+        score = match_score(query, WINDOW_LABEL.lower())
+        if score is not None:
+            scored.append((score, ("window", WINDOW_LABEL, "App Launcher", None)))
+        scored.sort(key=lambda s: s[0], reverse=True)
+        return [item for _, item in scored[:ROWS]]
+
+    def _resolve(self, kind: str, name: str):
+        """Row for a frecency key, or None if it's no longer in the config."""
+        if kind == "profile":
+            return ("profile", name, "Profile", name) if name in self.config_manager.profiles else None
+        categories = self.config_manager.categories_with_app(name)
+        if not categories:
+            return None
+        category = min(categories)
+        for entry in self.config_manager.categories.get(category, ()):
+            if entry_path(entry) == name:
+                return ("app", entry_name(entry), category, entry)
+        return None
+
+    # Keys
+
+    def _move(self, step: int):
+        rows = self.results.get_children()
+        if rows:
+            sel = self.results.selection()
+            i = rows.index(sel[0]) + step if sel else 0
+            i = max(0, min(i, len(rows) - 1))
+            self.results.selection_set(rows[i])
+            self.results.see(rows[i])
+        return "break"
+
+    def _launch(self, event=None):
+        sel = self.results.selection()
+        if sel and int(sel[0]) < len(self._items):
+            kind, _, _, value = self._items[int(sel[0])]
+            self.hide()
+            self.on_pick(kind, value)
+        return "break"
+
+    def _hide_if_unfocused(self):
+        try:
+            focused = self.focus_get()
+        except KeyError:  # focus is in a widget Tk can't name (e.g. a popdown)
+            focused = None
+        if focused is None or focused.winfo_toplevel() is not self:
+            self.hide()
@@ -0,0 +1,116 @@
+"""
+Snapshot of running processes, for "skip apps that are already running".
+
+Building the index walks the process table once; after that every
+`is_running(path)` check is a set lookup, so checking a 15-app profile costs
+one scan rather than fifteen.
+
+Where the list of running executables comes from is pluggable: a provider is
+any callable returning an iterable of executable paths (or bare image names,
+if that's all the platform gives us). The default picks:
+    - /proc/*/exe on Linux
+    - psutil, if it's installed
+    - `tasklist` on Windows (image names only)
+
+Shortcuts (.lnk) are matched through their target when the index is given
+an lnk.ShortcutCache to resolve them with.
+"""
+import csv
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+
+
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def proc_provider():
+    """Full executable paths from /proc/<pid>/exe (Linux)."""
+    try:
+        pids = [d for d in os.listdir("/proc") if d.isdigit()]
+    except OSError:
+        return []
+    exes = []
+    for pid in pids:
+        try:
+            exes.append(os.readlink(f"/proc/{pid}/exe"))
+        except OSError:
+            continue  # kernel threads, other users' processes, already exited
+    return exes
+
+
+def psutil_provider():
+    """Full executable paths via psutil (optional dependency)."""
+    import psutil
+
+    exes = []
+    for proc in psutil.process_iter(["exe"]):
+        exe = proc.info.get("exe")
+        if exe:
+            exes.append(exe)
+    return exes
+
+
+def tasklist_provider():
+    """Image names only (e.g. 'steam.exe') from `tasklist` on Windows."""
+    try:
+        out = subprocess.run(
+            ["tasklist", "/FO", "CSV", "/NH"],
+            capture_output=True, text=True, timeout=10,
+        ).stdout
+    except Exception:
+        return []
+    return [row[0] for row in csv.reader(io.StringIO(out)) if row]
+
+
+def default_provider():
+    if os.path.isdir("/proc") and os.path.exists(f"/proc/{os.getpid()}/exe"):
+        return proc_provider
+    if importlib.util.find_spec("psutil") is not None:
+        return psutil_provider
+    if sys.platform == "win32":
+        return tasklist_provider
+    return lambda: []
+
+
+class ProcessIndex:
+    def __init__(self, exes, shortcuts=None):
+        self.shortcuts = shortcuts
+        self._paths = set()
+        self._names = set()
+        for exe in exes:
+            if os.path.basename(exe) == exe:
+                # Provider only knows the image name
+                self._names.add(exe.lower())
+            else:
+                self._paths.add(_norm(exe))
+                self._names.add(os.path.basename(exe).lower())
+        self._names_only = not self._paths
+
+    @classmethod
+    def snapshot(cls, provider=None, shortcuts=None) -> "ProcessIndex":
+        return cls((provider or default_provider())(), shortcuts)
+
+    def is_running(self, path: str) -> bool:
+        """True if `path` is running. Matches on the full path when the
+        provider gave us paths, otherwise on the executable's file name.
+        A shortcut (.lnk) matches on its target's file name; without a
+        ShortcutCache, or if the target can't be read, it never does."""
+        if path.lower().endswith(".lnk"):
+            link = self.shortcuts.resolve(path) if self.shortcuts is not None else None
+            if link is None or not link.target:
+                return False
+            return self.name_running(link.target)
+        if self._names_only:
+            return self.name_running(path)
+        return _norm(os.path.realpath(path)) in self._paths
+
+    def name_running(self, path: str) -> bool:
+        """Looser check: any process with the same executable file name."""
+        return os.path.basename(path.replace("\\", "/")).lower() in self._names
+
+    def __len__(self):
+        return len(self._paths) or len(self._names)
@@ -0,0 +1,97 @@
+"""
+Cross-process lock for the config files: `config.lock` next to config.json.
+
+The GUI, the CLI and scripts can all have the config open at the same time.
+Config holds this lock while it loads, appends to the journal or writes a
+snapshot — a few milliseconds of disk I/O, never across a launch, a dialog
+or user think-time — so processes only ever wait on each other's writes.
+What keeps their edits from overwriting each other is the check made while
+holding it, see Config._write.
+
+The lock is advisory (fcntl.flock on POSIX, msvcrt.locking on Windows):
+programs that don't take it, like a text editor, aren't held off. The OS
+drops it if the holder dies, so a crash can't leave it stuck.
+"""
+import os
+import sys
+import threading
+import time
+
+# Give up on a holder that's stuck (e.g. a suspended process) after this long
+LOCK_TIMEOUT = 5.0
+RETRY_INTERVAL = 0.005
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock(fd) -> bool:
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(fd) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _unlock(fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class ProcessLock:
+    """Exclusive between processes, and re-entrant for the thread holding
+    it (Config's load can compact, which takes it again):
+
+        with lock:
+            ...
+    """
+
+    def __init__(self, path, timeout: float = LOCK_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self):
+        if not self._lock.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Timed out waiting for {self.path}")
+        if self._depth == 0:
+            try:
+                self._fd = self._acquire()
+            except BaseException:
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                _unlock(fd)
+            finally:
+                os.close(fd)
+        self._lock.release()
+
+    def _acquire(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        deadline = time.monotonic() + self.timeout
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                raise TimeoutError(f"{self.path} is held by another process")
+            time.sleep(RETRY_INTERVAL)
+        return fd
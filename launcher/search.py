@@ -0,0 +1,191 @@
+"""
+In-memory fuzzy search over every app in every category (name and path).
+
+Each app is indexed by the trigrams (3-character substrings) of its
+lower-cased name and path, and by the first one and two characters of each
+word in its name. A query's trigrams (or, under three characters, that
+prefix table) pick out candidates without scanning everything; queries
+neither can answer (initials like "vs" or "vsc") fall back to a
+compiled-regex scan of the names, then the paths, which stops once it has
+found enough. The candidates are then ranked:
+
+    name contains the query     (a prefix or word start ranks higher)
+    path contains the query
+    query is a subsequence of the name, then of the path (tighter is better)
+    otherwise, share of the query's trigrams found (tolerates typos)
+
+Config keeps an index up to date as apps and categories change (see
+Config.search); it's built on the first search, not at start-up.
+"""
+import heapq
+import re
+
+RESULT_LIMIT = 50
+# Candidates (by trigram hits) that are ranked in full
+CANDIDATE_LIMIT = 300
+# Without a substring or subsequence match, at least this share of the
+# query's trigrams must be found for an app to count as a typo match
+MIN_TRIGRAM_SHARE = 0.5
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _words(text: str):
+    return re.findall(r"[^\W_]+", text)
+
+
+def _subsequence(query: str):
+    """Regex finding `query`'s characters in order. "[^s]*s" rather than
+    ".*?s" so a near miss fails in linear time instead of backtracking."""
+    first, rest = query[0], query[1:]
+    return re.compile(re.escape(first) + "".join(f"[^{re.escape(c)}]*{re.escape(c)}" for c in rest))
+
+
+def match_score(query: str, name: str, path: str = "", pattern=None, trigram_share: float = 0.0):
+    """How well lower-cased `query` matches a lower-cased name and path
+    (higher is better; see the ranking above), or None if it doesn't.
+    Also used on its own for things that aren't indexed, like profiles."""
+    at = name.find(query)
+    if at >= 0:
+        score = 400 - len(name)
+        if at == 0:
+            score += 100
+        elif not name[at - 1].isalnum():
+            score += 50
+        return score
+    at = path.find(query)
+    if at >= 0:
+        return 300 - len(path) / 10
+    pattern = pattern or _subsequence(query)
+    for base, text in ((200, name), (100, path)):
+        m = pattern.search(text)
+        if m:
+            slack = (m.end() - m.start()) - len(query)
+            return base - min(slack, 90)
+    if trigram_share >= MIN_TRIGRAM_SHARE:
+        return 100 * trigram_share - 10
+    return None
+
+
+class SearchIndex:
+    def __init__(self):
+        self._docs = {}         # doc id -> [category, entry, path, name and path lower-cased]
+        self._ids = {}          # (category, app path) -> doc id
+        self._by_category = {}  # category -> doc ids
+        self._grams = {}        # trigram -> doc ids, from the path
+        self._name_grams = {}   # trigram -> doc ids, from the name
+        self._prefixes = {}     # first 1-2 characters of a word in the name -> doc ids
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, category: str, entry, name: str, path: str):
+        key = (category, path)
+        if key in self._ids:
+            return
+        doc_id = self._next_id
+        self._next_id += 1
+        name, path_l = name.lower(), path.lower()
+        self._docs[doc_id] = [category, entry, path, name, path_l]
+        self._ids[key] = doc_id
+        self._by_category.setdefault(category, set()).add(doc_id)
+        for gram in _trigrams(name):
+            self._name_grams.setdefault(gram, set()).add(doc_id)
+        for prefix in self._word_prefixes(name):
+            self._prefixes.setdefault(prefix, set()).add(doc_id)
+        for gram in _trigrams(path_l):
+            self._grams.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, category: str, path: str):
+        doc_id = self._ids.pop((category, path), None)
+        if doc_id is None:
+            return
+        _, _, _, name, path_l = self._docs.pop(doc_id)
+        self._by_category[category].discard(doc_id)
+        for table, keys in ((self._name_grams, _trigrams(name)), (self._grams, _trigrams(path_l)),
+                            (self._prefixes, self._word_prefixes(name))):
+            for key in keys:
+                ids = table[key]
+                ids.discard(doc_id)
+                if not ids:
+                    del table[key]
+
+    @staticmethod
+    def _word_prefixes(name: str) -> set:
+        return {word[:n] for word in _words(name) for n in (1, 2)}
+
+    def remove_category(self, category: str):
+        for doc_id in list(self._by_category.get(category, ())):
+            self.remove(category, self._docs[doc_id][2])
+        self._by_category.pop(category, None)
+
+    def rename_category(self, old: str, new: str):
+        """Only the apps' category label changes; their trigrams stay."""
+        ids = self._by_category.pop(old, set())
+        self._by_category.setdefault(new, set()).update(ids)
+        for doc_id in ids:
+            doc = self._docs[doc_id]
+            self._ids[(new, doc[2])] = self._ids.pop((old, doc[2]))
+            doc[0] = new
+
+    def _subsequence_matches(self, pattern, seen, wanted: int) -> list:
+        """Up to `wanted` more docs whose name, or failing that path,
+        matches `pattern`. Names are tried first as they rank higher;
+        stopping at `wanted` keeps a short query on a big library within a
+        frame, at the cost of ranking only the matches found first."""
+        found = []
+        for column in (3, 4):
+            for doc_id, doc in self._docs.items():
+                if doc_id not in seen and pattern.search(doc[column]):
+                    seen.add(doc_id)
+                    found.append(doc_id)
+                    if len(found) == wanted:
+                        return found
+        return found
+
+    def search(self, query: str, limit: int = RESULT_LIMIT, scored: bool = False):
+        """Best matches first, as (category, entry) pairs — or (score,
+        category, entry) with `scored`, for callers that mix in their own
+        ranking (see palette.py)."""
+        query = query.strip().lower()
+        if not query:
+            return []
+        grams = _trigrams(query)
+
+        # Trigrams found in the name count double, so name matches are
+        # never crowded out of the candidates by path-only ones
+        name_hits, path_hits = {}, {}
+        for gram in grams:
+            for doc_id in self._name_grams.get(gram, ()):
+                name_hits[doc_id] = name_hits.get(doc_id, 0) + 1
+            for doc_id in self._grams.get(gram, ()):
+                path_hits[doc_id] = path_hits.get(doc_id, 0) + 1
+        hits = {d: 2 * name_hits.get(d, 0) + n for d, n in path_hits.items()}
+        for d, n in name_hits.items():
+            hits.setdefault(d, 2 * n)
+        candidates = heapq.nlargest(CANDIDATE_LIMIT, hits, key=hits.get)
+
+        pattern = _subsequence(query)
+        if not grams:
+            # Under 3 characters: names with a word starting with it
+            candidates = list(self._prefixes.get(query, ()))
+        if len(candidates) < limit:
+            # Too few hits: look for the query as a subsequence (which
+            # includes as a substring) anywhere
+            candidates += self._subsequence_matches(pattern, set(candidates), limit - len(candidates))
+
+        ranked = []
+        for doc_id in candidates:
+            category, entry, _, name, path = self._docs[doc_id]
+            found = max(name_hits.get(doc_id, 0), path_hits.get(doc_id, 0))
+            share = found / len(grams) if grams else 0
+            score = match_score(query, name, path, pattern, share)
+            if score is not None:
+                ranked.append((-score, name, category, entry))
+        ranked.sort(key=lambda r: (r[0], r[1]))
+        if scored:
+            return [(-neg, category, entry) for neg, _, category, entry in ranked[:limit]]
+        return [(category, entry) for _, _, category, entry in ranked[:limit]]
@@ -0,0 +1,280 @@
+"""
+SQLite storage for large libraries: `config.db` next to config.json.
+
+Config uses this instead of config.json when config.db exists (create it
+with `python -m launcher migrate`). The Config API is the same either way;
+what changes is how it reaches the disk:
+
+    - start-up reads category names, profiles, settings, launch rules and
+      the (category, path) pairs the lookup indexes need — not the app
+      entries themselves. A category's entries (args, env, cwd, ...) are
+      read the first time that category is used, see LazyCategories.
+    - every mutation is applied as a small operation record (see
+      Config._record) instead of rewriting the whole document.
+
+Tables:
+    categories(id, name, position)
+    apps(id, category_id, position, path, entry)   entry: JSON, NULL for a plain path
+    profiles(id, name, position)
+    profile_categories(profile_id, category_id, position)
+    settings(key, value)                           value: JSON
+    launch_rules(path, rule)                       rule: JSON
+"""
+import json
+import sqlite3
+import threading
+
+from appentry import entry_path
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS apps (
+    id INTEGER PRIMARY KEY,
+    category_id INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    entry TEXT
+);
+CREATE INDEX IF NOT EXISTS apps_by_category ON apps(category_id, position);
+CREATE INDEX IF NOT EXISTS apps_by_path ON apps(path);
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profile_categories (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    category_id INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (profile_id, category_id)
+);
+CREATE INDEX IF NOT EXISTS profiles_by_category ON profile_categories(category_id);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS launch_rules (
+    path TEXT PRIMARY KEY,
+    rule TEXT NOT NULL
+);
+"""
+
+
+def _dump_entry(entry):
+    return None if isinstance(entry, str) else json.dumps(entry)
+
+
+def _load_entry(path, entry):
+    return path if entry is None else json.loads(entry)
+
+
+class LazyCategories(dict):
+    """Category name -> list of app entries, where each list is only read
+    from the database the first time it's used. The names themselves are
+    always present, so listing categories costs nothing."""
+
+    def __init__(self, store, names):
+        super().__init__((name, None) for name in names)
+        self._store = store
+
+    def __getitem__(self, name):
+        apps = super().__getitem__(name)
+        if apps is None:
+            apps = self._store.load_category(name)
+            super().__setitem__(name, apps)
+        return apps
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def pop(self, name, *default):
+        if name not in self:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        apps = self[name]
+        super().pop(name)
+        return apps
+
+    def values(self):
+        return [self[name] for name in self]
+
+    def items(self):
+        return [(name, self[name]) for name in self]
+
+
+class SqliteStore:
+    def __init__(self, path):
+        self.path = path
+        # Used from the Tk thread (lazy reads) and the write-behind thread
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # Reading
+
+    def load(self) -> dict:
+        """Everything except the app entries, which LazyCategories fetches
+        per category on first use."""
+        with self._lock:
+            c = self._conn
+            names = [row[0] for row in c.execute("SELECT name FROM categories ORDER BY position")]
+            profiles = {}
+            for prof, cat in c.execute(
+                "SELECT p.name, c.name FROM profiles p"
+                " LEFT JOIN profile_categories pc ON pc.profile_id = p.id"
+                " LEFT JOIN categories c ON c.id = pc.category_id"
+                " ORDER BY p.position, pc.position"
+            ):
+                cats = profiles.setdefault(prof, [])
+                if cat is not None:
+                    cats.append(cat)
+            settings = {k: json.loads(v) for k, v in c.execute("SELECT key, value FROM settings")}
+            rules = {p: json.loads(r) for p, r in c.execute("SELECT path, rule FROM launch_rules")}
+        data = {"categories": LazyCategories(self, names), "profiles": profiles}
+        if settings:
+            data["settings"] = settings
+        if rules:
+            data["launch_rules"] = rules
+        return data
+
+    def memberships(self):
+        """(category, app path) for every app — what the Config indexes need,
+        without reading the entries."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT c.name, a.path FROM apps a JOIN categories c ON c.id = a.category_id"
+            ).fetchall()
+
+    def load_category(self, name: str) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT a.path, a.entry FROM apps a JOIN categories c ON c.id = a.category_id"
+                " WHERE c.name = ? ORDER BY a.position",
+                (name,),
+            ).fetchall()
+        return [_load_entry(path, entry) for path, entry in rows]
+
+    # Writing
+
+    def apply(self, ops):
+        """Apply Config operation records in one transaction."""
+        if not ops:
+            return
+        with self._lock:
+            c = self._conn
+            c.execute("BEGIN")
+            try:
+                for op, *args in ops:
+                    getattr(self, f"_op_{op}")(c, *args)
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+            c.execute("COMMIT")
+
+    def import_data(self, data: dict):
+        """Replace the whole database with a Config.data dict (migration)."""
+        ops = []
+        for name in data.get("categories", {}):
+            ops.append(("add_category", name))
+        for name, apps in data.get("categories", {}).items():
+            for i, entry in enumerate(apps):
+                ops.append(("insert_app", name, i, entry))
+        for name, cats in data.get("profiles", {}).items():
+            ops.append(("set_profile", name, cats))
+        for key, value in data.get("settings", {}).items():
+            ops.append(("set_setting", key, value))
+        for path, rule in data.get("launch_rules", {}).items():
+            ops.append(("set_launch_rule", path, rule))
+        with self._lock:
+            c = self._conn
+            c.execute("BEGIN")
+            try:
+                for table in ("profile_categories", "apps", "profiles", "categories", "settings", "launch_rules"):
+                    c.execute(f"DELETE FROM {table}")
+                for op, *args in ops:
+                    getattr(self, f"_op_{op}")(c, *args)
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+            c.execute("COMMIT")
+
+    @staticmethod
+    def _category_id(c, name):
+        row = c.execute("SELECT id FROM categories WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _next_position(c, table):
+        return c.execute(f"SELECT COALESCE(MAX(position) + 1, 0) FROM {table}").fetchone()[0]
+
+    def _op_add_category(self, c, name):
+        c.execute("INSERT INTO categories (name, position) VALUES (?, ?)",
+                  (name, self._next_position(c, "categories")))
+
+    def _op_remove_category(self, c, name):
+        c.execute("DELETE FROM categories WHERE name = ?", (name,))
+
+    def _op_rename_category(self, c, old, new):
+        # A renamed category moves to the end, as it does in config.json
+        c.execute("UPDATE categories SET name = ?, position = ? WHERE name = ?",
+                  (new, self._next_position(c, "categories"), old))
+
+    def _op_insert_app(self, c, category, index, entry):
+        cat_id = self._category_id(c, category)
+        if cat_id is None:
+            return
+        c.execute("UPDATE apps SET position = position + 1 WHERE category_id = ? AND position >= ?",
+                  (cat_id, index))
+        c.execute("INSERT INTO apps (category_id, position, path, entry) VALUES (?, ?, ?, ?)",
+                  (cat_id, index, entry_path(entry), _dump_entry(entry)))
+
+    def _op_remove_app(self, c, category, index, entry=None):
+        cat_id = self._category_id(c, category)
+        if cat_id is None:
+            return
+        c.execute("DELETE FROM apps WHERE category_id = ? AND position = ?", (cat_id, index))
+        c.execute("UPDATE apps SET position = position - 1 WHERE category_id = ? AND position > ?",
+                  (cat_id, index))
+
+    def _op_discard_trash(self, c, category, entry):
+        pass  # Trash history lives in the journal only
+
+    def _op_set_profile(self, c, name, categories):
+        c.execute("INSERT OR IGNORE INTO profiles (name, position) VALUES (?, ?)",
+                  (name, self._next_position(c, "profiles")))
+        prof_id = c.execute("SELECT id FROM profiles WHERE name = ?", (name,)).fetchone()[0]
+        c.execute("DELETE FROM profile_categories WHERE profile_id = ?", (prof_id,))
+        for i, cat in enumerate(categories):
+            cat_id = self._category_id(c, cat)
+            if cat_id is not None:
+                c.execute("INSERT OR IGNORE INTO profile_categories VALUES (?, ?, ?)", (prof_id, cat_id, i))
+
+    def _op_remove_profile(self, c, name):
+        c.execute("DELETE FROM profiles WHERE name = ?", (name,))
+
+    def _op_rename_profile(self, c, old, new):
+        c.execute("UPDATE profiles SET name = ?, position = ? WHERE name = ?",
+                  (new, self._next_position(c, "profiles"), old))
+
+    def _op_set_setting(self, c, key, value):
+        c.execute("INSERT OR REPLACE INTO settings VALUES (?, ?)", (key, json.dumps(value)))
+
+    def _op_set_launch_rule(self, c, path, rule):
+        c.execute("INSERT OR REPLACE INTO launch_rules VALUES (?, ?)", (path, json.dumps(rule)))
+
+    def _op_remove_launch_rule(self, c, path):
+        c.execute("DELETE FROM launch_rules WHERE path = ?", (path,))
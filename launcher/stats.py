@@ -0,0 +1,201 @@
+"""
+Launch timing statistics.
+
+Every launch appends one JSON line to `launch_stats.jsonl` next to
+config.json:
+
+    {"kind": "app", "ts": ..., "app": path, "profile": name-or-null, "ok": true,
+     "validate": s, "spawn": s, "alive": s-or-null}
+    {"kind": "batch", "ts": ..., "profile": name, "label": ..., "total": s,
+     "apps": n, "failed": n}
+
+`validate` is the path check, `spawn` the os.startfile/Popen call and `alive`
+the time from spawn until the app was seen up — idle waiting for input when
+there's a process handle, otherwise in the process list (null if it wasn't
+within launcher.ALIVE_TIMEOUT, or couldn't be told; see AliveWatcher).
+
+Recording a launch only appends a line. Rolling p50/p95/max aggregates over
+the last ROLLING_WINDOW samples per app and per profile are rebuilt from the
+file the first time they're asked for, so recording never has to read the
+history. Once the file passes COMPACT_BYTES it's rewritten with just the
+last ROLLING_WINDOW lines per app and per profile — all the aggregates can
+use — so it doesn't grow without bound.
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+STATS_NAME = "launch_stats.jsonl"
+ROLLING_WINDOW = 100
+# File size (bytes) at which it's cut down to the last ROLLING_WINDOW lines
+# per app and per profile
+COMPACT_BYTES = 1024 * 1024
+
+
+def percentile(values, pct: float):
+    """Nearest-rank percentile of `values` (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _summarize(samples) -> dict:
+    return {
+        "runs": len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "max": max(samples) if samples else None,
+    }
+
+
+class LaunchStats:
+    def __init__(self, path, window: int = ROLLING_WINDOW):
+        self.path = path
+        self.window = window
+        self._lock = threading.Lock()
+        # app -> deque of per-launch totals; phase samples kept alongside
+        self._app_total = defaultdict(lambda: deque(maxlen=self.window))
+        self._app_phase = defaultdict(lambda: {
+            "validate": deque(maxlen=self.window),
+            "spawn": deque(maxlen=self.window),
+            "alive": deque(maxlen=self.window),
+        })
+        self._app_failures = defaultdict(int)
+        self._profile_total = defaultdict(lambda: deque(maxlen=self.window))
+        self._loaded = False
+        self._size = None  # bytes in the file, read on the first append
+
+    def _load(self):
+        """Replay the file into the aggregates. Caller holds the lock."""
+        self._loaded = True
+        try:
+            f = open(self.path, "r", encoding="utf-8")
+        except OSError:
+            return
+        with f:
+            for line in f:
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    continue  # torn/garbled line from a crash mid-append
+
+    def _apply(self, row: dict):
+        if row["kind"] == "app":
+            app = row["app"]
+            if not row["ok"]:
+                self._app_failures[app] += 1
+                return
+            phases = self._app_phase[app]
+            total = 0.0
+            for phase in ("validate", "spawn", "alive"):
+                value = row.get(phase)
+                if value is not None:
+                    phases[phase].append(value)
+                    total += value
+            self._app_total[app].append(total)
+        elif row["kind"] == "batch" and row.get("profile"):
+            self._profile_total[row["profile"]].append(row["total"])
+
+    def _append(self, row: dict):
+        row["ts"] = round(time.time(), 3)
+        line = json.dumps(row) + "\n"
+        with self._lock:
+            if self._loaded:
+                self._apply(row)
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    self._size = f.tell()
+            except OSError:
+                return  # stats are best-effort; never fail a launch over them
+            if self._size > COMPACT_BYTES:
+                self._compact()
+
+    @staticmethod
+    def _key(row: dict):
+        return (row["kind"], row["app"] if row["kind"] == "app" else row.get("profile"))
+
+    def _compact(self):
+        """Rewrite the file with the last `window` lines per app and per
+        profile (and of batches without one). Caller holds the lock."""
+        kept = defaultdict(lambda: deque(maxlen=self.window))
+        order = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        key = self._key(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    order.append(line)
+                    kept[key].append(len(order) - 1)
+            keep = sorted(i for lines in kept.values() for i in lines)
+            text = "".join(order[i] for i in keep)
+            tmp = self.path.with_name(f".{self.path.name}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, self.path)
+        except OSError:
+            return
+        self._size = len(text.encode("utf-8"))
+        if self._loaded:
+            # Failure counts only cover what's left in the file now
+            self._clear()
+            self._load()
+
+    def unload(self):
+        """Drop the aggregates; the next summary replays the file again."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        for table in (self._app_total, self._app_phase, self._app_failures, self._profile_total):
+            table.clear()
+        self._loaded = False
+
+    def record_app(self, app: str, ok: bool, validate: float, spawn=None, alive=None, profile=None):
+        self._append({
+            "kind": "app", "app": app, "profile": profile, "ok": ok,
+            "validate": validate, "spawn": spawn, "alive": alive,
+        })
+
+    def record_batch(self, label: str, total: float, apps: int, failed: int, profile=None):
+        self._append({
+            "kind": "batch", "profile": profile, "label": label,
+            "total": total, "apps": apps, "failed": failed,
+        })
+
+    def app_summary(self) -> list:
+        """One dict per app, slowest p95 first."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            apps = set(self._app_total) | set(self._app_failures)
+            rows = []
+            for app in apps:
+                row = _summarize(list(self._app_total.get(app, ())))
+                row["app"] = app
+                row["failures"] = self._app_failures.get(app, 0)
+                for phase, samples in self._app_phase.get(app, {}).items():
+                    row[f"{phase}_p50"] = percentile(list(samples), 50)
+                rows.append(row)
+        rows.sort(key=lambda r: r["p95"] or 0.0, reverse=True)
+        return rows
+
+    def profile_summary(self) -> list:
+        """One dict per profile (whole-batch wall time), slowest p95 first."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            rows = []
+            for profile, samples in self._profile_total.items():
+                row = _summarize(list(samples))
+                row["profile"] = profile
+                rows.append(row)
+        rows.sort(key=lambda r: r["p95"] or 0.0, reverse=True)
+        return rows
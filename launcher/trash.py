@@ -0,0 +1,88 @@
+"""
+The Trash: removed apps, oldest first, as (category, index, entry), capped
+at a limit (the oldest are forgotten first).
+
+Items live in an insertion-ordered dict keyed by an id, with an index from
+(category, app path) to the ids of that app's items. Restoring or
+discarding an app (the newest removal of it) and dropping the oldest item
+are O(1), not a scan of the whole Trash. An item keeps its id for as long
+as it's in the Trash, including in copies, so the Trash window can update
+row by row.
+"""
+from itertools import count
+
+from appentry import entry_path
+
+_ids = count(1)
+
+
+class Trash:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._items = {}   # id -> (category, index, entry), oldest first
+        self._by_app = {}  # (category, path) -> {id: None}, oldest first
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def items(self):
+        """(id, (category, index, entry)) pairs, oldest first."""
+        return self._items.items()
+
+    def copy(self) -> "Trash":
+        other = Trash(self.limit)
+        other._items = dict(self._items)
+        other._by_app = {key: dict(ids) for key, ids in self._by_app.items()}
+        return other
+
+    def push(self, category: str, index: int, entry) -> int:
+        item_id = next(_ids)
+        self._items[item_id] = (category, index, entry)
+        self._by_app.setdefault((category, entry_path(entry)), {})[item_id] = None
+        while len(self._items) > self.limit:
+            self.remove(next(iter(self._items)))
+        return item_id
+
+    def get(self, item_id: int):
+        return self._items.get(item_id)
+
+    def latest(self):
+        """The most recently removed item, or None."""
+        return self._items[next(reversed(self._items))] if self._items else None
+
+    def find(self, category: str, path: str):
+        """Id of the newest removal of `path` from `category`, or None."""
+        ids = self._by_app.get((category, path))
+        return next(reversed(ids)) if ids else None
+
+    def remove(self, item_id: int):
+        item = self._items.pop(item_id, None)
+        if item is not None:
+            key = (item[0], entry_path(item[2]))
+            ids = self._by_app[key]
+            del ids[item_id]
+            if not ids:
+                del self._by_app[key]
+        return item
+
+    def discard(self, category: str, path: str):
+        """Take the newest removal of `path` from `category` out of the Trash
+        (it was restored, re-added or thrown away)."""
+        item_id = self.find(category, path)
+        return None if item_id is None else self.remove(item_id)
+
+    def rename_category(self, old: str, new: str):
+        for key in [k for k in self._by_app if k[0] == old]:
+            ids = self._by_app.pop(key)
+            merged = self._by_app.get((new, key[1]))
+            if merged:
+                # Items of a deleted category that had the new name: ids
+                # grow with time, so sorting keeps them oldest first
+                ids = dict.fromkeys(sorted([*merged, *ids]))
+            self._by_app[(new, key[1])] = ids
+            for item_id in ids:
+                _, index, entry = self._items[item_id]
+                self._items[item_id] = (new, index, entry)  # keeps its place
@@ -2,31 +2,70 @@
 System tray icon support.
 
 Uses pystray (pip install pystray) + Pillow (pip install pillow) to draw a
-small icon and run a "Show" / "Exit" menu. pystray's `.run()` call blocks,
-so it's started on its own daemon thread; its menu callbacks also fire on
-that thread, so — same rule as hotkey.py — anything that touches Tkinter
+small icon and run its menu: "Show", a "Profiles" and a "Categories"
+submenu that launch one with a click, and "Exit"; notify() pops up a
+desktop notification from it. pystray's `.run()` call blocks, so it's
+started on its own daemon thread; its menu callbacks also fire on that
+thread, so — same rule as hotkey.py — anything that touches Tkinter
 widgets must be marshalled back onto the main thread by the caller.
+
+pystray and Pillow are only imported, and the icon image only drawn, the
+first time the tray is actually started — most sessions never minimize, and
+those imports are a noticeable part of the app's start-up time. The
+submenus are only rebuilt when the names passed to set_launch_targets
+change.
 """
 import threading
-from PIL import Image, ImageDraw
-import pystray
 
 
 class TrayIcon:
-    def __init__(self, app_name: str, on_show, on_exit):
-        self._icon = pystray.Icon(
-            app_name,
-            self._build_image(),
-            app_name,
-            menu=pystray.Menu(
-                pystray.MenuItem("Show", lambda icon, item: on_show(), default=True),
-                pystray.MenuItem("Exit", lambda icon, item: on_exit()),
-            ),
-        )
+    def __init__(self, app_name: str, on_show, on_exit, on_launch=None):
+        """`on_launch(kind, name)` gets ("profile", name) or ("category",
+        name) when one is picked from the submenus."""
+        self._app_name = app_name
+        self._on_show = on_show
+        self._on_exit = on_exit
+        self._on_launch = on_launch
+        self._targets = ((), ())  # profile names, category names
+        self._icon = None
         self._thread = None
 
+    def set_launch_targets(self, profiles, categories):
+        """Update the submenus; a no-op unless the names changed."""
+        targets = (tuple(profiles), tuple(categories))
+        if targets == self._targets:
+            return
+        self._targets = targets
+        if self._icon is not None:
+            self._icon.menu = self._build_menu()
+            self._icon.update_menu()
+
+    def _build_icon(self):
+        import pystray
+
+        return pystray.Icon(self._app_name, self._build_image(), self._app_name, menu=self._build_menu())
+
+    def _build_menu(self):
+        import pystray
+
+        def launcher(kind, name):
+            return lambda icon, item: self._on_launch(kind, name)
+
+        items = [pystray.MenuItem("Show", lambda icon, item: self._on_show(), default=True)]
+        if self._on_launch is not None:
+            for title, kind, names in (("Profiles", "profile", self._targets[0]),
+                                       ("Categories", "category", self._targets[1])):
+                if names:
+                    submenu = pystray.Menu(*(pystray.MenuItem(name, launcher(kind, name)) for name in names))
+                    items.append(pystray.MenuItem(title, submenu))
+            items.append(pystray.Menu.SEPARATOR)
+        items.append(pystray.MenuItem("Exit", lambda icon, item: self._on_exit()))
+        return pystray.Menu(*items)
+
     @staticmethod
-    def _build_image(size: int = 64) -> Image.Image:
+    def _build_image(size: int = 64):
+        from PIL import Image, ImageDraw
+
         # Simple generated icon so there's no external asset file to ship/lose.
         image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
         draw = ImageDraw.Draw(image)
@@ -37,8 +76,26 @@ class TrayIcon:
     def start(self):
         if self._thread and self._thread.is_alive():
             return
+        if self._icon is None:
+            self._icon = self._build_icon()
         self._thread = threading.Thread(target=self._icon.run, daemon=True)
         self._thread.start()
 
+    def notify(self, message: str, title: str = None) -> bool:
+        """Show a desktop notification from the icon. Returns False if the
+        icon isn't running or pystray can't notify on this platform, so the
+        caller can say it some other way."""
+        icon = self._icon
+        if icon is None or not (self._thread and self._thread.is_alive()):
+            return False
+        if not getattr(icon, "HAS_NOTIFICATION", False):
+            return False
+        try:
+            icon.notify(message, title or self._app_name)
+        except Exception:
+            return False
+        return True
+
     def stop(self):
-        self._icon.stop()
\ No newline at end of file
+        if self._icon is not None:
+            self._icon.stop()
@@ -1,42 +1,116 @@
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
 from pathlib import Path
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from tkinter import filedialog, simpledialog, messagebox
 
-from config import Config
-from launcher import AppLauncher
+from appentry import entry_name, entry_path
+from applist import AppList
+from config import Config, HOTKEY_TARGETS
+from dialogs import ProfileEditor, TrashWindow
+from frecency import Frecency, FRECENCY_NAME
+from launcher import AppLauncher, LaunchResult, FAILED, SKIPPED, STARTED
+from lnk import ShortcutCache, CACHE_NAME
+from memory import memory_report, release_memory, rss_bytes
+from palette import QuickPalette
+from stats import LaunchStats, STATS_NAME
 from tooltip import ToolTip
+from watcher import FileWatcher
 from hotkey import HotkeyManager
 from tray import TrayIcon
 
 
+# How often (ms) the Tk thread drains launch progress while a batch is running.
+LAUNCH_POLL_MS = 50
+# How long (s) the instance server waits for the Tk thread to answer a command.
+INSTANCE_REPLY_TIMEOUT = 5.0
+# Matches listed under the search box
+SEARCH_RESULTS = 20
+# Failed apps named in a tray notification (the rest are counted)
+NOTIFY_FAILURES = 3
+
+
 class LauncherUI(tb.Window):
-    def __init__(self):
+    def __init__(self, instance_server=None):
         super().__init__(title="App Launcher", themename="darkly")
-        self.geometry("800x560")
+        self.geometry("800x680")
 
         self.config_manager = Config()
-        self.launcher = AppLauncher()
+        self.launch_stats = LaunchStats(self.config_manager.path.with_name(STATS_NAME))
+        self.frecency = Frecency(self.config_manager.path.with_name(FRECENCY_NAME))
+        self.launcher = AppLauncher(
+            max_workers=self.config_manager.get_launch_workers(),
+            stats=self.launch_stats,
+            shortcuts=ShortcutCache(self.config_manager.path.with_name(CACHE_NAME)),
+        )
+
+        # Launch batches run on a background thread so the Tk event loop never
+        # waits on os.startfile/Popen. Progress comes back through a
+        # thread-safe queue that the Tk thread drains with self.after polling.
+        self._launch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="launch-batch")
+        self._launch_queue = queue.Queue()
+        self._batch_ids = count(1)
+        self._active_batches = set()
+        self._polling_launches = False
+        # What launch hotkeys (settings["hotkeys"]) and the tray menu start:
+        # (config revision, combo or (kind, name) -> (entries, label,
+        # profile), launch rules, skip_running), read by the keyboard and
+        # tray threads; see _launch_from_snapshot. Built after the first
+        # paint, then rebuilt once per burst of edits by a config listener;
+        # tray entries are resolved on first use.
+        self._launch_snapshot = (-1, {}, {}, False)
+        self._snapshot_pending = False
+        self.config_manager.add_listener(self._refresh_launch_targets)
 
         self.current_category = None
         self.tooltip = None
+        # Built on first use, then hidden and re-shown (see dialogs.py)
+        self.trash_window = None
+        self.profile_editor = None
 
         self.create_widgets()
         self.populate_categories()
         self.populate_profiles()
 
-        self.last_deleted = None  # (category, index, path)
-        self.trash = []  # list of (original_category, name, path)
+        # Trash / Undo history lives in config_manager.trash and survives restarts
+        self._update_undo_button()
 
-        # Tray + global hotkey setup
-        self.tray_icon = TrayIcon(
-            app_name="App Launcher",
-            on_show=self.restore_from_tray,
-            on_exit=self.quit_app,
-        )
+        # Tray + global hotkey setup. Neither is needed to draw the window, so
+        # the tray icon is only built on the first minimize_to_tray, and the
+        # hotkey (which imports `keyboard`) is registered once the event loop
+        # is running rather than before the first paint.
+        self.tray_icon = None
         self.hotkey_manager = HotkeyManager()
-        self._register_hotkey(self.config_manager.get_hotkey())
+        self.after(1, lambda: self._register_hotkey(self.config_manager.get_hotkey()))
+        self.after(1, self._register_launch_hotkeys)
+        # The hotkey's quick-launch palette is built (hidden) right after the
+        # first paint, so pressing the hotkey only has to show it
+        self.palette = None
+        self.after(1, self._build_palette)
+
+        # Idle mode: after settings["idle_teardown_minutes"] in the tray the
+        # window's widgets are destroyed (see _enter_idle). _idle_memory is
+        # the RSS before and after the last teardown.
+        self._idle = False
+        self._idle_timer = None
+        self._idle_memory = None
+
+        # Single-instance channel (already bound by main.py): later
+        # invocations forward "show" / "run" here instead of starting a copy.
+        self.instance_server = instance_server
+        if instance_server is not None:
+            self.after(1, lambda: instance_server.serve(self._on_instance_command))
+
+        # Pick up edits other programs (the CLI, scripts, a text editor)
+        # make to the config while we run
+        self.config_watcher = FileWatcher(
+            self.config_manager.watched_files(), lambda: self.after(0, self._on_config_file_changed)
+        )
+        self.after(1, self._start_config_watcher)
 
         # Closing the window (X button) minimizes to tray instead of quitting.
         self.protocol("WM_DELETE_WINDOW", self.minimize_to_tray)
@@ -62,6 +136,41 @@ class LauncherUI(tb.Window):
         tb.Button(top_frame, text="Rename", command=self.rename_category, bootstyle=INFO).pack(side=LEFT, padx=5)
         tb.Button(top_frame, text="Delete", command=self.remove_category, bootstyle=DANGER).pack(side=LEFT, padx=5)
 
+        # Search across every category, answered from Config's index on
+        # each keystroke
+        self.search_frame = tb.Frame(self)
+        self.search_frame.pack(fill=X, padx=10, pady=(0, 10))
+
+        tb.Label(self.search_frame, text="Search:").pack(side=LEFT)
+        self.search_var = tb.StringVar()
+        self.search_entry = tb.Entry(self.search_frame, textvariable=self.search_var)
+        self.search_entry.pack(side=LEFT, fill=X, expand=True, padx=10)
+        # Build the index while the user starts typing, not on the first key
+        self.search_entry.bind("<FocusIn>", lambda e: self.after_idle(self.config_manager.prepare_search))
+        self.search_entry.bind("<Return>", self.open_search_result)
+        self.search_entry.bind("<Down>", self._focus_search_results)
+        self.search_entry.bind("<Escape>", lambda e: self.search_var.set(""))
+        self.search_var.trace_add("write", lambda *args: self.on_search())
+
+        # Matches, shown under the search box only while there's a query
+        self._search_hits = []
+        self.search_results = tb.Treeview(
+            self,
+            columns=("name", "category", "path"),
+            show="headings",
+            height=6,
+            bootstyle=SECONDARY
+        )
+        self.search_results.heading("name", text="Name")
+        self.search_results.heading("category", text="Category")
+        self.search_results.heading("path", text="Path")
+        self.search_results.column("name", width=200, anchor=W)
+        self.search_results.column("category", width=120, anchor=W)
+        self.search_results.column("path", width=380, anchor=W)
+        self.search_results.bind("<Double-1>", self.open_search_result)
+        self.search_results.bind("<Return>", self.open_search_result)
+        self.search_results.bind("<Escape>", lambda e: self.search_var.set(""))
+
         # Treeview for apps
         mid_frame = tb.Frame(self)
         mid_frame.pack(fill=BOTH, expand=True, padx=10, pady=(0, 10))
@@ -85,9 +194,11 @@ class LauncherUI(tb.Window):
         self.tree.bind("<Leave>", lambda e: self.tooltip.hidetip())
 
         # Scrollbar
-        scrollbar = tb.Scrollbar(mid_frame, orient="vertical", command=self.tree.yview)
+        scrollbar = tb.Scrollbar(mid_frame, orient="vertical")
         scrollbar.pack(side=RIGHT, fill=Y)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Rows keyed by app path and refreshed by diffing; huge categories
+        # are virtualized (see applist.py)
+        self.app_list = AppList(self.tree, scrollbar)
 
         # Bottom buttons (category-level app actions)
         bottom_frame = tb.Frame(self)
@@ -98,6 +209,8 @@ class LauncherUI(tb.Window):
         tb.Button(bottom_frame, text="Add App", command=self.add_app, bootstyle=SECONDARY).grid(row=0, column=2, padx=5)
         tb.Button(bottom_frame, text="Remove App", command=self.remove_app, bootstyle=DANGER).grid(row=0, column=3, padx=5)
         tb.Button(bottom_frame, text="Trash", command=self.view_trash, bootstyle=SECONDARY).grid(row=0, column=4, padx=5)
+        tb.Button(bottom_frame, text="Stats", command=self.view_stats, bootstyle=SECONDARY).grid(row=0, column=5, padx=5)
+        tb.Button(bottom_frame, text="Check Shortcuts", command=self.check_shortcuts, bootstyle=SECONDARY).grid(row=0, column=6, padx=5)
 
         # Separator between categories and profiles
         tb.Separator(self, orient=HORIZONTAL).pack(fill=X, padx=10, pady=(0, 10))
@@ -122,6 +235,29 @@ class LauncherUI(tb.Window):
         tb.Button(profile_frame, text="Rename", command=self.rename_profile, bootstyle=SECONDARY).pack(side=LEFT, padx=5)
         tb.Button(profile_frame, text="Delete", command=self.remove_profile, bootstyle=DANGER).pack(side=LEFT, padx=5)
 
+        # Launch progress panel: one row per app in the current/last batch
+        progress_frame = tb.Frame(self)
+        progress_frame.pack(fill=X, padx=10, pady=(0, 10))
+
+        tb.Label(progress_frame, text="Launch progress:").pack(anchor=W)
+        self.progress_tree = tb.Treeview(
+            progress_frame,
+            columns=("name", "state", "time"),
+            show="headings",
+            height=4,
+            bootstyle=SECONDARY
+        )
+        self.progress_tree.heading("name", text="App")
+        self.progress_tree.heading("state", text="State")
+        self.progress_tree.heading("time", text="Time")
+        self.progress_tree.column("name", width=450, anchor=W)
+        self.progress_tree.column("state", width=150, anchor=W)
+        self.progress_tree.column("time", width=100, anchor=E)
+        self.progress_tree.pack(fill=X, side=LEFT, expand=True)
+        progress_scroll = tb.Scrollbar(progress_frame, orient="vertical", command=self.progress_tree.yview)
+        progress_scroll.pack(side=RIGHT, fill=Y)
+        self.progress_tree.configure(yscrollcommand=progress_scroll.set)
+
         # Separator between profiles and settings
         tb.Separator(self, orient=HORIZONTAL).pack(fill=X, padx=10, pady=(0, 10))
 
@@ -129,11 +265,20 @@ class LauncherUI(tb.Window):
         settings_frame = tb.Frame(self)
         settings_frame.pack(fill=X, padx=10, pady=(0, 10))
 
-        self.hotkey_label_var = tb.StringVar(value=f"Show shortcut: {self.config_manager.get_hotkey()}")
+        self.hotkey_label_var = tb.StringVar(value=f"Quick launch: {self.config_manager.get_hotkey()}")
         tb.Label(settings_frame, textvariable=self.hotkey_label_var).pack(side=LEFT)
         tb.Button(
             settings_frame, text="Change Shortcut", command=self.change_hotkey, bootstyle=SECONDARY
         ).pack(side=LEFT, padx=10)
+        tb.Button(
+            settings_frame, text="Launch Shortcuts", command=self.edit_launch_hotkeys, bootstyle=SECONDARY
+        ).pack(side=LEFT)
+        self.skip_running_var = tb.BooleanVar(value=self.config_manager.get_skip_running())
+        tb.Checkbutton(
+            settings_frame, text="Skip running apps", variable=self.skip_running_var,
+            command=lambda: self.config_manager.set_skip_running(self.skip_running_var.get()),
+            bootstyle="round-toggle"
+        ).pack(side=LEFT, padx=10)
         tb.Label(
             settings_frame, text="(Closing this window minimizes to the tray — use Exit in the tray menu to quit)",
             bootstyle=SECONDARY
@@ -167,14 +312,60 @@ class LauncherUI(tb.Window):
             self.load_apps(cats[0])
 
     def load_apps(self, category: str):
-        self.current_category = category
-        self.tree.delete(*self.tree.get_children())
+        """Show `category`'s apps. Reloading the category already shown only
+        touches the rows that changed."""
         apps = self.config_manager.categories.get(category, [])
-        for path in apps:
-            name = Path(path).name
-            self.tree.insert("", "end", values=(name, path))
+        if category == self.current_category:
+            self.app_list.sync(apps)
+        else:
+            self.current_category = category
+            self.app_list.show(apps)
         self.set_status(f"Loaded {len(apps)} app(s) in '{category}'")
 
+    # Search
+
+    def on_search(self):
+        """Runs on every keystroke: list the best matches for the query."""
+        query = self.search_var.get().strip()
+        results = self.search_results
+        results.delete(*results.get_children())
+        if not query:
+            self._search_hits = []
+            results.pack_forget()
+            return
+        self._search_hits = self.config_manager.search(query, SEARCH_RESULTS)
+        for i, (category, entry) in enumerate(self._search_hits):
+            results.insert("", "end", iid=str(i), values=(entry_name(entry), category, entry_path(entry)))
+        if not results.winfo_ismapped():
+            results.pack(fill=X, padx=10, pady=(0, 10), after=self.search_frame)
+        self.set_status(f"{len(self._search_hits)} match(es) for '{query}'")
+
+    def _focus_search_results(self, event=None):
+        rows = self.search_results.get_children()
+        if rows:
+            self.search_results.focus_set()
+            self.search_results.selection_set(rows[0])
+            self.search_results.focus(rows[0])
+        return "break"
+
+    def open_search_result(self, event=None):
+        """Jump to the selected match (or the best one): switch to its
+        category and select it in the app list."""
+        sel = self.search_results.selection()
+        i = int(sel[0]) if sel else 0
+        if i >= len(self._search_hits):
+            return "break"
+        category, entry = self._search_hits[i]
+        if category not in self.config_manager.categories:
+            self.on_search()  # stale: the config changed under the results
+            return "break"
+        self.search_var.set("")
+        self.category_combo.set(category)
+        self.load_apps(category)
+        self.app_list.reveal(entry_path(entry))
+        self.tree.focus_set()
+        return "break"
+
     def on_category_change(self, event=None):
         cat = self.category_var.get()
         if cat:
@@ -192,44 +383,89 @@ class LauncherUI(tb.Window):
         full_path = values[1]
         self.tooltip.schedule(full_path)
     
+    def _update_undo_button(self):
+        """Called whenever the Trash may have changed; also updates the
+        Trash window if it's open."""
+        self.undo_button.configure(state="normal" if self.config_manager.trash else "disabled")
+        if self.trash_window is not None and self.trash_window.winfo_viewable():
+            self.trash_window.refresh()
+
     def undo_delete(self):
-        if not self.last_deleted:
+        """Put the most recently removed app back where it was."""
+        if not self.config_manager.trash:
             return
 
-        category, index, path = self.last_deleted
+        category, index, entry = self.config_manager.trash.latest()
 
-        # Insert back into the list at the original index
-        apps = self.config_manager.categories.get(category, [])
-        apps.insert(index, path)
-        self.config_manager.save()
-
-        self.load_apps(category)
-        self.set_status(f"Restored: {path}")
+        # Insert back into the list at the original index (this also takes
+        # it out of the Trash)
+        if not self.config_manager.insert_app_into_category(category, entry, index):
+            messagebox.showinfo("Info", f"Could not restore '{entry_path(entry)}': '{category}' is gone or already has it.")
+            self.config_manager.discard_from_trash(category, entry)
+            self._update_undo_button()
+            return
 
-        # Clear undo buffer
-        self.last_deleted = None
-        self.undo_button.configure(state="disabled")
+        if self.current_category == category:
+            self.load_apps(category)
+        self.set_status(f"Restored: {entry_path(entry)}")
+        self._update_undo_button()
     
     def view_trash(self):
-        win = tb.Toplevel(self)
-        win.title("Trash")
-        win.geometry("600x300")
-
-        tree = tb.Treeview(win, columns=("category", "name", "path"), show="headings")
-        tree.bind("<Double-1>", lambda e: self.restore_from_trash(tree))
-        tree.heading("category", text="Original Category")
-        tree.heading("name", text="Name")
-        tree.heading("path", text="Path")
-        tree.column("category", width=150, anchor=W)
-        tree.column("name", width=200, anchor=W)
-        tree.column("path", width=400, anchor=W)
-        tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+        if self.trash_window is None:
+            self.trash_window = TrashWindow(self, self.config_manager, self.restore_from_trash)
+        self.trash_window.show()
 
-        for cat, name, path in self.trash:
-            tree.insert("", "end", values=(cat, name, path))
+    def view_stats(self):
+        win = tb.Toplevel(self)
+        win.title("Launch Stats")
+        win.geometry("760x460")
+
+        def fmt(seconds):
+            return "" if seconds is None else f"{seconds:.2f}s"
+
+        tb.Label(win, text="Apps (rolling, slowest p95 first):").pack(anchor=W, padx=10, pady=(10, 0))
+        app_cols = ("name", "runs", "fail", "p50", "p95", "max", "spawn", "alive")
+        app_tree = tb.Treeview(win, columns=app_cols, show="headings", height=10)
+        for col, text, width in (
+            ("name", "App", 220), ("runs", "Runs", 50), ("fail", "Failed", 55), ("p50", "p50", 70),
+            ("p95", "p95", 70), ("max", "Max", 70), ("spawn", "Spawn p50", 85), ("alive", "Alive p50", 85),
+        ):
+            app_tree.heading(col, text=text)
+            app_tree.column(col, width=width, anchor=W if col == "name" else E)
+        app_tree.pack(fill=BOTH, expand=True, padx=10, pady=5)
+        for row in self.launch_stats.app_summary():
+            app_tree.insert("", "end", values=(
+                Path(row["app"]).name, row["runs"], row["failures"], fmt(row["p50"]), fmt(row["p95"]),
+                fmt(row["max"]), fmt(row.get("spawn_p50")), fmt(row.get("alive_p50")),
+            ))
+
+        tb.Label(win, text="Profiles (whole launch):").pack(anchor=W, padx=10, pady=(10, 0))
+        prof_cols = ("name", "runs", "p50", "p95", "max")
+        prof_tree = tb.Treeview(win, columns=prof_cols, show="headings", height=4)
+        for col, text, width in (("name", "Profile", 220), ("runs", "Runs", 50), ("p50", "p50", 70),
+                                 ("p95", "p95", 70), ("max", "Max", 70)):
+            prof_tree.heading(col, text=text)
+            prof_tree.column(col, width=width, anchor=W if col == "name" else E)
+        prof_tree.pack(fill=X, padx=10, pady=5)
+        for row in self.launch_stats.profile_summary():
+            prof_tree.insert("", "end", values=(
+                row["profile"], row["runs"], fmt(row["p50"]), fmt(row["p95"]), fmt(row["max"]),
+            ))
 
         tb.Button(win, text="Close", command=win.destroy, bootstyle=SECONDARY).pack(pady=10)
 
+    def check_shortcuts(self):
+        """Validate every .lnk in every category up front, instead of finding
+        broken ones one at a time at launch."""
+        problems = self.launcher.shortcuts.validate(self.config_manager.all_app_paths())
+        if not problems:
+            self.set_status("All shortcuts look good")
+            messagebox.showinfo("Shortcuts", "Every shortcut points at a target that exists.")
+            return
+        self.set_status(f"{len(problems)} broken shortcut(s)")
+        lines = "\n".join(f"{path}\n    {problem}" for path, problem in problems)
+        messagebox.showwarning("Shortcuts", f"{len(problems)} shortcut(s) need attention:\n\n{lines}")
+
     # Category actions
 
     def new_category(self):
@@ -305,42 +541,36 @@ class LauncherUI(tb.Window):
         if not self.current_category:
             return
 
-        sel = self.tree.selection()
-        if not sel:
+        picked = self.app_list.selection()
+        if picked is None:
             messagebox.showinfo("Info", "Please select an app to remove.")
             return
 
-        row_id = sel[0]
-        index = self.tree.index(row_id)
-        values = self.tree.item(row_id, "values")
-        if not values:
-            return
-
-        app_name, app_path = values
+        index, (app_name, app_path) = picked
 
-        confirm = messagebox.askyesno(
-            "Confirm Removal",
+        message = (
             f"Remove this application from '{self.current_category}'?\n\n"
             f"Name: {app_name}\n"
             f"Path: {app_path}"
         )
+        profiles = self.config_manager.profiles_with_app(app_path)
+        if profiles:
+            message += f"\n\nUsed by profile(s): {', '.join(sorted(profiles))}"
+        confirm = messagebox.askyesno("Confirm Removal", message)
         if not confirm:
             return
 
-        # store for undo
-        self.last_deleted = (self.current_category, index, app_path)
-        self.undo_button.configure(state="normal")
-
-        # add to trash
-        self.trash.append((self.current_category, app_name, app_path))
-
         removed = self.config_manager.remove_app_from_category(self.current_category, index)
         if removed is None:
             messagebox.showinfo("Info", "Could not remove selected app.")
             return
 
+        # Config keeps the full entry in its Trash (so args/env/cwd survive
+        # a restore) and Undo takes the newest one back out
+        self._update_undo_button()
+
         self.load_apps(self.current_category)
-        self.set_status(f"Removed: {removed}")
+        self.set_status(f"Removed: {entry_path(removed)}")
 
     def run_apps(self):
         if not self.current_category:
@@ -349,60 +579,164 @@ class LauncherUI(tb.Window):
         if not apps:
             messagebox.showinfo("Info", "No applications to run in this category.")
             return
-        self.launcher.launch_list(apps)
-        self.set_status(f"Launched {len(apps)} app(s) from '{self.current_category}'")
+        self.start_launch(apps, f"'{self.current_category}'")
 
     def run_selected(self):
         if not self.current_category:
             return
-        sel = self.tree.selection()
-        if not sel:
+        picked = self.app_list.selection()
+        if picked is None:
             messagebox.showinfo("Info", "Please select an app to run.")
             return
-        values = self.tree.item(sel[0], "values")
-        if not values:
-            return
-        path = values[1]
-        self.launcher.launch_path(path)
-        self.set_status(f"Launched: {path}")
-
-    def restore_from_trash(self, tree):
-        sel = tree.selection()
-        if not sel:
+        apps = self.config_manager.categories.get(self.current_category, [])
+        index = picked[0]
+        if index >= len(apps):
             return
-
-        row_id = sel[0]
-        cat, name, path = tree.item(row_id, "values")
-
-        confirm = messagebox.askyesno(
-            "Restore Application",
-            f"Restore this application?\n\n"
-            f"Name: {name}\n"
-            f"Category: {cat}\n"
-            f"Path: {path}"
-        )
-        if not confirm:
+        entry = apps[index]
+        self.start_launch([entry], entry_path(entry))
+
+    # Background launching
+
+    def start_launch(self, entries, label: str, profile=None, skip_running=None):
+        """Hand a batch to the background executor and return immediately.
+        Safe to call while another batch is still running. `skip_running`
+        overrides the checkbox when given."""
+        # Snapshot on the Tk thread so the worker never reads config mid-edit
+        rules = {p: dict(r) for p, r in self.config_manager.launch_rules.items()}
+        if skip_running is None:
+            skip_running = self.skip_running_var.get()
+        self._submit_launch(list(entries), label, profile, rules, skip_running)
+        self._poll_launches()
+
+    def _submit_launch(self, entries, label: str, profile, rules, skip_running: bool):
+        """Start a batch on the executor. Touches no widgets and no config,
+        so launch hotkeys call it straight from the keyboard thread; the Tk
+        side learns about the batch from its "start" event."""
+        batch_id = next(self._batch_ids)
+        self._launch_queue.put(("start", batch_id, entries, label, profile))
+
+        def on_progress(path, state, result):
+            self._launch_queue.put(("app", batch_id, path, state, result))
+
+        def run():
+            results = []
+            try:
+                results = self.launcher.launch_list(
+                    entries, on_progress=on_progress, rules=rules, profile=profile, label=label,
+                    skip_running=skip_running
+                )
+            except ValueError as e:
+                # Dependency cycle in launch_rules: nothing was launched
+                results = [LaunchResult(entry_path(entry), False, str(e)) for entry in entries]
+            finally:
+                # Always report completion so the Tk side stops tracking the batch
+                self._launch_queue.put(("done", batch_id, label, results))
+
+        self._launch_executor.submit(run)
+
+    def _poll_launches(self):
+        """Drain the launch queue now, and keep polling while batches run."""
+        if not self._polling_launches:
+            self._polling_launches = True
+            self.after(0, self._drain_launch_queue)
+
+    def _begin_batch(self, batch_id: int, entries, label: str, profile):
+        self._active_batches.add(batch_id)
+        if not self._idle:
+            # Clear rows left over from batches that have already finished
+            for row_id in self.progress_tree.get_children():
+                if int(row_id.split(":", 1)[0]) not in self._active_batches:
+                    self.progress_tree.delete(row_id)
+        self.set_status(f"Launching {len(entries)} app(s) from {label}...")
+        # Profiles and single apps feed the palette's ranking
+        if profile is not None:
+            self.frecency.record("profile", profile)
+        elif len(entries) == 1:
+            self.frecency.record("app", entry_path(entries[0]))
+
+    def _drain_launch_queue(self):
+        """Runs on the Tk thread: apply every queued progress event, then
+        re-arm itself while any batch is still in flight."""
+        while True:
+            try:
+                event = self._launch_queue.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "start":
+                self._begin_batch(*event[1:])
+            elif event[0] == "app":
+                _, batch_id, path, state, result = event
+                self._set_progress_row(batch_id, path, state, result)
+            else:
+                _, batch_id, label, results = event
+                self._active_batches.discard(batch_id)
+                self.report_launch(results, label)
+
+        if self._active_batches:
+            self.after(LAUNCH_POLL_MS, self._drain_launch_queue)
+        else:
+            self._polling_launches = False
+
+    def _set_progress_row(self, batch_id: int, path: str, state: str, result):
+        if self._idle:
+            return  # launched from the tray or a hotkey with the widgets torn down
+        row_id = f"{batch_id}:{path}"
+        if state == FAILED and result is not None:
+            state_text = f"{state}: {result.error}"
+        else:
+            state_text = state
+        elapsed = f"{result.elapsed:.2f}s" if result is not None else ""
+        values = (Path(path).name, state_text, elapsed)
+        if self.progress_tree.exists(row_id):
+            self.progress_tree.item(row_id, values=values)
+        else:
+            self.progress_tree.insert("", "end", iid=row_id, values=values)
+        if state in (STARTED, FAILED, SKIPPED):
+            self.progress_tree.see(row_id)
+
+    def report_launch(self, results, label: str):
+        """Summarize a finished batch: status bar for the counts, and a single
+        error dialog listing every failure (shown only after all launches have
+        been fired, so it never holds up the rest of the batch). While the
+        window is in the tray (a hotkey or tray launch) failures are a tray
+        notification instead: a modal dialog there would pop up on its own
+        and wait for a click."""
+        failed = [r for r in results if not r.success]
+        skipped = sum(1 for r in results if r.skipped)
+        started = len(results) - len(failed) - skipped
+        slowest = max((r.elapsed for r in results), default=0.0)
+        status = f"Launched {started}/{len(results)} app(s) from {label} (slowest {slowest:.2f}s)"
+        if skipped:
+            status += f", {skipped} already running"
+        self.set_status(status)
+        if not failed:
             return
-
-        # Insert back into category
-        apps = self.config_manager.categories.get(cat, [])
-        apps.append(path)
-        self.config_manager.save()
-
-        # Remove from trash
-        self.trash = [
-            t for t in self.trash
-            if not (t[0] == cat and t[1] == name and t[2] == path)
-        ]
-
-        # Update trash window
-        tree.delete(row_id)
+        if self.tray_icon is not None and (self._idle or not self.winfo_viewable()):
+            names = ", ".join(Path(r.path).name for r in failed[:NOTIFY_FAILURES])
+            if len(failed) > NOTIFY_FAILURES:
+                names += f" and {len(failed) - NOTIFY_FAILURES} more"
+            if self.tray_icon.notify(f"Could not launch {names} from {label}", "Launch Error"):
+                return
+        lines = "\n".join(f"{r.path}\n    {r.error}" for r in failed)
+        messagebox.showerror("Launch Error", f"Could not launch {len(failed)} app(s):\n\n{lines}")
+
+    def restore_from_trash(self, cat: str, entry) -> bool:
+        """Called from the Trash window for the app picked there."""
+        # Insert back into category (this also takes it out of the Trash)
+        if not self.config_manager.insert_app_into_category(cat, entry):
+            messagebox.showinfo(
+                "Info", f"Could not restore to '{cat}': the category is gone or already has this app.",
+                parent=self.trash_window
+            )
+            return False
+        self._update_undo_button()
 
         # Refresh main UI if needed
         if self.current_category == cat:
             self.load_apps(cat)
 
-        self.set_status(f"Restored: {name}")
+        self.set_status(f"Restored: {entry_name(entry)}")
+        return True
 
     # Profile actions
 
@@ -424,8 +758,7 @@ class LauncherUI(tb.Window):
         if not apps:
             messagebox.showinfo("Info", f"Profile '{name}' has no categories with apps assigned.")
             return
-        self.launcher.launch_list(apps)
-        self.set_status(f"Launched profile '{name}' ({len(apps)} app(s))")
+        self.start_launch(apps, f"profile '{name}'", profile=name)
 
     def new_profile(self):
         name = simpledialog.askstring("New Profile", "Enter new profile name:", parent=self)
@@ -473,44 +806,215 @@ class LauncherUI(tb.Window):
         if not name:
             messagebox.showinfo("Info", "Please select a profile first.")
             return
+        if self.profile_editor is None:
+            self.profile_editor = ProfileEditor(self, self.config_manager, self._save_profile)
+        self.profile_editor.show(name)
 
-        all_cats = list(self.config_manager.categories.keys())
-        current = set(self.config_manager.profiles.get(name, []))
-
-        win = tb.Toplevel(self)
-        win.title(f"Edit Profile: {name}")
-        win.geometry("300x400")
-
-        tb.Label(win, text=f"Select categories for '{name}':").pack(pady=(10, 5))
-
-        vars_by_cat = {}
-        check_frame = tb.Frame(win)
-        check_frame.pack(fill=BOTH, expand=True, padx=15)
-        for cat in all_cats:
-            var = tb.BooleanVar(value=(cat in current))
-            vars_by_cat[cat] = var
-            tb.Checkbutton(check_frame, text=cat, variable=var, bootstyle="round-toggle").pack(anchor=W, pady=2)
-
-        def save_and_close():
-            selected = [c for c, v in vars_by_cat.items() if v.get()]
-            self.config_manager.set_profile_categories(name, selected)
-            self.set_status(f"Updated profile '{name}' ({len(selected)} categor{'y' if len(selected) == 1 else 'ies'})")
-            win.destroy()
-
-        btn_frame = tb.Frame(win)
-        btn_frame.pack(pady=10)
-        tb.Button(btn_frame, text="Save", command=save_and_close, bootstyle=SUCCESS).grid(row=0, column=0, padx=5)
-        tb.Button(btn_frame, text="Cancel", command=win.destroy, bootstyle=SECONDARY).grid(row=0, column=1, padx=5)
+    def _save_profile(self, name: str, selected):
+        self.config_manager.set_profile_categories(name, selected)
+        self.set_status(f"Updated profile '{name}' ({len(selected)} categor{'y' if len(selected) == 1 else 'ies'})")
 
     # Tray / hotkey / window lifecycle
 
     def _register_hotkey(self, combo: str):
-        """(Re)register the global show-window hotkey. The hotkey fires on a
+        """(Re)register the global quick-launch hotkey. The hotkey fires on a
         background thread, so it schedules the actual UI work via self.after(0, ...)
         rather than touching widgets directly."""
-        ok = self.hotkey_manager.register(combo, lambda: self.after(0, self.restore_from_tray))
+        ok = self.hotkey_manager.register(
+            combo, lambda: self.after(0, self.toggle_palette), self.config_manager.get_hotkey_debounce()
+        )
         return ok
 
+    def _register_launch_hotkeys(self) -> list:
+        """(Re)bind every launch hotkey in settings["hotkeys"]. Returns the
+        combos that couldn't be registered."""
+        self.hotkey_manager.clear()
+        debounce = self.config_manager.get_hotkey_debounce()
+        failed = [
+            combo for combo in self.config_manager.get_launch_hotkeys()
+            if not self.hotkey_manager.add(combo, lambda c=combo: self._launch_from_snapshot(c), debounce)
+        ]
+        self._snapshot_launch_targets()
+        return failed
+
+    def _resolve_launch_target(self, kind: str, name: str):
+        """(entries, label, profile) for a profile, a category or an app path."""
+        config = self.config_manager
+        if kind == "profile":
+            entries = list(config.get_profile_apps(name)) if name in config.profiles else []
+            return entries, f"profile '{name}'", name
+        if kind == "category":
+            return list(config.categories.get(name, ())), f"'{name}'", None
+        # The entry (with its args) from the first category that has it, or
+        # just the path if it's no longer in any
+        categories = config.categories_with_app(name)
+        first = next((c for c in config.categories if c in categories), None)
+        apps = config.categories[first] if first is not None else ()
+        return [next((e for e in apps if entry_path(e) == name), name)], name, None
+
+    def _snapshot_launch_targets(self):
+        """Tk thread: resolve what every launch hotkey launches, so a press
+        can start it without reading the config (or waiting for Tk). Tray
+        menu entries are resolved when first picked (see _launch_resolved),
+        so this doesn't read every category. Also brings the tray's submenus
+        up to date."""
+        self._snapshot_pending = False
+        config = self.config_manager
+        targets = {}
+        for combo, target in config.get_launch_hotkeys().items():
+            (kind, name), = target.items()
+            targets[combo] = self._resolve_launch_target(kind, name)
+        if self.tray_icon is not None:
+            self.tray_icon.set_launch_targets(config.profiles, config.categories)
+        rules = {p: dict(r) for p, r in config.launch_rules.items()}
+        self._launch_snapshot = (config.revision, targets, rules, config.get_skip_running())
+
+    def _refresh_launch_targets(self):
+        """Config listener: rebuild the snapshot once the Tk thread is idle,
+        once for however many edits, loads and reloads came before that."""
+        if self._launch_snapshot[0] == -1 or self._snapshot_pending:
+            return
+        self._snapshot_pending = True
+        self.after_idle(self._snapshot_launch_targets)
+
+    def _launch_from_snapshot(self, key):
+        """Keyboard or tray thread: `key` is a hotkey combo or a tray menu's
+        (kind, name). With the snapshot current the batch goes straight to
+        the launch executor, whatever the Tk thread is doing. A press
+        before the first paint, between an edit and the rebuild it
+        schedules, or on a tray entry not resolved yet waits for Tk."""
+        revision, targets, rules, skip_running = self._launch_snapshot
+        target = targets.get(key)
+        if revision != self.config_manager.revision or (target is None and isinstance(key, tuple)):
+            self._call_on_tk(lambda: self._launch_resolved(key))
+            return
+        if not target or not target[0]:
+            return  # its profile/category is gone or empty
+        entries, label, profile = target
+        self._submit_launch(entries, label, profile, rules, skip_running)
+        self._call_on_tk(self._poll_launches)
+
+    def _launch_resolved(self, key):
+        """Tk thread: bring the snapshot up to date and resolve `key` into
+        it if it's a tray entry, then launch it."""
+        if self._launch_snapshot[0] != self.config_manager.revision:
+            self._snapshot_launch_targets()
+        targets = self._launch_snapshot[1]
+        if isinstance(key, tuple) and key not in targets:
+            targets[key] = self._resolve_launch_target(*key)
+        self._launch_from_snapshot(key)
+
+    def _call_on_tk(self, callback):
+        """self.after(0, callback) without waiting: from another thread, a
+        Tk call blocks until the event loop gets to it, so a short-lived
+        thread makes it instead of the caller."""
+        def call():
+            try:
+                self.after(0, callback)
+            except Exception:
+                pass  # the window is gone (quitting)
+        threading.Thread(target=call, daemon=True).start()
+
+    def edit_launch_hotkeys(self):
+        """List, add and remove the hotkeys that launch a profile, category
+        or app directly."""
+        config = self.config_manager
+        win = tb.Toplevel(self)
+        win.title("Launch Shortcuts")
+        win.geometry("600x380")
+
+        tree = tb.Treeview(win, columns=("combo", "kind", "target"), show="headings", height=8)
+        tree.heading("combo", text="Shortcut")
+        tree.heading("kind", text="Launches")
+        tree.heading("target", text="Name / Path")
+        tree.column("combo", width=130, anchor=W)
+        tree.column("kind", width=90, anchor=W)
+        tree.column("target", width=340, anchor=W)
+        tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+
+        def fill():
+            tree.delete(*tree.get_children())
+            for combo, target in sorted(config.get_launch_hotkeys().items()):
+                (kind, name), = target.items()
+                tree.insert("", "end", iid=combo, values=(combo, kind, name))
+
+        def targets_for(kind):
+            if kind == "profile":
+                return list(config.profiles)
+            if kind == "category":
+                return list(config.categories)
+            return sorted(config.all_app_paths())
+
+        form = tb.Frame(win)
+        form.pack(fill=X, padx=10)
+        combo_var = tb.StringVar()
+        kind_var = tb.StringVar(value=HOTKEY_TARGETS[0])
+        target_var = tb.StringVar()
+        tb.Entry(form, textvariable=combo_var, width=16).pack(side=LEFT)
+        kind_box = tb.Combobox(form, textvariable=kind_var, values=HOTKEY_TARGETS, state="readonly", width=9)
+        kind_box.pack(side=LEFT, padx=5)
+        target_box = tb.Combobox(form, textvariable=target_var, values=targets_for(kind_var.get()), width=36)
+        target_box.pack(side=LEFT, fill=X, expand=True)
+
+        def on_kind(event=None):
+            target_var.set("")
+            target_box["values"] = targets_for(kind_var.get())
+        kind_box.bind("<<ComboboxSelected>>", on_kind)
+
+        def rebind(status):
+            failed = self._register_launch_hotkeys()
+            fill()
+            if failed:
+                messagebox.showerror(
+                    "Invalid Shortcut",
+                    f"Could not register {', '.join(failed)}. It may be invalid or already in use by another app.",
+                    parent=win
+                )
+            self.set_status(status)
+
+        def add():
+            combo = combo_var.get().strip().lower()
+            if not config.set_launch_hotkey(combo, kind_var.get(), target_var.get()):
+                messagebox.showinfo(
+                    "Info", "Enter a key combo (e.g. ctrl+alt+1) other than the quick-launch one, and pick what it launches.",
+                    parent=win
+                )
+                return
+            combo_var.set("")
+            rebind(f"'{combo}' now launches {kind_var.get()} '{target_var.get()}'")
+
+        def remove():
+            sel = tree.selection()
+            if sel and config.remove_launch_hotkey(sel[0]):
+                rebind(f"Removed shortcut '{sel[0]}'")
+
+        btn_frame = tb.Frame(win)
+        btn_frame.pack(pady=10)
+        tb.Button(btn_frame, text="Add", command=add, bootstyle=SUCCESS).grid(row=0, column=0, padx=5)
+        tb.Button(btn_frame, text="Remove", command=remove, bootstyle=DANGER).grid(row=0, column=1, padx=5)
+        tb.Button(btn_frame, text="Close", command=win.destroy, bootstyle=SECONDARY).grid(row=0, column=2, padx=5)
+        fill()
+
+    def _build_palette(self):
+        if self.palette is None:
+            self.palette = QuickPalette(self, self.config_manager, self.frecency, self._on_palette_pick)
+
+    def toggle_palette(self):
+        self._build_palette()  # in case the hotkey beat the start-up build
+        self.palette.toggle()
+
+    def _on_palette_pick(self, kind: str, value):
+        if kind == "app":
+            self.start_launch([value], entry_path(value))
+        elif kind == "profile":
+            apps = self.config_manager.get_profile_apps(value)
+            if apps:
+                self.start_launch(apps, f"profile '{value}'", profile=value)
+            else:
+                self.set_status(f"Profile '{value}' has no categories with apps assigned.")
+        else:
+            self.restore_from_tray()
+
     def change_hotkey(self):
         current = self.config_manager.get_hotkey()
         new_combo = simpledialog.askstring(
@@ -530,28 +1034,189 @@ class LauncherUI(tb.Window):
             self._register_hotkey(current)  # restore the old one
             return
         self.config_manager.set_hotkey(new_combo)
-        self.hotkey_label_var.set(f"Show shortcut: {new_combo}")
+        self.hotkey_label_var.set(f"Quick launch: {new_combo}")
         self.set_status(f"Shortcut changed to '{new_combo}'")
 
     def minimize_to_tray(self):
         """Called when the window's X button is clicked. Hides the window and
         starts the tray icon (if not already running) instead of quitting."""
         self.withdraw()
+        if self.tray_icon is None:
+            self.tray_icon = TrayIcon(
+                app_name="App Launcher",
+                on_show=lambda: self.after(0, self.restore_from_tray),
+                on_exit=lambda: self._call_on_tk(self.quit_app),
+                on_launch=lambda kind, name: self._launch_from_snapshot((kind, name)),
+            )
+            self._snapshot_launch_targets()
         self.tray_icon.start()
         self.set_status("Minimized to tray")
+        delay = self.config_manager.get_idle_teardown()
+        if delay and self._idle_timer is None and not self._idle:
+            self._idle_timer = self.after(int(delay * 1000), self._enter_idle)
 
     def restore_from_tray(self):
-        """Called from the tray menu ('Show') or the global hotkey. Safe to call
+        """Called from the tray menu ('Show') or the quick-launch palette. Safe to call
         even if the window is already visible."""
+        if self._idle_timer is not None:
+            self.after_cancel(self._idle_timer)
+            self._idle_timer = None
+        if self._idle:
+            self._leave_idle()
         self.deiconify()
         self.lift()
         self.attributes("-topmost", True)
         self.after(100, lambda: self.attributes("-topmost", False))  # pop to front, then stop force-pinning
         self.focus_force()
 
+    def _enter_idle(self):
+        """Hidden in the tray for a while: destroy the window's widgets (with
+        any dialogs open on it) and drop what only the window needs — the
+        search index, resolved profiles, the launch stats — leaving the
+        config, the launch machinery and the palette for the tray and
+        hotkeys. Then hand the freed memory back to the OS. restore_from_tray
+        builds it all again."""
+        self._idle_timer = None
+        if self._idle or self.winfo_viewable():
+            return
+        before = rss_bytes()
+        for child in self.winfo_children():
+            if child is not self.palette:
+                child.destroy()
+        self.app_list = self.tooltip = None
+        self.trash_window = self.profile_editor = None
+        self.current_category = None
+        self._search_hits = []
+        self.config_manager.drop_caches()
+        self.launch_stats.unload()
+        self._idle = True
+        release_memory()
+        self._idle_memory = (before, rss_bytes())
+
+    def _leave_idle(self):
+        self._idle = False
+        self.create_widgets()
+        self.populate_categories()
+        self.populate_profiles()
+        self._update_undo_button()
+
+    # External config changes
+
+    def _start_config_watcher(self):
+        self.config_watcher.start()
+        self._on_config_file_changed()  # anything written before it started
+
+    def _on_config_file_changed(self):
+        """The config changed on disk: reload it (merging our own unsaved
+        edits) and patch only what the change touched (combobox values, the
+        visible rows, settings)."""
+        if not self.config_manager.changed_on_disk():
+            return  # our own write
+        try:
+            diff = self.config_manager.reload()
+        except (OSError, ValueError) as e:
+            # Caught mid-write, or not valid JSON (yet): keep what we have
+            self.set_status(f"config.json changed but couldn't be read: {e}")
+            return
+        if not diff:
+            return
+
+        if "hotkey" in diff.settings_changed or "hotkey_debounce_ms" in diff.settings_changed:
+            combo = self.config_manager.get_hotkey()
+            if self._register_hotkey(combo):
+                self.hotkey_label_var.set(f"Quick launch: {combo}")
+        if "hotkeys" in diff.settings_changed or "hotkey_debounce_ms" in diff.settings_changed:
+            self._register_launch_hotkeys()
+        if self.palette is not None and self.palette.winfo_viewable():
+            self.palette.refresh()
+        if self._idle:
+            return  # no widgets to patch; restoring builds them from the new config
+
+        if diff.categories_added or diff.categories_removed or diff.category_order_changed:
+            cats = list(self.config_manager.categories.keys())
+            self.category_combo["values"] = cats
+            if self.current_category not in cats:
+                self.populate_categories()
+        if self.current_category in diff.categories_changed:
+            self.app_list.sync(self.config_manager.categories.get(self.current_category, []))
+        if diff.profiles_changed or diff.categories_removed:
+            self.populate_profiles()
+        if "skip_running" in diff.settings_changed:
+            self.skip_running_var.set(self.config_manager.get_skip_running())
+        self._update_undo_button()
+        if self.search_var.get().strip():
+            self.on_search()
+        dropped = len(self.config_manager.merge_conflicts)
+        if dropped:
+            self.set_status(f"Reloaded the config (changed outside the launcher); "
+                            f"{dropped} of your edits no longer applied and were dropped")
+        else:
+            self.set_status("Reloaded the config (changed outside the launcher)")
+
+    # Single-instance commands
+
+    def _on_instance_command(self, message):
+        """Runs on the instance server's thread: hand the command to the Tk
+        thread via self.after(0, ...) and wait there for its reply."""
+        replies = queue.Queue(maxsize=1)
+
+        def on_tk_thread():
+            try:
+                replies.put(self._run_instance_command(message))
+            except Exception as e:
+                replies.put({"ok": False, "error": str(e)})
+
+        self.after(0, on_tk_thread)
+        try:
+            return replies.get(timeout=INSTANCE_REPLY_TIMEOUT)
+        except queue.Empty:
+            return {"ok": False, "error": "The launcher window is busy", "reason": "timeout"}
+
+    def _run_instance_command(self, message):
+        cmd = message.get("cmd")
+        if cmd == "show":
+            self.restore_from_tray()
+            return {"ok": True}
+        if cmd == "memory":
+            report = memory_report()
+            report["idle"] = self._idle
+            if self._idle_memory is not None:
+                report["idle_rss_before"], report["idle_rss_after"] = self._idle_memory
+            return {"ok": True, "report": report}
+        if cmd != "run":
+            return {"ok": False, "error": f"Unknown command: {cmd}", "reason": "unknown"}
+
+        profile = message.get("profile")
+        if profile is not None:
+            if profile not in self.config_manager.profiles:
+                return {"ok": False, "error": f"Unknown profile: {profile}", "reason": "unknown"}
+            entries = self.config_manager.get_profile_apps(profile)
+            label = f"profile '{profile}'"
+        else:
+            category = message.get("category")
+            if category not in self.config_manager.categories:
+                return {"ok": False, "error": f"Unknown category: {category}", "reason": "unknown"}
+            entries = self.config_manager.categories[category]
+            label = f"'{category}'"
+        if not entries:
+            return {"ok": False, "error": f"Nothing to launch in {label}.", "reason": "empty"}
+
+        self.start_launch(entries, label, profile=profile, skip_running=message.get("skip_running"))
+        return {"ok": True, "count": len(entries), "label": label}
+
     def quit_app(self):
-        """Called from the tray menu ('Exit'). Cleanly tears down the hotkey
-        listener and tray icon before actually closing the app."""
+        """The tray menu's 'Exit', marshalled onto the Tk thread: flush()
+        can merge another process's edits into the config, which only this
+        thread may change. Cleanly tears down the hotkey listener, instance
+        channel and config writes, then the tray icon, before actually
+        closing the app."""
         self.hotkey_manager.unregister()
-        self.tray_icon.stop()
+        self.hotkey_manager.clear()
+        if self.instance_server is not None:
+            self.instance_server.stop()
+        self.config_watcher.stop()
+        self.config_manager.flush()
+        if self.tray_icon is not None:
+            self.tray_icon.stop()
+        self._launch_executor.shutdown(wait=False)
         self.after(0, self.destroy)
\ No newline at end of file
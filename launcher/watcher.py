@@ -0,0 +1,130 @@
+"""
+Watch the config files (config.json, the journal) for changes made by other
+programs.
+
+On Linux this uses inotify (through ctypes, no extra dependency) on the
+files' folder — saving through a temp file + rename replaces a file's
+inode, so watching the file itself would go quiet after the first such
+save. Everywhere else, or if inotify isn't available, each file's
+(mtime, size, inode) is polled once a second.
+
+The callback runs on the watcher's own thread and only means "the config
+may have changed"; the receiver decides whether it really did (Config
+ignores its own writes, see Config.changed_on_disk) and must get back onto
+the Tk thread itself before touching widgets.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+
+POLL_INTERVAL = 1.0
+# Editors and scripts often save in several steps; report once they settle
+SETTLE_DELAY = 0.2
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class _Inotify:
+    def __init__(self, folder: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, "inotify_add_watch failed")
+
+    def names(self, timeout: float):
+        """File names with events in the folder, waiting up to `timeout`."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        names, pos = [], 0
+        while pos + _EVENT.size <= len(data):
+            _, _, _, length = _EVENT.unpack_from(data, pos)
+            pos += _EVENT.size
+            names.append(os.fsdecode(data[pos:pos + length].rstrip(b"\0")))
+            pos += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FileWatcher:
+    def __init__(self, paths, callback, interval: float = POLL_INTERVAL):
+        # All in one folder (they're the files next to config.json)
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._inotify = None
+        self.backend = "poll"
+
+    def start(self):
+        if self._thread is not None:
+            return
+        if sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify(os.path.dirname(self.paths[0]))
+                self.backend = "inotify"
+            except (OSError, AttributeError):
+                self._inotify = None  # no inotify (old libc, sandbox): poll instead
+        target = self._run_inotify if self._inotify else self._run_poll
+        self._thread = threading.Thread(target=target, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _run_inotify(self):
+        names = {os.path.basename(p) for p in self.paths}
+        while not self._stop.is_set():
+            if names.isdisjoint(self._inotify.names(self.interval)):
+                continue
+            # Swallow the rest of this save's events before reporting it
+            while not names.isdisjoint(self._inotify.names(SETTLE_DELAY)):
+                pass
+            if not self._stop.is_set():
+                self.callback()
+
+    def _run_poll(self):
+        last = [_signature(p) for p in self.paths]
+        while not self._stop.wait(self.interval):
+            current = [_signature(p) for p in self.paths]
+            if current != last:
+                last = current
+                self.callback()
@@ -1,13 +1,18 @@
 import argparse
-import subprocess
 import json
 import os
+import sys
 
-def start_app(command): 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "launcher"))
+from appentry import compile_entry, entry_path
+from boot import build_items, scheduler_from_settings
+
+def start_app(entry): 
+    # Compiled once into an argv/env/cwd vector and started without a shell
     try: 
-        subprocess.Popen(command, shell=True) 
-    except FileNotFoundError: 
-        print(f"Could not find the application: {command}")
+        return compile_entry(entry).spawn()
+    except OSError: 
+        print(f"Could not find the application: {entry_path(entry)}")
         
 def load_config(config_path):
     if not os.path.exists(config_path):        
@@ -19,6 +24,8 @@ def load_config(config_path):
 def main():
     parser = argparse.ArgumentParser(description="A simple CLI application that starts specific apps based on your plan.")
     parser.add_argument('--startup', action='store_true', help='Run this application at startup.')
+    parser.add_argument('--max-concurrent', type=int, help='With --startup: how many apps may be starting at once.')
+    parser.add_argument('--no-gate', action='store_true', help='With --startup: do not wait for system load to drop between launches.')
     args = parser.parse_args()
 
     if args.startup:
@@ -26,7 +33,12 @@ def main():
 
     # config_path = 'C:/Users/Nathan/Documents/GitHub/BootUpSoftware/src/config.json'
     config_path = os.path.join(os.path.dirname(__file__), 'config.json')
-    categories = load_config(config_path)
+    config = load_config(config_path)
+    boot_settings = dict(config.get("settings", {}).get("boot", {}))
+    if args.max_concurrent:
+        boot_settings["max_concurrent"] = args.max_concurrent
+    # Only list-valued keys are categories ("profiles"/"settings" are not)
+    categories = {k: v for k, v in config.items() if isinstance(v, list)}
 
     if not categories:
         print("No categories found in the configuration file.")
@@ -55,9 +67,19 @@ def main():
     print(f"Starting applications for: {', '.join(valid_categories)}") 
     
     # Start applications for each category
-    for chosen_category in valid_categories: 
-        for app in categories[chosen_category]:
-            start_app(app)
+    if args.startup:
+        # Stagger login launches instead of starting everything at once
+        apps = []
+        for chosen_category in valid_categories:
+            seen = {entry_path(app) for app in apps}
+            apps.extend(app for app in categories[chosen_category] if entry_path(app) not in seen)
+        scheduler = scheduler_from_settings(start_app, boot_settings, gate_enabled=False if args.no_gate else None)
+        for app, offset, error in scheduler.run(build_items(apps, boot_settings)):
+            print(f"[{offset:6.2f}s] {entry_path(app)}" + (f" ({error})" if error else ""))
+    else:
+        for chosen_category in valid_categories: 
+            for app in categories[chosen_category]:
+                start_app(app)
     
     # Last prompt to keep terminal running
     input("Press Enter to exit...")
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# The launcher's modules import each other by bare name (see test.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "launcher"))
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    """config.json in a temp folder; Config() then keeps its journal, lock
+    and database there too."""
+    import config
+
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(config, "CONFIG_PATH", path)
+    return path
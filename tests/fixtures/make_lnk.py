@@ -0,0 +1,129 @@
+"""
+Writes the .lnk fixtures in tests/fixtures/lnk/, laid out per [MS-SHLLINK]:
+
+    python tests/fixtures/make_lnk.py
+
+The files are committed; this only documents (and can regenerate) them.
+"""
+import os
+import struct
+
+LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+HAS_LINK_TARGET_ID_LIST = 0x01
+HAS_LINK_INFO = 0x02
+HAS_NAME = 0x04
+HAS_RELATIVE_PATH = 0x08
+HAS_WORKING_DIR = 0x10
+HAS_ARGUMENTS = 0x20
+HAS_ICON_LOCATION = 0x40
+IS_UNICODE = 0x80
+HERE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lnk")
+
+
+def header(flags: int) -> bytes:
+    return struct.pack(
+        "<I16sII3QIiIHHII",
+        0x4C, LINK_CLSID, flags, 0x20,  # FILE_ATTRIBUTE_ARCHIVE
+        0x01D9F0A1B2C3D4E5, 0x01D9F0A1B2C3D4E5, 0x01D9F0A1B2C3D4E5,
+        4096, 0, 1, 0, 0, 0, 0,  # size, icon index, SW_SHOWNORMAL, no hotkey
+    )
+
+
+def id_list() -> bytes:
+    item = b"\x1f\x50" + bytes(16)  # a root-folder item; the parser skips the list
+    items = struct.pack("<H", len(item) + 2) + item + b"\0\0"
+    return struct.pack("<H", len(items)) + items
+
+
+def volume_id() -> bytes:
+    label = b"SYSTEM\0"
+    return struct.pack("<4I", 0x10 + len(label), 3, 0x1234ABCD, 0x10) + label
+
+
+def link_info_local(base: str, suffix: str = "", unicode: bool = False) -> bytes:
+    header_size = 0x24 if unicode else 0x1C
+    vol = volume_id()
+    base_a = base.encode("cp1252", errors="replace") + b"\0"
+    suffix_a = suffix.encode("cp1252", errors="replace") + b"\0"
+    vol_off = header_size
+    base_off = vol_off + len(vol)
+    suffix_off = base_off + len(base_a)
+    body = vol + base_a + suffix_a
+    extra = b""
+    if unicode:
+        base_u = base.encode("utf-16-le") + b"\0\0"
+        suffix_u = suffix.encode("utf-16-le") + b"\0\0"
+        base_u_off = suffix_off + len(suffix_a)
+        suffix_u_off = base_u_off + len(base_u)
+        extra = struct.pack("<2I", base_u_off, suffix_u_off)
+        body += base_u + suffix_u
+    size = header_size + len(body)
+    return struct.pack("<7I", size, header_size, 0x1, vol_off, base_off, 0, suffix_off) + extra + body
+
+
+def link_info_network(share: str, suffix: str) -> bytes:
+    net_name = share.encode("cp1252") + b"\0"
+    net = struct.pack("<5I", 0x14 + len(net_name), 0x2, 0x14, 0, 0x00020000) + net_name
+    suffix_a = suffix.encode("cp1252") + b"\0"
+    net_off = 0x1C
+    suffix_off = net_off + len(net)
+    size = suffix_off + len(suffix_a)
+    return struct.pack("<7I", size, 0x1C, 0x2, 0, 0, net_off, suffix_off) + net + suffix_a
+
+
+def string(value: str, unicode: bool) -> bytes:
+    raw = value.encode("utf-16-le" if unicode else "cp1252")
+    return struct.pack("<H", len(value)) + raw
+
+
+def env_block(target: str) -> bytes:
+    ansi = target.encode("cp1252").ljust(260, b"\0")
+    wide = target.encode("utf-16-le").ljust(520, b"\0")
+    return struct.pack("<2I", 8 + 260 + 520, 0xA0000001) + ansi + wide
+
+
+def build(flags: int, info: bytes = b"", strings=(), extra: bytes = b"") -> bytes:
+    unicode = bool(flags & IS_UNICODE)
+    data = header(flags)
+    if flags & HAS_LINK_TARGET_ID_LIST:
+        data += id_list()
+    if flags & HAS_LINK_INFO:
+        data += info
+    for value in strings:  # in StringData order: name, relative path, working dir, arguments, icon
+        data += string(value, unicode)
+    return data + extra + b"\0\0\0\0"  # TerminalBlock
+
+
+FIXTURES = {
+    # Local target with a description, working directory and icon (ANSI)
+    "local.lnk": build(
+        HAS_LINK_TARGET_ID_LIST | HAS_LINK_INFO | HAS_NAME | HAS_WORKING_DIR | HAS_ICON_LOCATION,
+        link_info_local("C:\\Program Files\\Tool\\", "tool.exe"),
+        ["Tool", "C:\\Program Files\\Tool", "C:\\Program Files\\Tool\\tool.ico"],
+    ),
+    # Only a path relative to the shortcut's own folder
+    "relative.lnk": build(HAS_RELATIVE_PATH | IS_UNICODE, strings=["..\\bin\\app.exe"]),
+    # Unicode LinkInfo and StringData
+    "unicode.lnk": build(
+        HAS_LINK_INFO | HAS_NAME | HAS_ARGUMENTS | IS_UNICODE,
+        link_info_local("C:\\Werkzeuge\\Größe\\工具.exe", unicode=True),
+        ["Größe — 工具", "--titel \"Grüße\""],
+    ),
+    # Arguments and a working directory
+    "args.lnk": build(
+        HAS_LINK_INFO | HAS_WORKING_DIR | HAS_ARGUMENTS | IS_UNICODE,
+        link_info_local("C:\\Apps\\editor.exe"),
+        ["D:\\Projects", "--profile \"My Work\" -n"],
+    ),
+    # No LinkInfo: the target only comes from the EnvironmentVariableDataBlock
+    "envblock.lnk": build(IS_UNICODE, extra=env_block("%LNK_TEST_TOOLS%\\envtool.exe")),
+    # Target on a network share
+    "network.lnk": build(HAS_LINK_INFO, link_info_network("\\\\fileserver\\apps", "tools\\net.exe")),
+}
+
+
+if __name__ == "__main__":
+    os.makedirs(HERE, exist_ok=True)
+    for name, data in FIXTURES.items():
+        with open(os.path.join(HERE, name), "wb") as f:
+            f.write(data)
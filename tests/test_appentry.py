@@ -0,0 +1,52 @@
+import os
+import sys
+
+from appentry import clear_compiled, compile_entry, entry_name, entry_path, expand, is_valid_entry
+
+
+def test_entry_path_and_name():
+    assert entry_path("C:/Apps/tool.exe") == "C:/Apps/tool.exe"
+    assert entry_path({"path": "C:/Apps/tool.exe", "args": ["-x"]}) == "C:/Apps/tool.exe"
+    assert entry_name("C:\\Apps\\tool.exe") == "tool.exe"
+    assert entry_name({"path": "C:/Apps/tool.exe", "name": "Tool"}) == "Tool"
+
+
+def test_is_valid_entry():
+    assert is_valid_entry("C:/a.exe")
+    assert is_valid_entry({"path": "C:/a.exe", "args": [], "env": {}, "cwd": ""})
+    assert not is_valid_entry("")
+    assert not is_valid_entry({"args": []})
+    assert not is_valid_entry({"path": "C:/a.exe", "args": "-x"})
+    assert not is_valid_entry({"path": "C:/a.exe", "env": []})
+    assert not is_valid_entry({"path": "C:/a.exe", "cwd": 3})
+
+
+def test_expand_all_three_forms():
+    env = {"HOME": "/home/me", "APP": "tool"}
+    assert expand("%HOME%/$APP/${APP}.cfg", env) == "/home/me/tool/tool.cfg"
+    assert expand("%NOPE%/$NOPE", env) == "%NOPE%/$NOPE"
+
+
+def test_compile_entry_expands_and_caches(monkeypatch, tmp_path):
+    clear_compiled()
+    monkeypatch.setenv("APPENTRY_TEST_DIR", str(tmp_path))
+    entry = {
+        "path": sys.executable,
+        "args": ["--profile", "%APPENTRY_TEST_NAME%"],
+        "env": {"APPENTRY_TEST_NAME": "work", "APPENTRY_TEST_HOME": "$APPENTRY_TEST_DIR/home"},
+        "cwd": "${APPENTRY_TEST_DIR}",
+    }
+    vector = compile_entry(entry)
+    assert vector.argv == [sys.executable, "--profile", "work"]
+    assert vector.env["APPENTRY_TEST_HOME"] == f"{tmp_path}/home"  # env overrides see each other
+    assert vector.cwd == str(tmp_path)
+    assert vector.exists()
+    assert compile_entry(dict(entry)) is vector  # same contents, same vector
+    assert compile_entry(sys.executable).env is None  # plain path: inherit everything
+
+
+def test_bare_command_is_looked_up_on_path(monkeypatch):
+    clear_compiled()
+    monkeypatch.setenv("PATH", os.path.dirname(sys.executable))
+    argv = compile_entry({"path": os.path.basename(sys.executable)}).argv
+    assert os.path.samefile(argv[0], sys.executable)
@@ -0,0 +1,162 @@
+import random
+
+import pytest
+
+import applist
+from applist import AppList, _longest_increasing
+
+
+class FakeTree:
+    """The slice of ttk.Treeview AppList uses, counting the calls that
+    touch rows."""
+
+    def __init__(self):
+        self.children = []
+        self.values = {}
+        self.selected = set()
+        self.calls = {"insert": 0, "move": 0, "delete": 0, "item": 0}
+
+    def configure(self, **kwargs):
+        pass
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def insert(self, parent, index, iid, values):
+        assert iid not in self.values
+        self.calls["insert"] += 1
+        self.values[iid] = values
+        self.children.insert(index, iid)
+
+    def move(self, iid, parent, index):
+        self.calls["move"] += 1
+        if iid in self.children:
+            self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def detach(self, *iids):
+        for iid in iids:
+            self.children.remove(iid)
+            self.selected.discard(iid)
+
+    def delete(self, *iids):
+        self.calls["delete"] += len(iids)
+        for iid in iids:
+            self.children.remove(iid)
+            del self.values[iid]
+            self.selected.discard(iid)
+
+    def item(self, iid, values):
+        self.calls["item"] += 1
+        self.values[iid] = values
+
+    def selection(self):
+        return tuple(self.selected)
+
+    def selection_add(self, iid):
+        self.selected.add(iid)
+
+    def selection_set(self, iid):
+        self.selected = {iid}
+
+    def see(self, iid):
+        pass
+
+    def yview(self, *args):
+        return (0.0, 1.0)
+
+    def yview_moveto(self, fraction):
+        pass
+
+
+class FakeScrollbar:
+    def configure(self, **kwargs):
+        pass
+
+    def set(self, first, last):
+        pass
+
+
+@pytest.fixture
+def app_list():
+    return AppList(FakeTree(), FakeScrollbar())
+
+
+def shown(app_list):
+    tree = app_list.tree
+    return [tree.values[iid][1] for iid in tree.children]
+
+
+def test_moving_one_row_far_is_one_move(app_list):
+    apps = [f"app{i}" for i in range(500)]
+    app_list.show(apps)
+    tree = app_list.tree
+    tree.calls = dict.fromkeys(tree.calls, 0)
+    apps.insert(0, apps.pop(400))
+    app_list.sync(apps)
+    assert shown(app_list) == apps
+    assert tree.calls == {"insert": 0, "move": 1, "delete": 0, "item": 0}
+
+
+def test_sync_follows_random_edits(app_list):
+    rnd = random.Random(19)
+    apps = [f"app{i}" for i in range(50)]
+    app_list.show(apps)
+    fresh = iter(range(1000, 10000))
+    for _ in range(200):
+        apps = list(apps)
+        for _ in range(rnd.randrange(1, 5)):
+            op = rnd.randrange(3)
+            if op == 0 and apps:
+                apps.pop(rnd.randrange(len(apps)))
+            elif op == 1:
+                apps.insert(rnd.randrange(len(apps) + 1), f"app{next(fresh)}")
+            elif apps:
+                apps.insert(rnd.randrange(len(apps) + 1), apps.pop(rnd.randrange(len(apps))))
+        app_list.sync(apps)
+        assert shown(app_list) == apps
+
+
+def test_renamed_entry_is_updated_in_place(app_list):
+    app_list.show(["a", "b"])
+    app_list.sync(["a", {"path": "b", "name": "Bee"}])
+    assert app_list.tree.values["b"] == ("Bee", "b")
+    assert app_list.tree.calls["move"] == 0
+
+
+def test_moved_selection_stays_selected(app_list):
+    app_list.show(["a", "b", "c"])
+    assert app_list.reveal("a")
+    app_list.sync(["b", "c", "a"])
+    assert shown(app_list) == ["b", "c", "a"]
+    assert app_list.tree.selected == {"a"}
+    assert app_list.selection() == (2, ("a", "a"))
+
+
+def test_duplicate_paths_get_distinct_rows(app_list):
+    app_list.show(["a", "a", "b"])
+    assert shown(app_list) == ["a", "a", "b"]
+
+
+def test_large_category_keeps_one_window_of_rows(app_list):
+    apps = [f"app{i}" for i in range(applist.VIRTUAL_THRESHOLD + 500)]
+    app_list.show(apps)
+    assert app_list.virtual
+    assert shown(app_list) == apps[:applist.WINDOW_SIZE]
+    assert app_list.reveal("app1200")
+    assert "app1200" in shown(app_list)
+    assert len(app_list.tree.children) == applist.WINDOW_SIZE
+
+
+@pytest.mark.parametrize("seq", [[], [3], [3, 1, 2], [5, 4, 3], [0, 8, 4, 12, 2, 10, 6, 14, 1, 9]])
+def test_longest_increasing(seq):
+    picked = sorted(_longest_increasing(seq))
+    values = [seq[k] for k in picked]
+    assert values == sorted(set(values))
+    # brute force: no increasing subsequence is longer
+    best = [1] * len(seq)
+    for k in range(len(seq)):
+        for j in range(k):
+            if seq[j] < seq[k]:
+                best[k] = max(best[k], best[j] + 1)
+    assert len(picked) == max(best, default=0)
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+import boot
+from boot import BootItem, BootScheduler, LoadGate, build_items, scheduler_from_settings
+
+PSI = """some avg10={some} avg60=1.00 avg300=0.50 total=123456
+full avg10=0.00 avg60=0.00 avg300=0.00 total=0
+"""
+
+
+def gate_reading(monkeypatch, files, **kwargs):
+    """A LoadGate on 4 CPUs that reads `files` (path -> text, or None for
+    missing) instead of /proc."""
+    gate = LoadGate(**kwargs)
+    gate._cpus = 4
+    monkeypatch.setattr(gate, "_read", lambda path: files.get(path))
+    return gate
+
+
+class Exited:
+    def poll(self):
+        return 0
+
+
+def test_priority_then_index_once_due():
+    started = []
+    scheduler = BootScheduler(lambda cmd: (started.append(cmd), Exited())[1], max_concurrent=1, settle=0)
+    items = [BootItem("late", priority=0, delay=0.15), BootItem("low", priority=5),
+             BootItem("high", priority=-1), BootItem("also-low", priority=5)]
+    result = scheduler.run(items)
+    assert started == ["high", "low", "also-low", "late"]
+    assert result[-1][0] == "late" and result[-1][1] >= 0.15
+    assert all(error == "" for _, _, error in result)
+
+
+def test_concurrency_cap():
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    class Proc:
+        def __init__(self):
+            self.until = time.monotonic() + 0.1
+
+        def poll(self):
+            if time.monotonic() < self.until:
+                return None
+            with lock:
+                running[0] -= 1
+                self.until = float("-inf")
+            return 0
+
+    def start(cmd):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        return Proc()
+
+    BootScheduler(start, max_concurrent=2, settle=5).run([BootItem(i) for i in range(6)])
+    assert peak[0] == 2
+
+
+def test_failed_spawn_gives_its_slot_back():
+    def start(cmd):
+        if cmd == "bad":
+            raise OSError("not found")
+        return Exited()
+
+    result = BootScheduler(start, max_concurrent=1, settle=5).run([BootItem("bad"), BootItem("good")])
+    assert [(cmd, error) for cmd, _, error in result] == [("bad", "not found"), ("good", "")]
+
+
+def test_load_gate_parses_proc_files(monkeypatch):
+    gate = gate_reading(monkeypatch, {"/proc/loadavg": "2.00 1.50 1.00 3/512 4242\n",
+                                      "/proc/pressure/io": PSI.format(some="12.50")})
+    assert gate.load_per_cpu() == 0.5
+    assert gate.io_pressure() == 12.5
+    assert gate.is_open()
+
+
+@pytest.mark.parametrize("files", [
+    {"/proc/loadavg": "8.00 1.00 1.00 1/1 1\n"},                         # 2 per CPU
+    {"/proc/pressure/io": PSI.format(some="45.00")},
+])
+def test_load_gate_closes_over_either_threshold(monkeypatch, files):
+    assert not gate_reading(monkeypatch, files).is_open()
+
+
+@pytest.mark.parametrize("files", [
+    {},                                                                   # Windows, old kernels
+    {"/proc/loadavg": "", "/proc/pressure/io": ""},
+    {"/proc/loadavg": "garbage", "/proc/pressure/io": "some avg10=x\n"},
+    {"/proc/pressure/io": "full avg10=90.00\n"},
+])
+def test_load_gate_is_open_without_readings(monkeypatch, files):
+    gate = gate_reading(monkeypatch, files)
+    assert gate.is_open()
+    assert gate.wait() < 0.05
+
+
+def test_load_gate_gives_up_after_max_wait(monkeypatch):
+    gate = gate_reading(monkeypatch, {"/proc/loadavg": "99.0 1 1 1/1 1\n"}, max_wait=0.2, poll=0.05)
+    waited = gate.wait()
+    assert 0.2 <= waited < 1.0
+
+
+def test_read_of_a_missing_file():
+    assert LoadGate._read("/no/such/proc/file") is None
+
+
+def test_settings_build_items_and_scheduler():
+    items = build_items(["C:/a.exe", {"path": "C:/b.exe"}],
+                        {"apps": {"C:/b.exe": {"priority": 3, "delay": "1.5"}}})
+    assert [(i.priority, i.delay) for i in items] == [(0, 0.0), (3, 1.5)]
+    scheduler = scheduler_from_settings(print, {"max_concurrent": 3, "max_gate_wait": 2})
+    assert scheduler.max_concurrent == 3 and scheduler.gate.max_wait == 2.0
+    assert scheduler_from_settings(print, {"gate": False}).gate is None
+    assert scheduler_from_settings(print, None).settle == boot.DEFAULT_SETTLE
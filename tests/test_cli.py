@@ -0,0 +1,100 @@
+import json
+import sys
+
+import pytest
+
+import cli
+from cli import EXIT_EMPTY, EXIT_LAUNCH_FAILED, EXIT_OK, EXIT_USAGE
+
+PYTHON = {"path": sys.executable, "args": ["-c", "pass"]}
+
+
+@pytest.fixture
+def no_instance(monkeypatch):
+    """No launcher window running: nothing to forward to."""
+    monkeypatch.setattr(cli, "send_command", lambda message, timeout=None: None)
+
+
+@pytest.fixture
+def write_config(config_path):
+    def write(categories, profiles=None, **extra):
+        config_path.write_text(json.dumps(dict({"categories": categories, "profiles": profiles or {}}, **extra)))
+    return write
+
+
+def test_everything_started(no_instance, write_config):
+    write_config({"tools": [PYTHON]}, {"work": ["tools"]})
+    assert cli.main(["run", "--profile", "work", "--quiet"]) == EXIT_OK
+    assert cli.main(["run", "--category", "tools", "--quiet"]) == EXIT_OK
+
+
+def test_a_failed_app_fails_the_run(no_instance, write_config, capsys):
+    write_config({"tools": [PYTHON, "/no/such/app.bin"]})
+    assert cli.main(["run", "--category", "tools"]) == EXIT_LAUNCH_FAILED
+    assert "FAILED   /no/such/app.bin: File not found" in capsys.readouterr().err
+
+
+def test_unknown_profile_or_category(no_instance, write_config):
+    write_config({"tools": [PYTHON]}, {"work": ["tools"]})
+    assert cli.main(["run", "--profile", "play"]) == EXIT_USAGE
+    assert cli.main(["run", "--category", "games"]) == EXIT_USAGE
+
+
+def test_nothing_to_launch(no_instance, write_config):
+    write_config({"tools": [], "other": [PYTHON]}, {"idle": [], "work": ["tools"]})
+    assert cli.main(["run", "--category", "tools"]) == EXIT_EMPTY
+    assert cli.main(["run", "--profile", "idle"]) == EXIT_EMPTY
+    assert cli.main(["run", "--profile", "work"]) == EXIT_EMPTY
+
+
+def test_dependency_cycle_is_a_usage_error(no_instance, write_config, config_path):
+    a = {"path": sys.executable, "args": ["-c", "pass"]}
+    b = {"path": str(config_path), "args": []}
+    rules = {a["path"]: {"after": [b["path"]]}, b["path"]: {"after": [a["path"]]}}
+    write_config({"tools": [a, b]}, launch_rules=rules)
+    assert cli.main(["run", "--category", "tools", "--local"]) == EXIT_USAGE
+
+
+def test_bad_arguments(no_instance, write_config):
+    write_config({"tools": []})
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["run"])
+    assert exc.value.code == EXIT_USAGE
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["run", "--profile", "a", "--category", "b"])
+    assert exc.value.code == EXIT_USAGE
+
+
+def test_list(no_instance, write_config, capsys):
+    write_config({"tools": [PYTHON]}, {"work": ["tools"]})
+    assert cli.main(["list"]) == EXIT_OK
+    out = capsys.readouterr().out
+    assert "tools (1 app(s))" in out and "work: tools" in out
+
+
+@pytest.mark.parametrize("reply, status", [
+    ({"ok": True, "count": 2, "label": "profile 'work'"}, EXIT_OK),
+    ({"ok": False, "reason": "unknown", "error": "Unknown profile: work"}, EXIT_USAGE),
+    ({"ok": False, "reason": "empty", "error": "Nothing to launch"}, EXIT_EMPTY),
+    ({"ok": False, "error": "busy"}, EXIT_LAUNCH_FAILED),
+])
+def test_forwarded_run(monkeypatch, reply, status):
+    sent = []
+    monkeypatch.setattr(cli, "send_command", lambda message, timeout=None: sent.append(message) or reply)
+    assert cli.main(["run", "--profile", "work", "--skip-running"]) == status
+    assert sent == [{"cmd": "run", "skip_running": True, "profile": "work"}]
+
+
+def test_local_run_is_not_forwarded(monkeypatch, write_config):
+    monkeypatch.setattr(cli, "send_command", lambda message, timeout=None: pytest.fail("forwarded"))
+    write_config({"tools": [PYTHON]})
+    assert cli.main(["run", "--category", "tools", "--local", "--quiet"]) == EXIT_OK
+
+
+def test_memory(monkeypatch, capsys):
+    monkeypatch.setattr(cli, "send_command", lambda message, timeout=None: None)
+    assert cli.main(["memory"]) == EXIT_LAUNCH_FAILED
+    report = {"rss": 50 * 1024 * 1024, "tracing": False}
+    monkeypatch.setattr(cli, "send_command", lambda message, timeout=None: {"ok": True, "report": report})
+    assert cli.main(["memory"]) == EXIT_OK
+    assert "Resident set: 50.0 MB" in capsys.readouterr().out
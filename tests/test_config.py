@@ -0,0 +1,444 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import pytest
+
+import config
+from config import Config, ConfigError
+from appentry import entry_path
+from journal import Journal
+
+
+@pytest.fixture
+def appends(monkeypatch):
+    """The op batches written to the journal, in order."""
+    calls = []
+    real = Journal.append
+
+    def counting(self, ops):
+        calls.append(list(ops))
+        return real(self, ops)
+    monkeypatch.setattr(Journal, "append", counting)
+    return calls
+
+
+def wait_for(check, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not check():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+# Write-behind saving
+
+def test_burst_of_saves_is_one_background_write(config_path, monkeypatch, appends):
+    monkeypatch.setattr(config, "SAVE_DELAY", 0.1)
+    cfg = Config()
+    for i in range(5):
+        assert cfg.add_app_to_category("default", f"C:/apps/{i}.exe")
+    assert appends == []  # nothing written on the caller's thread
+    assert wait_for(lambda: appends)
+    time.sleep(0.2)
+    assert len(appends) == 1 and len(appends[0]) == 5
+    assert Config().categories["default"] == [f"C:/apps/{i}.exe" for i in range(5)]
+
+
+def test_flush_writes_immediately(config_path, monkeypatch, appends):
+    monkeypatch.setattr(config, "SAVE_DELAY", 60)
+    cfg = Config()
+    cfg.add_category("tools")
+    assert cfg.flush()
+    assert len(appends) == 1
+    assert "tools" in Config().categories
+    assert cfg.flush()  # nothing pending: no write
+    assert len(appends) == 1
+
+
+def test_failed_write_is_kept_and_retried(config_path, monkeypatch):
+    monkeypatch.setattr(config, "SAVE_DELAY", 60)
+    cfg = Config()
+    cfg.add_category("tools")
+    real = Journal.append
+
+    def broken(self, ops):
+        raise OSError("disk full")
+    monkeypatch.setattr(Journal, "append", broken)
+    assert not cfg.flush()
+    assert isinstance(cfg.save_error, OSError)
+    monkeypatch.setattr(Journal, "append", real)
+    cfg.add_category("games")
+    assert cfg.flush()
+    assert cfg.save_error is None
+    assert {"tools", "games"} <= set(Config().categories)
+
+
+def test_atomic_write_replaces_the_whole_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("old")
+    config._atomic_write(path, "new")
+    assert path.read_text() == "new"
+    assert [p.name for p in tmp_path.iterdir()] == ["config.json"]  # temp file swapped in
+
+
+# Batches
+
+def test_batch_is_validated_and_written_once(config_path, monkeypatch, appends):
+    monkeypatch.setattr(config, "SAVE_DELAY", 0.01)
+    cfg = Config()
+    with cfg.batch():
+        cfg.add_category("tools")
+        for i in range(3):
+            cfg.add_app_to_category("tools", f"C:/tools/{i}.exe")
+        cfg.add_profile("work", ["tools"])
+        time.sleep(0.1)
+        assert appends == []  # never a half-applied batch on disk
+    assert wait_for(lambda: appends)
+    assert len(appends) == 1 and len(appends[0]) == 5
+    assert Config().get_profile_apps("work") == [f"C:/tools/{i}.exe" for i in range(3)]
+
+
+def test_refused_mutation_rolls_the_batch_back(config_path):
+    cfg = Config()
+    cfg.add_app_to_category("default", "C:/a.exe")
+    cfg.remove_app_from_category("default", 0)
+    with pytest.raises(ConfigError):
+        with cfg.batch():
+            cfg.add_category("tools")
+            cfg.insert_app_into_category("default", "C:/a.exe", 0)  # restores it: leaves the Trash
+            cfg.add_category("tools")  # refused
+    assert "tools" not in cfg.categories
+    assert cfg.categories["default"] == []
+    assert not cfg.category_has_app("default", "C:/a.exe")
+    assert [entry for _, _, entry in cfg.trash] == ["C:/a.exe"]
+    assert cfg.flush()
+    assert "tools" not in Config().categories
+
+
+def test_exception_in_batch_rolls_back_and_propagates(config_path):
+    cfg = Config()
+    with pytest.raises(RuntimeError):
+        with cfg.batch():
+            cfg.add_category("tools")
+            raise RuntimeError("stop")
+    assert "tools" not in cfg.categories
+
+
+def test_batch_that_leaves_the_config_inconsistent_is_refused(config_path):
+    cfg = Config()
+    cfg.add_app_to_category("default", "C:/a.exe")
+    with pytest.raises(ConfigError, match="twice"):
+        with cfg.batch():
+            cfg.categories["default"].append("C:/a.exe")  # bypassing Config
+    assert cfg.categories["default"] == ["C:/a.exe"]
+
+
+def test_nested_batches_join_the_outer_one(config_path):
+    cfg = Config()
+    with pytest.raises(ConfigError):
+        with cfg.batch():
+            cfg.add_category("tools")
+            with cfg.batch():
+                cfg.add_category("games")
+            cfg.remove_category("nope")
+    assert set(cfg.categories) == {"default"}
+
+
+# Indexes
+
+def brute_force(cfg):
+    """What the indexes should say, recomputed from the data."""
+    app_cats, app_profs, profile_apps = {}, {}, {}
+    for cat, apps in cfg.categories.items():
+        for entry in apps:
+            app_cats.setdefault(entry_path(entry), set()).add(cat)
+    for prof, cats in cfg.profiles.items():
+        seen, apps = set(), []
+        for cat in cats:
+            for entry in cfg.categories.get(cat, []):
+                path = entry_path(entry)
+                app_profs.setdefault(path, set()).add(prof)
+                if path not in seen:
+                    seen.add(path)
+                    apps.append(entry)
+        profile_apps[prof] = apps
+    return app_cats, app_profs, profile_apps
+
+
+def check_indexes(cfg):
+    app_cats, app_profs, profile_apps = brute_force(cfg)
+    assert set(cfg.all_app_paths()) == set(app_cats)
+    for path in set(app_cats) | {"C:/never.exe"}:
+        assert cfg.categories_with_app(path) == app_cats.get(path, set())
+        assert cfg.profiles_with_app(path) == app_profs.get(path, set())
+    for cat, apps in cfg.categories.items():
+        assert cfg.category_size(cat) == len(apps)
+        for entry in apps:
+            assert cfg.category_has_app(cat, entry_path(entry))
+    for prof, apps in profile_apps.items():
+        assert cfg.get_profile_apps(prof) == apps
+
+
+def test_indexes_follow_every_mutation(config_path):
+    rnd = random.Random(14)
+    cfg = Config()
+    cats = ["default", "a", "b", "c"]
+    profs = ["p1", "p2", "p3"]
+    paths = [f"C:/apps/{i}.exe" for i in range(8)]
+    for step in range(400):
+        if not cfg.categories:  # "default" can be renamed away, then removed
+            cfg.add_category("default")
+        op = rnd.randrange(9)
+        if op == 0:
+            cfg.add_category(rnd.choice(cats))
+        elif op == 1:
+            cfg.remove_category(rnd.choice(cats))
+        elif op == 2:
+            old = rnd.choice(list(cfg.categories))
+            new = rnd.choice(cats)
+            cfg.rename_category(old, new)
+        elif op in (3, 4):
+            cat = rnd.choice(list(cfg.categories))
+            entry = rnd.choice(paths)
+            if rnd.random() < 0.3:
+                entry = {"path": entry, "args": ["-x"]}
+            cfg.insert_app_into_category(cat, entry, rnd.randrange(5))
+        elif op == 5:
+            cat = rnd.choice(list(cfg.categories))
+            if cfg.categories[cat]:
+                cfg.remove_app_from_category(cat, rnd.randrange(len(cfg.categories[cat])))
+        elif op == 6:
+            cfg.add_profile(rnd.choice(profs), rnd.sample(cats, 2))
+        elif op == 7:
+            cfg.set_profile_categories(rnd.choice(profs), rnd.sample(cats, rnd.randrange(4)))
+        else:
+            if rnd.random() < 0.5:
+                cfg.rename_profile(rnd.choice(profs), rnd.choice(profs))
+            else:
+                cfg.remove_profile(rnd.choice(profs))
+        if step % 10 == 0:
+            for prof in cfg.profiles:
+                cfg.get_profile_apps(prof)  # memoize, so later changes must invalidate
+        check_indexes(cfg)
+
+
+def test_profile_naming_a_category_before_it_exists(config_path):
+    config_path.write_text(json.dumps({
+        "categories": {"old": ["C:/a.exe"], "tmp": ["C:/b.exe"]},
+        "profiles": {"work": ["old", "new"]},  # e.g. edited by hand
+    }))
+    cfg = Config()
+    assert cfg.get_profile_apps("work") == ["C:/a.exe"]
+    cfg.rename_category("tmp", "new")
+    assert cfg.get_profile_apps("work") == ["C:/a.exe", "C:/b.exe"]
+    assert cfg.profiles_with_app("C:/b.exe") == {"work"}
+
+
+def test_dropped_caches_are_rebuilt_on_first_use(config_path):
+    cfg = Config()
+    cfg.add_category("work")
+    cfg.add_app_to_category("work", "C:/apps/editor.exe")
+    cfg.add_profile("day", ["work"])
+    assert cfg.search("editor") == [("work", "C:/apps/editor.exe")]
+    assert cfg.get_profile_apps("day") == ["C:/apps/editor.exe"]
+    cfg.drop_caches()  # what the window's idle teardown does
+    assert cfg._search is None and cfg._profile_apps == {}
+    cfg.add_app_to_category("work", "C:/apps/editor2.exe")  # while they're gone
+    assert [e for _, e in cfg.search("editor")] == ["C:/apps/editor.exe", "C:/apps/editor2.exe"]
+    assert cfg.get_profile_apps("day") == ["C:/apps/editor.exe", "C:/apps/editor2.exe"]
+    check_indexes(cfg)
+
+
+# Journal and snapshot
+
+def journal_ops(config_path):
+    with open(config_path.with_name(config.JOURNAL_NAME)) as f:
+        return [r for r in map(json.loads, f) if r.get("op")]
+
+
+def edit_config_json(config_path, change):
+    data = json.loads(config_path.read_text())
+    change(data)
+    config_path.write_text(json.dumps(data))
+
+
+def test_flush_folds_the_journal_into_config_json(config_path):
+    cfg = Config()
+    cfg.add_category("work")
+    cfg.add_app_to_category("work", "C:/a.exe")
+    assert cfg.flush()
+    data = json.loads(config_path.read_text())
+    assert data["categories"]["work"] == ["C:/a.exe"]
+    assert "journal_seq" in data
+    assert journal_ops(config_path) == []
+
+
+def test_journal_replays_by_path_onto_an_edited_config_json(config_path, monkeypatch):
+    cfg = Config()
+    cfg.add_category("work")
+    for path in ("a", "b", "c"):
+        cfg.add_app_to_category("work", path)
+    assert cfg.flush()
+    monkeypatch.setattr(Config, "_compact", lambda self: False)  # e.g. quit before folding
+    assert cfg.remove_app_from_category("work", 1)
+    assert cfg.flush()
+    assert len(journal_ops(config_path)) == 1
+    # Someone puts an app in front of it by hand, keeping journal_seq
+    edit_config_json(config_path, lambda data: data["categories"]["work"].insert(0, "zz"))
+    monkeypatch.undo()
+    monkeypatch.setattr(config, "CONFIG_PATH", config_path)
+    other = Config()
+    assert other.categories["work"] == ["zz", "a", "c"]
+    assert other.trash.find("work", "b") is not None
+
+
+def test_flush_leaves_an_edited_config_json_alone(config_path):
+    cfg = Config()
+    cfg.add_category("work")
+    assert cfg.flush()
+    edit_config_json(config_path, lambda data: data["categories"].update(games=[]))
+    cfg.add_category("tools")
+    assert cfg.flush()  # written to the journal, not folded over their edit
+    assert set(Config().categories) == {"default", "work", "games", "tools"}
+    cfg.reload()
+    assert cfg.flush()
+    data = json.loads(config_path.read_text())
+    assert set(data["categories"]) == {"default", "work", "games", "tools"}
+
+
+def test_external_edit_while_journal_is_non_empty(config_path, monkeypatch):
+    monkeypatch.setattr(config, "SAVE_DELAY", 0.01)
+    cfg = Config()
+    cfg.add_category("work")
+    for path in ("a", "b"):
+        cfg.add_app_to_category("work", path)
+    assert cfg.flush()
+    cfg.add_app_to_category("work", "c")  # written behind: journal only
+    assert wait_for(lambda: journal_ops(config_path))
+
+    def change(data):
+        data["categories"]["work"].remove("b")
+        data["categories"]["games"] = ["g"]
+    edit_config_json(config_path, change)
+    diff = cfg.reload()
+    assert cfg.categories["work"] == ["a", "c"]
+    assert cfg.categories["games"] == ["g"]
+    assert diff.categories_added == ["games"] and diff.categories_changed == ["work"]
+    assert Config().categories == cfg.categories
+
+
+def test_edit_from_a_snapshot_since_compacted_is_merged_against_it(config_path):
+    cfg = Config()
+    cfg.add_category("work")
+    cfg.add_app_to_category("work", "w")
+    cfg.add_app_to_category("default", "d1")
+    assert cfg.flush()
+    opened = json.loads(config_path.read_text())  # an editor has it open
+    cfg.remove_category("work")
+    cfg.add_app_to_category("default", "d2")
+    assert cfg.flush()  # folded: the records of these edits are gone
+    opened["categories"]["default"].append("d3")
+    opened["categories"]["games"] = ["g"]
+    config_path.write_text(json.dumps(opened))
+    diff = cfg.reload()
+    assert cfg.categories == {"default": ["d1", "d3", "d2"], "games": ["g"]}
+    assert diff.categories_added == ["games"] and diff.categories_removed == []
+    assert Config().categories == cfg.categories
+
+
+# Other processes (two Configs on the same files behave like two processes:
+# each has its own lock file descriptor)
+
+def test_write_behind_waits_for_flush_to_merge(config_path, monkeypatch, appends):
+    monkeypatch.setattr(config, "SAVE_DELAY", 0.01)
+    ours, theirs = Config(), Config()
+    theirs.add_category("games")
+    assert theirs.flush()
+    ours.add_category("tools")
+    assert wait_for(lambda: ours.changed_on_disk())
+    time.sleep(0.05)
+    assert len(appends) == 1  # theirs only: ours stays queued
+    assert ours.flush()
+    assert set(Config().categories) == {"default", "games", "tools"}
+
+
+def test_edits_to_different_apps_both_survive(config_path):
+    first = Config()
+    first.add_category("work")
+    for path in ("a", "b", "c"):
+        first.add_app_to_category("work", path)
+    assert first.flush()
+    ours, theirs = Config(), Config()
+    assert theirs.remove_app_from_category("work", 0)
+    theirs.insert_app_into_category("work", "t", 0)
+    assert theirs.flush()
+    assert ours.remove_app_from_category("work", 2)  # "c", wherever it is now
+    assert ours.flush()
+    assert ours.categories["work"] == ["t", "b"]
+    assert ours.merge_conflicts == []
+    assert Config().categories["work"] == ["t", "b"]
+
+
+def test_same_setting_later_write_wins(config_path):
+    ours, theirs = Config(), Config()
+    assert theirs.set_hotkey("ctrl+alt+t")
+    assert theirs.flush()
+    assert ours.set_hotkey("ctrl+alt+o")
+    assert ours.flush()
+    assert Config().settings["hotkey"] == "ctrl+alt+o"
+
+
+def test_edit_to_a_category_deleted_elsewhere_is_dropped(config_path):
+    first = Config()
+    first.add_category("work")
+    assert first.flush()
+    ours, theirs = Config(), Config()
+    assert theirs.remove_category("work")
+    assert theirs.flush()
+    ours.add_app_to_category("work", "a")
+    ours.add_category("tools")
+    assert ours.flush()
+    assert [op[0] for op in ours.merge_conflicts] == ["insert_app"]
+    assert set(Config().categories) == {"default", "tools"}
+
+
+def test_concurrent_processes_lose_no_edits(config_path):
+    Config().flush()
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import config; "
+        "config.CONFIG_PATH = config.Path(sys.argv[2]); cfg = config.Config(); "
+        "[cfg.add_app_to_category('default', f'{sys.argv[3]}{i}') or cfg.flush() for i in range(20)]"
+    )
+    launcher = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "launcher")
+    procs = [subprocess.Popen([sys.executable, "-c", script, launcher, str(config_path), name])
+             for name in ("p", "q")]
+    assert [p.wait(timeout=60) for p in procs] == [0, 0]
+    apps = Config().categories["default"]
+    assert sorted(apps) == sorted(f"{name}{i}" for name in ("p", "q") for i in range(20))
+
+
+# Change listeners
+
+def test_listener_runs_after_each_change(config_path):
+    cfg = Config()
+    seen = []
+    cfg.add_listener(lambda: seen.append((cfg.revision, sorted(cfg.categories))))
+    cfg.add_category("tools")
+    assert seen == [(cfg.revision, ["default", "tools"])]  # already applied
+    with cfg.batch():
+        cfg.add_category("games")
+        cfg.add_app_to_category("games", "a")
+    assert len(seen) == 2
+    with pytest.raises(ConfigError):
+        with cfg.batch():
+            cfg.add_category("tools")
+    assert seen[-1][1] == ["default", "games", "tools"] and len(seen) == 3
+    cfg.reload()
+    assert len(seen) == 4
+    assert not cfg.remove_category("nope")  # refused: nothing changed
+    assert len(seen) == 4
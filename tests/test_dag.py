@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+
+from appentry import entry_path
+from dag import LaunchGraph, parse_ready
+from launcher import FAILED, QUEUED, WAITING, LaunchResult
+
+
+class FakeLauncher:
+    """Records the order apps were launched in; paths in `fail` fail."""
+    max_workers = 4
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.launched = []
+        self._lock = threading.Lock()
+
+    def launch_path(self, entry, on_progress=None, profile=None, running=None):
+        path = entry_path(entry)
+        with self._lock:
+            self.launched.append(path)
+        if path in self.fail:
+            return LaunchResult(path, False, "boom")
+        return LaunchResult(path, True)
+
+
+def test_parse_ready():
+    assert parse_ready("") == ("started", None)
+    assert parse_ready("alive") == ("alive", None)
+    assert parse_ready("port:1194") == ("port", ("127.0.0.1", 1194))
+    assert parse_ready("port:vpn.local:443") == ("port", ("vpn.local", 443))
+    assert parse_ready("file:C:/x/ready.flag") == ("file", "C:/x/ready.flag")
+    with pytest.raises(ValueError):
+        parse_ready("socket:1")
+
+
+def test_dependency_is_launched_after_what_it_waits_on():
+    rules = {"db": {"after": ["vpn"]}, "report": {"after": ["db"]}}
+    graph = LaunchGraph(["report", "db", "vpn"], rules)
+    launcher = FakeLauncher()
+    results = graph.run(launcher)
+    assert launcher.launched == ["vpn", "db", "report"]
+    assert [r.path for r in results] == ["report", "db", "vpn"]  # original order
+    assert all(r.success for r in results)
+
+
+def test_progress_marks_waiting_apps():
+    states = {}
+    graph = LaunchGraph(["a", "b"], {"b": {"after": ["a"]}})
+    graph.run(FakeLauncher(), on_progress=lambda p, s, r: states.setdefault(p, s))
+    assert states == {"a": QUEUED, "b": WAITING}
+
+
+def test_dependencies_outside_the_batch_are_ignored():
+    graph = LaunchGraph(["db"], {"db": {"after": ["vpn"]}})
+    assert not graph.has_edges()
+    assert graph.deps == {"db": []}
+
+
+def test_duplicate_paths_and_self_dependencies_are_dropped():
+    graph = LaunchGraph(["a", {"path": "a", "args": ["-x"]}, "b"], {"a": {"after": ["a", "b", "b"]}})
+    assert graph.paths == ["a", "b"]
+    assert graph.entries["a"] == "a"
+    assert graph.deps["a"] == ["b"]
+
+
+def test_cycle_is_rejected_before_anything_launches():
+    rules = {"a": {"after": ["c"]}, "b": {"after": ["a"]}, "c": {"after": ["b"]}}
+    with pytest.raises(ValueError, match="cycle"):
+        LaunchGraph(["a", "b", "c", "d"], rules)
+
+
+def test_bad_readiness_spec_fails_up_front():
+    with pytest.raises(ValueError):
+        LaunchGraph(["a", "b"], {"b": {"after": ["a"]}, "a": {"ready": "bogus"}})
+
+
+def test_failed_dependency_fails_its_dependents_transitively():
+    rules = {"b": {"after": ["a"]}, "c": {"after": ["b"]}}
+    launcher = FakeLauncher(fail={"a"})
+    results = {r.path: r for r in LaunchGraph(["a", "b", "c"], rules).run(launcher)}
+    assert launcher.launched == ["a"]
+    assert results["b"].error == "Dependency failed: a"
+    assert results["c"].error == "Dependency not launched: b"
+    assert not any(r.success for r in results.values())
+
+
+def test_file_readiness_releases_dependents(tmp_path):
+    flag = tmp_path / "ready.flag"
+    flag.write_text("")
+    rules = {"b": {"after": ["a"]}, "a": {"ready": f"file:{flag}", "ready_timeout": 5}}
+    launcher = FakeLauncher()
+    results = LaunchGraph(["a", "b"], rules).run(launcher)
+    assert launcher.launched == ["a", "b"]
+    assert all(r.success for r in results)
+
+
+def test_dependency_that_never_becomes_ready_times_out(tmp_path):
+    rules = {"b": {"after": ["a"]}, "a": {"ready": f"file:{tmp_path / 'never'}", "ready_timeout": 0.2}}
+    states = []
+    launcher = FakeLauncher()
+    results = LaunchGraph(["a", "b"], rules).run(launcher, on_progress=lambda p, s, r: states.append((p, s)))
+    assert launcher.launched == ["a"]
+    assert results[1].error == "Dependency not ready: a"
+    assert ("b", FAILED) in states
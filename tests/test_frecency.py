@@ -0,0 +1,67 @@
+import json
+import time
+
+import pytest
+
+from frecency import HALF_LIFE, Frecency
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+def test_each_launch_adds_one(tmp_path, clock):
+    f = Frecency(tmp_path / "frecency.json")
+    assert f.score("app", "a") == 0.0
+    f.record("app", "a")
+    f.record("app", "a")
+    assert f.score("app", "a") == pytest.approx(2.0)
+    assert f.score("profile", "a") == 0.0  # kinds are separate
+
+
+def test_scores_halve_every_half_life(tmp_path, clock):
+    f = Frecency(tmp_path / "frecency.json")
+    f.record("app", "a")
+    assert f.score("app", "a", now=clock[0] + HALF_LIFE) == pytest.approx(0.5)
+    assert f.score("app", "a", now=clock[0] + 2 * HALF_LIFE) == pytest.approx(0.25)
+    clock[0] += HALF_LIFE
+    f.record("app", "a")
+    assert f.score("app", "a") == pytest.approx(1.5)
+
+
+def test_recent_beats_frequent_long_ago(tmp_path, clock):
+    f = Frecency(tmp_path / "frecency.json")
+    for _ in range(4):
+        f.record("app", "old")
+    clock[0] += 3 * HALF_LIFE
+    f.record("profile", "new")
+    assert [(kind, name) for kind, name, _ in f.top(2)] == [("profile", "new"), ("app", "old")]
+
+
+def test_persists_across_sessions(tmp_path, clock):
+    path = tmp_path / "frecency.json"
+    Frecency(path).record("app", "C:/a.exe")
+    assert Frecency(path).score("app", "C:/a.exe") == pytest.approx(1.0)
+
+
+def test_decayed_items_are_pruned_on_save(tmp_path, clock):
+    path = tmp_path / "frecency.json"
+    f = Frecency(path)
+    f.record("app", "stale")
+    clock[0] += 10 * HALF_LIFE
+    f.record("app", "fresh")
+    assert list(json.loads(path.read_text())["app"]) == ["fresh"]
+
+
+def test_broken_file_and_failed_write_are_ignored(tmp_path, clock):
+    path = tmp_path / "frecency.json"
+    path.write_text('{"app": {"a": [1.0, 1700000000.0], "b": "junk"}, "profile": [')
+    assert Frecency(path).score("app", "a") == 0.0  # not JSON: starts empty
+    path.write_text('{"app": {"a": [1.0, 1700000000.0], "b": "junk"}}')
+    assert Frecency(path).score("app", "a") == pytest.approx(1.0)
+    f = Frecency(tmp_path / "missing" / "frecency.json")
+    f.record("app", "a")  # can't be written: still counted in memory
+    assert f.score("app", "a") == pytest.approx(1.0)
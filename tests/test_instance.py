@@ -0,0 +1,93 @@
+import os
+import socket
+import sys
+import tempfile
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+import pytest
+
+import instance
+from instance import InstanceServer, send_command
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix socket endpoint")
+
+
+@pytest.fixture
+def runtime_dir(monkeypatch):
+    # Short, so the socket path stays under the AF_UNIX length limit
+    folder = tempfile.mkdtemp(prefix="rt")
+    monkeypatch.setenv("XDG_RUNTIME_DIR", folder)
+    return folder
+
+
+@pytest.fixture
+def server(runtime_dir):
+    server = InstanceServer()
+    assert server.bind()
+    server.serve(lambda message: {"ok": True, "got": message})
+    yield server
+    server.stop()
+
+
+def test_command_is_forwarded_to_the_first_instance(server):
+    assert send_command({"cmd": "run", "profile": "work"}) == {
+        "ok": True, "got": {"cmd": "run", "profile": "work"}}
+    assert send_command({"cmd": "ping"}) == {"ok": True}
+
+
+def test_second_instance_does_not_bind(server):
+    assert not InstanceServer().bind()
+
+
+def test_no_instance_means_no_reply(runtime_dir):
+    assert send_command({"cmd": "show"}) is None
+
+
+def test_stale_socket_is_taken_over(runtime_dir):
+    address, _, _ = instance.endpoint()
+    dead = socket.socket(socket.AF_UNIX)
+    dead.bind(address)  # left behind by a crash: nobody listening
+    dead.close()
+    assert send_command({"cmd": "show"}) is None
+    server = InstanceServer()
+    try:
+        assert server.bind()
+        server.serve(lambda message: {"ok": True})
+        assert send_command({"cmd": "show"}) == {"ok": True}
+    finally:
+        server.stop()
+    assert not os.path.exists(address)
+
+
+def test_endpoint_is_private(server, runtime_dir):
+    folder = os.path.dirname(server.address)
+    assert os.path.dirname(folder) == runtime_dir
+    assert os.stat(folder).st_mode & 0o777 == 0o700
+    assert os.stat(os.path.join(folder, instance.KEY_NAME)).st_mode & 0o777 == 0o600
+    assert instance.authkey() == instance.authkey()  # made once, then reused
+
+
+def test_loose_directory_is_tightened(runtime_dir):
+    folder = os.path.join(runtime_dir, f"bootup-launcher-{os.getuid()}")
+    os.mkdir(folder, 0o755)
+    os.chmod(folder, 0o755)
+    assert instance.private_dir() == folder
+    assert os.stat(folder).st_mode & 0o777 == 0o700
+
+
+def test_peer_without_the_key_is_refused(server):
+    with pytest.raises(AuthenticationError):
+        Client(server.address, server.family, authkey=b"x" * instance.KEY_BYTES)
+    conn = Client(server.address, server.family)  # skips the handshake
+    try:
+        conn.send_bytes(b'{"cmd": "show"}')
+        received = []
+        with pytest.raises((EOFError, OSError)):
+            while conn.poll(1.0):
+                received.append(conn.recv_bytes())
+            raise AssertionError("the server should hang up")
+        assert not any(data.startswith(b"{") for data in received)  # no reply
+    finally:
+        conn.close()
+    assert send_command({"cmd": "ping"}) == {"ok": True}  # still serving
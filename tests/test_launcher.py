@@ -0,0 +1,198 @@
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import launcher as launcher_module
+from launcher import FAILED, QUEUED, SPAWNING, STARTED, AliveWatcher, AppLauncher, _proc_ready
+from lnk import ShellLink
+
+
+class CountingProvider:
+    def __init__(self, exes=()):
+        self.exes = list(exes)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return list(self.exes)
+
+
+class FakeShortcuts:
+    def __init__(self, links):
+        self.links = links
+
+    def resolve(self, path):
+        return self.links.get(path)
+
+
+def test_one_snapshot_per_poll_for_the_whole_batch():
+    provider = CountingProvider(["/opt/a/a.bin", "/opt/b/b.bin"])
+    watcher = AliveWatcher(provider)
+    pending = [(image, None, None, 0.0, float("inf")) for image in ("/x/a.bin", "/y/b.bin", "/z/c.bin")]
+    finished = watcher.poll(pending)
+    assert provider.calls == 1
+    assert [item[0] for item, _ in finished] == ["/x/a.bin", "/y/b.bin"]
+
+
+def test_watch_reports_seconds_until_seen():
+    done = threading.Event()
+    seen = []
+    watcher = AliveWatcher(CountingProvider(["/opt/app/app.bin"]))
+    watcher.watch("/somewhere/app.bin", None, lambda alive: (seen.append(alive), done.set()))
+    assert done.wait(2)
+    assert seen[0] is not None and seen[0] >= 0
+
+
+def test_watch_backs_off_and_gives_up():
+    provider = CountingProvider()
+    done = threading.Event()
+    seen = []
+    watcher = AliveWatcher(provider, timeout=1.0)
+    watcher.watch("/x/never.bin", None, lambda alive: (seen.append(alive), done.set()))
+    assert done.wait(5)
+    assert seen == [None]
+    assert provider.calls <= 6  # 0.05, 0.1, 0.2, 0.4, 0.8: not one every 50 ms
+
+
+def test_nothing_to_watch_is_reported_straight_away():
+    seen = []
+    AliveWatcher(CountingProvider()).watch(None, None, seen.append)
+    assert seen == [None]
+
+
+def test_shortcuts_are_watched_by_their_target():
+    link = ShellLink(target="C:\\Apps\\Tool\\tool.exe")
+    launcher = AppLauncher(shortcuts=FakeShortcuts({"C:/links/Tool.lnk": link}))
+    assert launcher._image("C:/links/Tool.lnk", None) == "C:\\Apps\\Tool\\tool.exe"
+    assert launcher._image("C:/links/Gone.lnk", None) is None
+    assert launcher._image("C:/Apps/app.exe", None) == "C:/Apps/app.exe"
+    assert AppLauncher()._image("C:/links/Tool.lnk", None) is None
+
+
+def _wait_for(check, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = check()
+        if value is not False:
+            return value
+        time.sleep(0.02)
+    return False
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc/<pid>/stat")
+def test_process_with_a_handle_is_ready_once_idle():
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        assert _wait_for(lambda: _proc_ready(proc)) is True
+    finally:
+        proc.kill()
+        proc.wait()
+    assert _proc_ready(proc) is None
+
+
+def test_process_that_already_exited_is_reported_straight_away():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    seen = []
+    AliveWatcher().watch(None, proc, seen.append)
+    assert seen == [None]  # on the caller's thread: no watcher started
+
+
+def test_process_that_exits_while_watched_is_not_alive():
+    class StubProc:
+        """Exits after its first poll, before it ever looks ready."""
+        pid = -1
+
+        def __init__(self):
+            self.polls = 0
+
+        def poll(self):
+            self.polls += 1
+            return None if self.polls == 1 else 0
+
+    seen = []
+    done = threading.Event()
+    started = time.monotonic()
+    AliveWatcher(timeout=30).watch(None, StubProc(), lambda alive: (seen.append(alive), done.set()))
+    assert done.wait(2)
+    assert seen == [None]
+    assert time.monotonic() - started < 1  # not held until the timeout
+
+
+def test_bad_entries_fail_on_their_own():
+    good = {"path": sys.executable, "args": ["-c", "pass"]}
+    entries = [{"args": ["no path"]}, {"path": sys.executable, "args": 5}, "/no/such/app.bin", good]
+    results = AppLauncher().launch_list(entries)
+    assert [r.success for r in results] == [False, False, False, True]
+    assert results[0].error.startswith("Invalid entry")
+    assert results[1].error.startswith("Invalid entry")
+    assert results[2].error == "File not found"
+    results[3].proc.wait()
+
+
+class BarrierVector:
+    """Stands in for appentry's compiled entry: spawning waits until every
+    app of the batch is spawning at once, so it only returns if they
+    overlap."""
+
+    def __init__(self, path, barrier):
+        self.path = path
+        self.barrier = barrier
+
+    def exists(self):
+        return not self.path.startswith("/missing")
+
+    def spawn(self):
+        self.barrier.wait(timeout=5)  # BrokenBarrierError if run one at a time
+        if self.path.startswith("/broken"):
+            raise OSError("Access is denied")
+        return None
+
+
+def test_batch_spawns_concurrently_and_reports_every_app(monkeypatch):
+    paths = ["/apps/a", "/apps/b", "/broken/c", "/apps/d", "/missing/e"]
+    barrier = threading.Barrier(4)  # everything that gets as far as spawning
+    monkeypatch.setattr(launcher_module, "compile_entry", lambda entry: BarrierVector(entry, barrier))
+    events = queue.Queue()  # as the window's progress queue gets them
+
+    results = AppLauncher(max_workers=5).launch_list(
+        paths, on_progress=lambda path, state, result: events.put((path, state, result))
+    )
+    assert [r.path for r in results] == paths
+    assert [r.success for r in results] == [True, True, False, True, False]
+    assert results[2].error == "Access is denied" and results[4].error == "File not found"
+
+    events = [events.get_nowait() for _ in range(events.qsize())]
+    assert [(path, state) for path, state, _ in events[:5]] == [(p, QUEUED) for p in paths]
+    for path, result in zip(paths, results):
+        states = [(state, res) for p, state, res in events[5:] if p == path]
+        assert states == [(SPAWNING, None), (STARTED if result.success else FAILED, result)]
+
+
+def test_batch_is_capped_at_max_workers(monkeypatch):
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    class SlowVector:
+        def __init__(self, entry):
+            pass
+
+        def exists(self):
+            return True
+
+        def spawn(self):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+    monkeypatch.setattr(launcher_module, "compile_entry", SlowVector)
+    results = AppLauncher(max_workers=3).launch_list([f"/apps/{i}" for i in range(9)])
+    assert all(r.success for r in results)
+    assert peak[0] == 3
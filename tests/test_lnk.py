@@ -0,0 +1,172 @@
+import os
+import shutil
+
+import pytest
+
+import lnk
+from lnk import HEADER_SIZE, LnkError, ShortcutCache, parse_lnk, read_lnk
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "lnk")
+
+
+def fixture(name: str) -> str:
+    return os.path.join(FIXTURES, name)
+
+
+def data(name: str) -> bytes:
+    with open(fixture(name), "rb") as f:
+        return f.read()
+
+
+def test_local_target():
+    link = read_lnk(fixture("local.lnk"))
+    assert link.target == "C:\\Program Files\\Tool\\tool.exe"  # base path + suffix
+    assert link.description == "Tool"
+    assert link.working_dir == "C:\\Program Files\\Tool"
+    assert link.icon_location == "C:\\Program Files\\Tool\\tool.ico"
+    assert link.arguments == ""
+
+
+def test_relative_path_resolves_against_the_shortcut_folder():
+    link = parse_lnk(data("relative.lnk"), os.path.join("links", "sub", "app.lnk"))
+    assert link.relative_path == "..\\bin\\app.exe"
+    assert link.target == os.path.normpath(os.path.join("links", "bin", "app.exe"))
+    assert parse_lnk(data("relative.lnk")).target == ""  # nowhere to resolve it against
+
+
+def test_unicode_strings():
+    link = read_lnk(fixture("unicode.lnk"))
+    assert link.target == "C:\\Werkzeuge\\Größe\\工具.exe"
+    assert link.description == "Größe — 工具"
+    assert link.arguments == '--titel "Grüße"'
+
+
+def test_arguments_and_working_dir():
+    link = read_lnk(fixture("args.lnk"))
+    assert link.target == "C:\\Apps\\editor.exe"
+    assert link.arguments == '--profile "My Work" -n'
+    assert link.working_dir == "D:\\Projects"
+
+
+def test_environment_variable_block(monkeypatch):
+    monkeypatch.setenv("LNK_TEST_TOOLS", "C:\\Tools")
+    assert read_lnk(fixture("envblock.lnk")).target == "C:\\Tools\\envtool.exe"
+    monkeypatch.delenv("LNK_TEST_TOOLS")
+    assert read_lnk(fixture("envblock.lnk")).target == "%LNK_TEST_TOOLS%\\envtool.exe"
+
+
+def test_network_share():
+    assert read_lnk(fixture("network.lnk")).target == "\\\\fileserver\\apps\\tools\\net.exe"
+
+
+@pytest.mark.parametrize("name", ["local.lnk", "unicode.lnk", "args.lnk", "envblock.lnk", "network.lnk"])
+def test_truncated_input_raises_lnk_error(name):
+    whole = data(name)
+    complete = parse_lnk(whole)
+    for n in range(len(whole)):
+        try:
+            link = parse_lnk(whole[:n])
+        except LnkError:
+            continue
+        # Only a missing trailer may go unnoticed, never a cut-off field
+        assert n >= HEADER_SIZE and link.target in ("", complete.target)
+
+
+def test_corrupt_input():
+    with pytest.raises(LnkError):
+        parse_lnk(b"")
+    with pytest.raises(LnkError):
+        parse_lnk(b"MZ" + bytes(200))
+    header = bytearray(data("local.lnk"))
+    header[4] ^= 0xFF  # CLSID
+    with pytest.raises(LnkError):
+        parse_lnk(bytes(header))
+    with pytest.raises(LnkError):
+        read_lnk(fixture("../make_lnk.py"))
+
+
+def test_fuzzed_bytes_only_raise_lnk_error():
+    import random
+
+    rnd = random.Random(7)
+    for name in ("local.lnk", "unicode.lnk", "args.lnk", "envblock.lnk", "network.lnk"):
+        whole = data(name)
+        for _ in range(200):
+            mutated = bytearray(whole)
+            mutated[rnd.randrange(0x14, len(mutated))] = rnd.randrange(256)
+            try:
+                parse_lnk(bytes(mutated))
+            except LnkError:
+                pass
+
+
+@pytest.fixture
+def shortcut(tmp_path):
+    path = tmp_path / "Tool.lnk"
+    shutil.copy(fixture("local.lnk"), path)
+    return str(path)
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    real = lnk.read_lnk
+
+    def counting(path):
+        calls.append(path)
+        return real(path)
+    monkeypatch.setattr(lnk, "read_lnk", counting)
+    return calls
+
+
+def test_cache_parses_each_shortcut_once(tmp_path, shortcut, parses):
+    cache = ShortcutCache(tmp_path / "cache.json")
+    assert cache.resolve(shortcut).target == "C:\\Program Files\\Tool\\tool.exe"
+    assert cache.resolve(shortcut).target == "C:\\Program Files\\Tool\\tool.exe"
+    assert parses == [shortcut]
+
+
+def test_cache_is_persisted(tmp_path, shortcut, parses):
+    ShortcutCache(tmp_path / "cache.json").preload([shortcut, "C:/not/a/shortcut.exe"])
+    assert ShortcutCache(tmp_path / "cache.json").resolve(shortcut).description == "Tool"
+    assert parses == [shortcut]
+
+
+def test_cache_reparses_when_mtime_changes(tmp_path, shortcut, parses):
+    cache = ShortcutCache(tmp_path / "cache.json")
+    cache.resolve(shortcut)
+    with open(shortcut, "wb") as f:
+        f.write(data("args.lnk")[:248].ljust(248, b"\0"))  # same size as local.lnk
+    st = os.stat(shortcut)
+    os.utime(shortcut, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cache.resolve(shortcut).target == "C:\\Apps\\editor.exe"
+    assert parses == [shortcut, shortcut]
+
+
+def test_cache_reports_missing_and_unreadable_shortcuts(tmp_path, shortcut):
+    junk = tmp_path / "junk.lnk"
+    junk.write_bytes(b"not a shortcut")
+    cache = ShortcutCache(tmp_path / "cache.json")
+    assert cache.resolve(str(tmp_path / "gone.lnk")) is None
+    assert cache.resolve(str(junk)) is None
+    problems = dict(cache.validate([shortcut, str(junk), str(tmp_path / "gone.lnk")]))
+    assert problems[str(junk)] == "Not a readable shortcut"
+    assert problems[str(tmp_path / "gone.lnk")] == "Shortcut not found"
+    assert problems[shortcut].startswith("Target not found")
+
+
+def test_cache_forgets_deleted_shortcuts(tmp_path, shortcut):
+    other = str(tmp_path / "Other.lnk")
+    shutil.copy(fixture("args.lnk"), other)
+    cache = ShortcutCache(tmp_path / "cache.json")
+    cache.preload([shortcut, other])
+    os.remove(other)
+    st = os.stat(shortcut)
+    os.utime(shortcut, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    cache.preload([shortcut])  # re-parsed, so the cache is written again
+    assert list(ShortcutCache(tmp_path / "cache.json")._entries) == [shortcut]
+
+
+def test_unreadable_cache_file_starts_empty(tmp_path, shortcut):
+    (tmp_path / "cache.json").write_text("{torn")
+    assert ShortcutCache(tmp_path / "cache.json").resolve(shortcut) is not None
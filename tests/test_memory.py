@@ -0,0 +1,66 @@
+import sys
+import tracemalloc
+
+import pytest
+
+import memory
+from memory import format_report, memory_report, release_memory, rss_bytes
+
+
+@pytest.mark.skipif(sys.platform not in ("win32", "linux"), reason="no RSS source without psutil")
+def test_rss_is_measured():
+    rss = rss_bytes()
+    assert isinstance(rss, int) and rss > 1024 * 1024
+
+
+def test_rss_from_proc_without_psutil(monkeypatch):
+    if not sys.platform.startswith("linux"):
+        pytest.skip("reads /proc/self/statm")
+    monkeypatch.setitem(sys.modules, "psutil", None)  # import fails
+    assert rss_bytes() > 0
+
+
+def test_release_memory_hands_back_freed_pages():
+    before = rss_bytes()
+    garbage = [bytearray(1024) for _ in range(50000)]
+    del garbage
+    release_memory()
+    after = rss_bytes()
+    if before is not None and after is not None:
+        assert after < before + 16 * 1024 * 1024
+
+
+def test_report_without_tracing(monkeypatch):
+    monkeypatch.setattr(memory, "rss_bytes", lambda: 300 * 1024 * 1024)
+    if tracemalloc.is_tracing():
+        pytest.skip("tracemalloc was switched on for this run")
+    report = memory_report()
+    assert report == {"rss": 300 * 1024 * 1024, "tracing": False}
+    text = format_report(report)
+    assert "Resident set: 300.0 MB" in text
+    assert "tracemalloc is off" in text
+
+
+def test_report_with_tracing():
+    was_tracing = tracemalloc.is_tracing()
+    tracemalloc.start()
+    try:
+        kept = [bytearray(4096) for _ in range(100)]
+        report = memory_report(top=3)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    assert kept
+    assert report["tracing"] and report["traced"] > 0 and report["traced_peak"] >= report["traced"]
+    assert len(report["top"]) == 3
+    lines = format_report(report).splitlines()
+    assert lines[1].startswith("Python allocations (tracemalloc):")
+    assert len(lines) == 2 + 3
+
+
+def test_report_after_idle_teardown():
+    report = {"rss": None, "tracing": False, "idle": True,
+              "idle_rss_before": 80 * 1024 * 1024, "idle_rss_after": 40 * 1024 * 1024}
+    lines = format_report(report).splitlines()
+    assert lines[:3] == ["Resident set: unknown", "Idle: window widgets torn down",
+                         "Last teardown: 80.0 MB -> 40.0 MB"]
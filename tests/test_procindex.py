@@ -0,0 +1,62 @@
+import os
+
+from launcher import AppLauncher
+from lnk import ShellLink
+from procindex import ProcessIndex
+
+
+class FakeShortcuts:
+    def __init__(self, links):
+        self.links = links
+
+    def resolve(self, path):
+        return self.links.get(path)
+
+
+def test_full_paths_match_exactly(tmp_path):
+    exe = tmp_path / "app.bin"
+    exe.write_text("")
+    index = ProcessIndex([str(exe)])
+    assert index.is_running(str(exe))
+    assert not index.is_running(str(tmp_path / "other" / "app.bin"))
+    assert index.name_running(str(tmp_path / "other" / "app.bin"))
+    assert len(index) == 1
+
+
+def test_image_names_only_match_on_file_name():
+    index = ProcessIndex(["Steam.exe", "explorer.exe"])
+    assert index.is_running("C:/Program Files/Steam/steam.exe")
+    assert index.is_running("C:\\Program Files\\Steam\\STEAM.EXE")
+    assert not index.is_running("C:/Games/game.exe")
+
+
+def test_snapshot_scans_the_provider_once():
+    calls = []
+    index = ProcessIndex.snapshot(lambda: calls.append(1) or ["a.exe"])
+    for _ in range(10):
+        index.is_running("C:/x/a.exe")
+    assert calls == [1]
+
+
+def test_shortcut_matches_on_its_target():
+    shortcuts = FakeShortcuts({
+        "C:/links/Tool.lnk": ShellLink(target="C:\\Apps\\Tool\\Tool.exe"),
+        "C:/links/Doc.lnk": ShellLink(target=""),
+    })
+    index = ProcessIndex.snapshot(lambda: ["tool.exe"], shortcuts)
+    assert index.is_running("C:/links/Tool.lnk")
+    assert not index.is_running("C:/links/Doc.lnk")      # target unknown
+    assert not index.is_running("C:/links/Missing.lnk")  # unreadable
+
+
+def test_shortcut_never_matches_without_a_cache():
+    assert not ProcessIndex(["tool.exe"]).is_running("C:/links/tool.lnk")
+
+
+def test_running_shortcut_is_skipped(tmp_path):
+    lnk = os.path.join(str(tmp_path), "Tool.lnk")
+    shortcuts = FakeShortcuts({lnk: ShellLink(target="/opt/tool/tool")})
+    launcher = AppLauncher(process_provider=lambda: ["/usr/bin/tool"], shortcuts=shortcuts)
+    running = ProcessIndex.snapshot(launcher.process_provider, shortcuts)
+    result = launcher.launch_path(lnk, running=running)
+    assert result.success and result.skipped
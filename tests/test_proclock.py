@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+from proclock import ProcessLock
+
+
+def test_second_holder_times_out(tmp_path):
+    path = tmp_path / "config.lock"
+    with ProcessLock(path):
+        with pytest.raises(TimeoutError):
+            with ProcessLock(path, timeout=0.05):
+                pass
+    with ProcessLock(path, timeout=0.05):
+        pass  # released on exit
+
+
+def test_reentrant_for_the_holding_thread(tmp_path):
+    lock = ProcessLock(tmp_path / "config.lock")
+    with lock:
+        with lock:
+            pass
+        other = ProcessLock(tmp_path / "config.lock", timeout=0.05)
+        with pytest.raises(TimeoutError):
+            with other:
+                pass  # still held by the outer block
+    with other:
+        pass
+
+
+def test_other_threads_wait_their_turn(tmp_path):
+    lock = ProcessLock(tmp_path / "config.lock", timeout=0.05)
+    failed = []
+
+    def hold():
+        try:
+            with lock:
+                pass
+        except TimeoutError:
+            failed.append(True)
+    with lock:
+        thread = threading.Thread(target=hold)
+        thread.start()
+        thread.join()
+    assert failed == [True]
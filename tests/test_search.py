@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from search import SearchIndex, match_score
+
+
+def add(index, category, name, path=None):
+    path = path or f"C:/Apps/{name}/{name.replace(' ', '')}.exe"
+    index.add(category, name, name, path)  # the entry is the name, to read results easily
+
+
+@pytest.fixture
+def index():
+    rnd = random.Random(20)
+    letters = "abcdefghijklmnopqrtuwxyz"  # no "s" or "v": nothing else matches "vs"
+    index = SearchIndex()
+    for i in range(5000):
+        name = "".join(rnd.choice(letters) for _ in range(rnd.randrange(4, 12)))
+        add(index, f"cat{i % 7}", f"{name} {i}")
+    add(index, "dev", "Visual Studio Code")
+    add(index, "dev", "Notepad++")
+    add(index, "games", "Steam", "D:/Games/Steam/steam.exe")
+    return index
+
+
+def names(results):
+    return [entry for _, entry in results]
+
+
+def test_short_query_falls_back_to_subsequence(index):
+    assert names(index.search("vs")) == ["Visual Studio Code"]
+    assert names(index.search("vsc")) == ["Visual Studio Code"]
+
+
+def test_fallback_stops_at_the_limit_and_tries_names_first():
+    index = SearchIndex()
+    for i in range(500):
+        add(index, "misc", f"tool {i}", f"C:/Quiz/tool{i}.exe")  # "qz" in the path only
+    for name in ("Quartz", "Quiz Maker", "Q Analyzer"):
+        add(index, "games", name)
+    assert set(names(index.search("qz", limit=5))[:3]) == {"Quartz", "Quiz Maker", "Q Analyzer"}
+    assert len(index.search("qz", limit=5)) == 5
+    assert len(index.search("qz")) == 50
+
+
+def test_short_query_prefers_word_starts(index):
+    assert names(index.search("st"))[:2] == ["Steam", "Visual Studio Code"]
+
+
+def test_substring_beats_subsequence_and_name_beats_path(index):
+    add(index, "misc", "Steamworks Tool", "C:/Other/x.exe")
+    add(index, "misc", "Launcher", "D:/Steam/launcher.exe")
+    assert names(index.search("steam"))[:3] == ["Steam", "Steamworks Tool", "Launcher"]
+
+
+def test_typo_still_matches(index):
+    assert "Notepad++" in names(index.search("notpad"))
+
+
+def test_limit_and_scores(index):
+    assert len(index.search("a", limit=10)) == 10
+    scored = index.search("steam", scored=True)
+    assert [s for s, _, _ in scored] == sorted((s for s, _, _ in scored), reverse=True)
+
+
+def test_remove_and_rename_category(index):
+    index.rename_category("dev", "tools")
+    assert index.search("visual") == [("tools", "Visual Studio Code")]
+    index.remove_category("tools")
+    assert index.search("visual") == []
+    index.remove("games", "D:/Games/Steam/steam.exe")
+    assert "Steam" not in names(index.search("steam"))
+
+
+def test_match_score_ranking():
+    assert match_score("code", "code") > match_score("code", "vs code") > match_score("code", "vscode")
+    assert match_score("vsc", "visual studio code") is not None
+    assert match_score("zzz", "steam", "d:/steam.exe") is None
@@ -0,0 +1,104 @@
+import json
+import random
+
+import pytest
+
+from config import Config, ConfigError
+
+
+def materialized(cfg) -> dict:
+    return {
+        "categories": {name: list(apps) for name, apps in cfg.categories.items()},
+        "profiles": {name: list(cats) for name, cats in cfg.profiles.items()},
+        "settings": dict(cfg.settings),
+        "launch_rules": dict(cfg.launch_rules),
+    }
+
+
+@pytest.fixture
+def migrated(config_path):
+    config_path.write_text(json.dumps({
+        "categories": {
+            "default": ["C:/a.exe"],
+            "tools": ["C:/b.exe", {"path": "C:/c.exe", "args": ["-x"], "cwd": "C:/work"}],
+        },
+        "profiles": {"work": ["tools", "default"]},
+        "settings": {"skip_running": True},
+        "launch_rules": {"C:/c.exe": {"after": ["C:/b.exe"]}},
+    }))
+    cfg = Config()
+    before = materialized(cfg)
+    cfg.migrate_to_sqlite()
+    return cfg, before
+
+
+def test_migration_keeps_everything(config_path, migrated):
+    cfg, before = migrated
+    assert cfg.uses_sqlite
+    assert not config_path.exists()
+    assert config_path.with_name("config.json.migrated").exists()
+    assert materialized(Config()) == before
+
+
+def test_legacy_flat_config_migrates(config_path):
+    config_path.write_text(json.dumps({"default": ["C:/a.exe"], "games": ["C:/g.exe"], "profiles": {"p": ["games"]}}))
+    cfg = Config()
+    cfg.migrate_to_sqlite()
+    reopened = Config()
+    assert reopened.categories["games"] == ["C:/g.exe"]
+    assert reopened.profiles == {"p": ["games"]}
+
+
+def test_categories_are_read_on_first_use(migrated):
+    cfg = Config()
+    assert list(cfg.categories) == ["default", "tools"]
+    assert dict.get(cfg.categories, "tools") is None     # not read yet...
+    assert cfg.category_has_app("tools", "C:/c.exe")     # ...though the indexes know it
+    assert cfg.categories["tools"][1]["cwd"] == "C:/work"
+    assert dict.get(cfg.categories, "tools") is not None
+
+
+def test_mutations_reach_the_database(migrated):
+    cfg, _ = migrated
+    rnd = random.Random(15)
+    paths = [f"C:/apps/{i}.exe" for i in range(6)]
+    for _ in range(200):
+        if not cfg.categories:
+            cfg.add_category("default")
+        op = rnd.randrange(6)
+        cats = list(cfg.categories)
+        if op == 0:
+            cfg.add_category(rnd.choice(["x", "y", "z"]))
+        elif op == 1:
+            cfg.rename_category(rnd.choice(cats), rnd.choice(["x", "y", "z", "w"]))
+        elif op == 2:
+            cfg.insert_app_into_category(rnd.choice(cats), rnd.choice(paths), rnd.randrange(4))
+        elif op == 3:
+            cat = rnd.choice(cats)
+            if cfg.categories[cat]:
+                cfg.remove_app_from_category(cat, rnd.randrange(len(cfg.categories[cat])))
+        elif op == 4:
+            cfg.set_profile_categories("work", rnd.sample(cats, min(2, len(cats))))
+        else:
+            cfg.remove_category(rnd.choice(cats))
+    assert cfg.flush()
+    assert materialized(Config()) == materialized(cfg)
+
+
+def test_batch_rolls_back_by_rereading_the_database(migrated):
+    cfg, before = migrated
+    with pytest.raises(ConfigError):
+        with cfg.batch():
+            cfg.add_app_to_category("tools", "C:/d.exe")
+            cfg.remove_category("nope")
+    assert materialized(cfg) == before
+    assert not cfg.category_has_app("tools", "C:/d.exe")
+    cfg.flush()
+    assert materialized(Config()) == before
+
+
+def test_trash_survives_a_restart(migrated):
+    cfg, _ = migrated
+    cfg.remove_app_from_category("tools", 0)
+    cfg.flush()
+    assert [entry for _, _, entry in Config().trash] == ["C:/b.exe"]
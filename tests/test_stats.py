@@ -0,0 +1,76 @@
+import json
+
+import stats as stats_module
+from stats import LaunchStats, percentile
+
+
+def test_percentile_is_nearest_rank():
+    assert percentile([], 50) is None
+    assert percentile([3.0], 95) == 3.0
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(reversed(values), 100) == 100
+
+
+def test_records_are_summarized_per_app_and_profile(tmp_path):
+    stats = LaunchStats(tmp_path / "launch_stats.jsonl")
+    stats.record_app("a.exe", True, 0.1, 0.2, 0.7, profile="work")
+    stats.record_app("a.exe", True, 0.1, 0.2, None, profile="work")
+    stats.record_app("a.exe", False, 0.1)
+    stats.record_app("b.exe", True, 0.0, 0.1, 0.1)
+    stats.record_batch("work", 2.5, 2, 0, profile="work")
+
+    apps = {row["app"]: row for row in stats.app_summary()}
+    assert apps["a.exe"]["runs"] == 2
+    assert apps["a.exe"]["failures"] == 1
+    assert apps["a.exe"]["max"] == 1.0
+    assert apps["a.exe"]["alive_p50"] == 0.7
+    assert [row["app"] for row in stats.app_summary()] == ["a.exe", "b.exe"]  # slowest first
+    assert stats.profile_summary()[0]["profile"] == "work"
+    assert stats.profile_summary()[0]["p50"] == 2.5
+
+
+def test_history_is_replayed_and_torn_lines_skipped(tmp_path):
+    path = tmp_path / "launch_stats.jsonl"
+    LaunchStats(path).record_app("a.exe", True, 0.5)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"kind": "app", "app": "a.ex')  # crash mid-append
+    assert LaunchStats(path).app_summary()[0]["runs"] == 1
+
+
+def test_rolling_window_keeps_the_latest_samples(tmp_path):
+    stats = LaunchStats(tmp_path / "s.jsonl", window=3)
+    for value in (9.0, 1.0, 2.0, 3.0):
+        stats.record_app("a.exe", True, value)
+    row = stats.app_summary()[0]
+    assert row["runs"] == 3
+    assert row["max"] == 3.0
+
+
+def test_unload_replays_the_file_again(tmp_path):
+    path = tmp_path / "s.jsonl"
+    stats = LaunchStats(path)
+    stats.record_app("a.exe", True, 1.0)
+    assert stats.app_summary()[0]["runs"] == 1
+    stats.unload()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"kind": "app", "app": "a.exe", "ok": True, "validate": 2.0}) + "\n")
+    assert stats.app_summary()[0]["runs"] == 2
+
+
+def test_file_is_cut_to_the_window_per_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(stats_module, "COMPACT_BYTES", 4096)
+    path = tmp_path / "s.jsonl"
+    stats = LaunchStats(path, window=5)
+    assert stats.app_summary() == []  # loaded: aggregates follow the compaction
+    for i in range(100):
+        stats.record_app(f"app{i % 3}.exe", True, float(i))
+        stats.record_batch("work", float(i), 1, 0, profile="work")
+    assert path.stat().st_size <= 4096
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(rows) < 200  # lines since the last cut, on top of 5 per key
+    assert [r["validate"] for r in rows if r.get("app") == "app0.exe"][-1] == 99.0
+    fresh = {row["app"]: row for row in LaunchStats(path, window=5).app_summary()}
+    assert fresh == {row["app"]: row for row in stats.app_summary()}
+    assert fresh["app0.exe"]["max"] == 99.0 and fresh["app0.exe"]["runs"] == 5
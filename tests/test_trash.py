@@ -0,0 +1,65 @@
+import random
+
+from trash import Trash
+
+
+def entries(trash):
+    return [entry for _, _, entry in trash]
+
+
+def test_oldest_first_and_capped():
+    trash = Trash(limit=3)
+    for i in range(5):
+        trash.push("work", i, f"app{i}")
+    assert entries(trash) == ["app2", "app3", "app4"]
+    assert trash.find("work", "app0") is None  # forgotten with its item
+    assert trash.latest() == ("work", 4, "app4")
+
+
+def test_discard_takes_the_newest_removal_of_an_app():
+    trash = Trash(limit=10)
+    first = trash.push("work", 0, "a")
+    trash.push("games", 0, "a")
+    second = trash.push("work", 2, {"path": "a", "args": ["-x"]})
+    assert trash.find("work", "a") == second
+    assert trash.discard("work", "a") == ("work", 2, {"path": "a", "args": ["-x"]})
+    assert trash.find("work", "a") == first
+    assert trash.discard("work", "nope") is None
+    assert entries(trash) == ["a", "a"]
+
+
+def test_rename_keeps_ids_and_order():
+    trash = Trash(limit=10)
+    ids = [trash.push("work", 0, "a"), trash.push("play", 0, "b"), trash.push("work", 1, "c")]
+    trash.rename_category("work", "job")
+    assert [item_id for item_id, _ in trash.items()] == ids
+    assert [category for category, _, _ in trash] == ["job", "play", "job"]
+    assert trash.find("job", "c") == ids[2] and trash.find("work", "c") is None
+
+
+def test_copy_is_independent_and_keeps_ids():
+    trash = Trash(limit=10)
+    kept = trash.push("work", 0, "a")
+    other = trash.copy()
+    other.push("work", 1, "b")
+    other.remove(kept)
+    assert entries(trash) == ["a"] and trash.get(kept) == ("work", 0, "a")
+    assert entries(other) == ["b"]
+
+
+def test_index_matches_a_scan_after_random_operations():
+    rnd = random.Random(25)
+    trash = Trash(limit=20)
+    for _ in range(2000):
+        op = rnd.randrange(4)
+        category, path = rnd.choice(["a", "b", "c"]), rnd.choice("pqrst")
+        if op < 2:
+            trash.push(category, rnd.randrange(5), path)
+        elif op == 2:
+            trash.discard(category, path)
+        else:
+            trash.rename_category(category, rnd.choice(["a", "b", "c"]))
+        for (category, path) in {(c, e) for c, _, e in trash}:
+            newest = max(item_id for item_id, (c, _, e) in trash.items() if (c, e) == (category, path))
+            assert trash.find(category, path) == newest
+        assert len(trash) <= 20
@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from tray import TrayIcon
+
+
+class FakeIcon:
+    HAS_NOTIFICATION = True
+
+    def __init__(self):
+        self.stopped = threading.Event()
+        self.notes = []
+
+    def run(self):
+        self.stopped.wait()
+
+    def stop(self):
+        self.stopped.set()
+
+    def notify(self, message, title=None):
+        self.notes.append((title, message))
+
+
+@pytest.fixture
+def tray(monkeypatch):
+    tray = TrayIcon("App Launcher", on_show=lambda: None, on_exit=lambda: None)
+    monkeypatch.setattr(tray, "_build_icon", FakeIcon)
+    yield tray
+    tray.stop()
+
+
+def test_notify_needs_a_running_icon(tray):
+    assert not tray.notify("hello")
+    tray.start()
+    assert tray.notify("hello")
+    assert tray._icon.notes == [("App Launcher", "hello")]
+    tray.stop()
+    tray._thread.join(1)
+    assert not tray.notify("again")
+
+
+def test_notify_without_backend_support(tray, monkeypatch):
+    tray.start()
+    monkeypatch.setattr(tray._icon, "HAS_NOTIFICATION", False)
+    assert not tray.notify("hello")
+
+
+def test_notify_failure_is_reported(tray, monkeypatch):
+    tray.start()
+
+    def broken(message, title=None):
+        raise OSError("no notification daemon")
+    monkeypatch.setattr(tray._icon, "notify", broken)
+    assert not tray.notify("hello", "Launch Error")
@@ -0,0 +1,94 @@
+import json
+import queue
+import sys
+
+import pytest
+
+import config
+import watcher
+from config import Config
+from watcher import FileWatcher
+
+
+class NoInotify:
+    def __init__(self, folder):
+        raise OSError("no inotify here")
+
+
+@pytest.fixture(params=["inotify", "poll"])
+def backend(request, monkeypatch):
+    if request.param == "poll":
+        monkeypatch.setattr(watcher, "_Inotify", NoInotify)
+    elif not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux only")
+    return request.param
+
+
+class Receiver:
+    """What LauncherUI._on_config_file_changed does with the watcher's
+    callback, on the test's thread instead of Tk's."""
+
+    def __init__(self, cfg, backend):
+        self.cfg = cfg
+        self.events = queue.Queue()
+        self.calls = self.reloads = self.changes = 0
+        cfg.add_listener(self._changed)
+        self.watcher = FileWatcher(cfg.watched_files(), lambda: self.events.put(None), interval=0.05)
+        self.watcher.start()
+        if self.watcher.backend != backend:
+            self.watcher.stop()
+            pytest.skip(f"{backend} isn't available here")
+
+    def _changed(self):
+        self.changes += 1
+
+    def settle(self, quiet=0.6):
+        """Handle the watcher's calls until it has been quiet for `quiet` s."""
+        while True:
+            try:
+                self.events.get(timeout=quiet)
+            except queue.Empty:
+                return
+            self.calls += 1
+            if self.cfg.changed_on_disk():
+                self.cfg.reload()
+                self.reloads += 1
+
+
+@pytest.fixture
+def receiver(config_path, monkeypatch, backend):
+    monkeypatch.setattr(config, "SAVE_DELAY", 0.01)
+    cfg = Config()
+    assert cfg.flush()
+    receiver = Receiver(cfg, backend)
+    yield receiver
+    receiver.watcher.stop()
+
+
+def test_edit_to_config_json_reloads_once(receiver, config_path):
+    data = json.loads(config_path.read_text())
+    data["categories"]["games"] = ["g"]
+    config_path.write_text(json.dumps(data))
+    receiver.settle()
+    assert receiver.reloads == 1 and receiver.changes == 1
+    assert receiver.cfg.categories["games"] == ["g"]
+
+
+def test_journal_append_from_another_process_reloads_once(receiver):
+    theirs = Config()
+    theirs.add_category("tools")
+    theirs.add_app_to_category("tools", "t")  # written behind: journal only
+    receiver.settle()
+    assert receiver.reloads == 1 and receiver.changes == 1
+    assert receiver.cfg.categories["tools"] == ["t"]
+
+
+def test_own_writes_do_not_reload(receiver):
+    receiver.cfg.add_category("work")
+    receiver.cfg.add_app_to_category("work", "w")
+    receiver.settle()  # the write-behind appends to the journal
+    assert receiver.cfg.flush()  # and this folds it into config.json
+    receiver.settle()
+    assert receiver.calls >= 1  # the watcher saw them
+    assert receiver.reloads == 0
+    assert receiver.changes == 2  # the edits themselves